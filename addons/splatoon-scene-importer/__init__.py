@@ -9,10 +9,14 @@ bl_info = {
 }
 
 import bpy
-from .splatoon_scene_importer import SplatoonSceneImporter, SplatoonSceneImporterDragDrop, IO_FH_splatoon
+from .splatoon_scene_importer import SplatoonSceneImporter, SplatoonSceneImporterDragDrop, SplatoonSceneImporterDirectory, IO_FH_splatoon, SplatoonFullResolutionTextures, SplatoonSceneImporterPreferences
 
 def menu_func_import(self, context):
     self.layout.operator(SplatoonSceneImporter.bl_idname, text="Splatoon Scene (.dae .fbx)")
+    self.layout.operator(SplatoonSceneImporterDirectory.bl_idname, text="Splatoon Map Folder (.dae .fbx)")
+
+def menu_func_external_data(self, context):
+    self.layout.operator(SplatoonFullResolutionTextures.bl_idname)
 
 def register():
     bpy.types.Scene.is_apply_second_shader = bpy.props.BoolProperty(
@@ -28,6 +32,25 @@ def register():
         ],
         default='COLOR'
     )
+    bpy.types.Scene.node_layout_splatoon_scene_importer = bpy.props.EnumProperty(
+        name="Node Layout",
+        description="How the Splatoon shader networks are added to each material",
+        items=[
+            ('EXPANDED', "Expanded", "Build every mix node inside each material. Easy to tweak per material"),
+            ('GROUPS', "Node Groups", "Share one node group per network across all materials. Faster to import and lighter .blend files")
+        ],
+        default='EXPANDED'
+    )
+    bpy.types.Scene.dae_import_method_splatoon_scene_importer = bpy.props.EnumProperty(
+        name="DAE Import",
+        description="How .dae files are imported",
+        items=[
+            ('AUTO', "Auto", "Use Autodesk FBX Converter when it is installed, otherwise the built-in reader"),
+            ('NATIVE', "Built-in Reader", "Read .dae directly. Works on every platform without external tools"),
+            ('CONVERTER', "FBX Converter", "Convert .dae to .fbx with Autodesk FBX Converter, then import the .fbx")
+        ],
+        default='AUTO'
+    )
     bpy.types.Scene.is_scale_armature_splatoon_scene_importer = bpy.props.BoolProperty(
         name="Scale Armature",
         default=True
@@ -37,20 +60,109 @@ def register():
         default=1.0,
         min=0.01
     )
+    bpy.types.Scene.is_pack_channels_splatoon_scene_importer = bpy.props.BoolProperty(
+        name="Pack Grayscale Maps",
+        description="Merge the _mtl, _rgh, _ao and _opa maps of each material into one RGBA image. Uses up to 4x less texture memory",
+        default=False
+    )
+    bpy.types.Scene.texture_size_splatoon_scene_importer = bpy.props.EnumProperty(
+        name="Texture Size",
+        description="Largest texture size to load. Smaller proxies are cached on disk and can be swapped to full resolution later (File > External Data)",
+        items=[
+            ('FULL', "Full", "Load the original textures"),
+            ('1024', "1024 px", "Load textures larger than 1024 px as downscaled proxies"),
+            ('512', "512 px", "Load textures larger than 512 px as downscaled proxies"),
+            ('256', "256 px", "Load textures larger than 256 px as downscaled proxies")
+        ],
+        default='FULL'
+    )
+    bpy.types.Scene.suffix_aliases_splatoon_scene_importer = bpy.props.StringProperty(
+        name="Suffix Aliases",
+        description="Extra texture suffixes treated as known ones, separated by ';' (e.g. _alb0=_alb;_nrm0=_nrm)",
+        default=""
+    )
+    bpy.types.Scene.is_texture_inventory_splatoon_scene_importer = bpy.props.BoolProperty(
+        name="Cache Texture Folders",
+        description="Remember each texture folder's file list, PNG sizes and grayscale checks in the add-on cache. Re-imports of unchanged folders skip reading them again. Leave off for folders whose files are overwritten in place",
+        default=False
+    )
+    bpy.types.Scene.is_share_meshes_splatoon_scene_importer = bpy.props.BoolProperty(
+        name="Share Identical Meshes",
+        description="Parts with byte-identical geometry and materials use one shared mesh. Lowers memory and draw cost for large maps",
+        default=False
+    )
+    bpy.types.Scene.is_bulk_import_splatoon_scene_importer = bpy.props.BoolProperty(
+        name="Bulk Import",
+        description="For large batches. Imported parts stay hidden from the viewport until the batch ends, so the scene is evaluated once instead of after every file",
+        default=False
+    )
+    bpy.types.Scene.frame_budget_splatoon_scene_importer = bpy.props.IntProperty(
+        name="Frame Budget (ms)",
+        description="Time spent importing per UI update. Higher is faster, lower keeps the UI responsive",
+        default=50,
+        min=5,
+        max=1000
+    )
+    bpy.types.Scene.is_profile_splatoon_scene_importer = bpy.props.BoolProperty(
+        name="Profile Import",
+        description="Record per-stage timings and write a Chrome trace JSON file",
+        default=False
+    )
+    bpy.types.Scene.profile_path_splatoon_scene_importer = bpy.props.StringProperty(
+        name="Trace File",
+        description="Where to write the trace. Empty writes it to the add-on cache directory",
+        subtype='FILE_PATH',
+        default=""
+    )
+    bpy.types.Scene.include_glob_splatoon_scene_importer = bpy.props.StringProperty(
+        name="Include",
+        description="Only import models matching these globs, separated by ';' (e.g. Obj_*;*/Parts/*). Empty imports every .dae/.fbx",
+        default=""
+    )
+    bpy.types.Scene.exclude_glob_splatoon_scene_importer = bpy.props.StringProperty(
+        name="Exclude",
+        description="Skip models and folders matching these globs, separated by ';' (e.g. *_Far*;Backup)",
+        default=""
+    )
     bpy.utils.register_class(SplatoonSceneImporter)
     bpy.utils.register_class(SplatoonSceneImporterDragDrop)
+    bpy.utils.register_class(SplatoonSceneImporterDirectory)
     bpy.utils.register_class(IO_FH_splatoon)
+    bpy.utils.register_class(SplatoonFullResolutionTextures)
+    bpy.utils.register_class(SplatoonSceneImporterPreferences)
+    # 저장된 컨버터 설정을 적용한다. 처음 켤 때는 아직 없으므로 기본값을 쓴다
+    addon = bpy.context.preferences.addons.get(__package__)
+    if addon is not None:
+        addon.preferences.apply()
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import)
+    bpy.types.TOPBAR_MT_file_external_data.append(menu_func_external_data)
 
 def unregister():
     del bpy.types.Scene.is_apply_second_shader
     del bpy.types.Scene.shader_mix_style
+    del bpy.types.Scene.node_layout_splatoon_scene_importer
+    del bpy.types.Scene.dae_import_method_splatoon_scene_importer
     del bpy.types.Scene.is_scale_armature_splatoon_scene_importer
     del bpy.types.Scene.scale_value_splatoon_scene_importer
+    del bpy.types.Scene.is_pack_channels_splatoon_scene_importer
+    del bpy.types.Scene.texture_size_splatoon_scene_importer
+    del bpy.types.Scene.suffix_aliases_splatoon_scene_importer
+    del bpy.types.Scene.is_texture_inventory_splatoon_scene_importer
+    del bpy.types.Scene.is_share_meshes_splatoon_scene_importer
+    del bpy.types.Scene.is_bulk_import_splatoon_scene_importer
+    del bpy.types.Scene.frame_budget_splatoon_scene_importer
+    del bpy.types.Scene.is_profile_splatoon_scene_importer
+    del bpy.types.Scene.profile_path_splatoon_scene_importer
+    del bpy.types.Scene.include_glob_splatoon_scene_importer
+    del bpy.types.Scene.exclude_glob_splatoon_scene_importer
     bpy.utils.unregister_class(SplatoonSceneImporter)
     bpy.utils.unregister_class(SplatoonSceneImporterDragDrop)
+    bpy.utils.unregister_class(SplatoonSceneImporterDirectory)
     bpy.utils.unregister_class(IO_FH_splatoon)
+    bpy.utils.unregister_class(SplatoonFullResolutionTextures)
+    bpy.utils.unregister_class(SplatoonSceneImporterPreferences)
     bpy.types.TOPBAR_MT_file_import.remove(menu_func_import)
+    bpy.types.TOPBAR_MT_file_external_data.remove(menu_func_external_data)
 
 if __name__ == "__main__":
     register()
\ No newline at end of file
@@ -0,0 +1,343 @@
+"""
+Headless batch import for whole maps.
+
+    blender --background --python-exit-code 1 --factory-startup --python cli.py -- [options] PATH [PATH ...]
+
+PATH는 .dae/.fbx 파일 또는 디렉토리이다.
+--jobs N(기본값 CPU 수)이면 파일 목록을 N개의 워커 Blender 프로세스로 나누어
+각자 partial .blend를 저장하고, 마지막에 하나의 씬으로 합친다.
+DAE 변환 스레드(기본값 CPU 수 / N)는 워커마다 따로 둔다.
+결과는 JSON 요약으로 출력하며 실패한 파일이 있으면 종료 코드는 1이다.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import importlib.util
+
+# cli.py는 --python으로 직접 실행되므로 애드온 패키지를 이 이름으로 불러온다
+ADDON_MODULE = 'splatoon_scene_importer_cli'
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='blender --background --python-exit-code 1 --factory-startup --python cli.py --',
+        description='Import Splatoon map parts into a single .blend without the UI.',
+    )
+    parser.add_argument('paths', nargs='*', help='.dae/.fbx files or directories containing them')
+    parser.add_argument('-o', '--output', help='final .blend path')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='number of worker Blender processes')
+    parser.add_argument('--converter-threads', type=int, help='DAE converter threads per worker (default: CPU count / jobs)')
+    parser.add_argument('--summary', help='write the JSON summary to this path as well as stdout')
+    parser.add_argument('--link', action='store_true', help='link the worker .blend files instead of appending them')
+    parser.add_argument('--keep-parts', action='store_true', help='keep the partial .blend files written by workers')
+    parser.add_argument('--no-second-shader', action='store_true', help='do not apply the second shader')
+    parser.add_argument('--shader-mix-style', choices=['COLOR', 'SHADE'], default='COLOR')
+    parser.add_argument('--node-layout', choices=['EXPANDED', 'GROUPS'], default='EXPANDED')
+    parser.add_argument('--pack-channels', action='store_true', help='merge the _mtl/_rgh/_ao/_opa maps of each material into one RGBA image')
+    parser.add_argument('--texture-size', choices=['FULL', '1024', '512', '256'], default='FULL', help='load larger textures as cached downscaled proxies')
+    parser.add_argument('--suffix-alias', action='append', default=[], help='treat a texture suffix as a known one, e.g. _alb0=_alb (repeatable)')
+    parser.add_argument('--texture-inventory', action='store_true', help='reuse cached texture folder listings and PNG info between runs')
+    parser.add_argument('--armature-scale', type=float, help='scale imported armatures by this value')
+    parser.add_argument('--dae-import', choices=['AUTO', 'NATIVE', 'CONVERTER'], default='AUTO')
+    parser.add_argument('--share-meshes', action='store_true', help='let parts with identical geometry and materials share one mesh')
+    parser.add_argument('--include', action='append', default=[], help='only import models matching this glob (repeatable)')
+    parser.add_argument('--exclude', action='append', default=[], help='skip models and folders matching this glob (repeatable)')
+    parser.add_argument('--bulk', action='store_true', help='keep imported parts out of the view layer until each worker finishes')
+    parser.add_argument('--profile', help='write a Chrome trace JSON with per-stage timings (one per worker)')
+    # 워커 전용
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--file-list', help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+    if not args.output:
+        parser.error('--output is required')
+    if not args.worker and not args.paths:
+        parser.error('at least one PATH is required')
+    return args
+
+def load_addon():
+    addon_dir = os.path.dirname(os.path.abspath(__file__))
+    module = sys.modules.get(ADDON_MODULE)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            ADDON_MODULE,
+            os.path.join(addon_dir, '__init__.py'),
+            submodule_search_locations=[addon_dir],
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[ADDON_MODULE] = module
+        spec.loader.exec_module(module)
+    return module
+
+def collect_files(paths, args):
+    """디렉토리는 스레드로 나누어 훑는다. 워커가 순서를 다시 정하므로 경로 순서로 돌려준다"""
+    from importlib import import_module
+
+    discovery = import_module(f'{ADDON_MODULE}.importers.splatoon.discovery')
+    scanner = discovery.DirectoryScanner(args.include, args.exclude)
+    return sorted(model.path for model in scanner.scan(paths))
+
+def shard(files, jobs):
+    """파일 크기 합이 비슷하도록 큰 파일부터 가장 가벼운 shard에 넣는다"""
+    shards = [[] for _ in range(max(1, min(jobs, len(files))))]
+    loads = [0] * len(shards)
+    for path in sorted(files, key=_file_size, reverse=True):
+        index = loads.index(min(loads))
+        shards[index].append(path)
+        loads[index] += _file_size(path)
+    return shards
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def reset_scene(addon):
+    import bpy
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    try:
+        addon.register()
+    except ValueError:
+        # 이미 등록되어 있음
+        pass
+    return bpy.context.scene
+
+def apply_options(scene, args):
+    scene.is_apply_second_shader = not args.no_second_shader
+    scene.shader_mix_style = args.shader_mix_style
+    scene.node_layout_splatoon_scene_importer = args.node_layout
+    scene.is_pack_channels_splatoon_scene_importer = args.pack_channels
+    scene.texture_size_splatoon_scene_importer = args.texture_size
+    scene.suffix_aliases_splatoon_scene_importer = ';'.join(args.suffix_alias)
+    scene.is_texture_inventory_splatoon_scene_importer = args.texture_inventory
+    scene.dae_import_method_splatoon_scene_importer = args.dae_import
+    scene.is_scale_armature_splatoon_scene_importer = args.armature_scale is not None
+    if args.armature_scale is not None:
+        scene.scale_value_splatoon_scene_importer = args.armature_scale
+    scene.is_share_meshes_splatoon_scene_importer = args.share_meshes
+    scene.is_bulk_import_splatoon_scene_importer = args.bulk
+    scene.is_profile_splatoon_scene_importer = bool(args.profile)
+    scene.profile_path_splatoon_scene_importer = os.path.abspath(args.profile) if args.profile else ''
+
+def import_files(addon, files, args):
+    """현재 Blender 프로세스에서 files를 임포트하고 파일별 결과를 반환한다"""
+    import bpy
+    from importlib import import_module
+
+    queueing = import_module(f'{ADDON_MODULE}.importers.splatoon.queueing')
+    discovery = import_module(f'{ADDON_MODULE}.importers.splatoon.discovery')
+
+    apply_options(reset_scene(addon), args)
+    # 모델마다 텍스처 디렉토리를 짝짓고 텍스처 디렉토리별로 묶어 처리한다
+    models = discovery.DirectoryScanner().describe(files)
+    parallel_conversion = queueing.Queueing.resolve_dae_import_method() == 'CONVERTER'
+    queue = None
+    error = None
+    try:
+        # 파일 하나의 예외는 file_results에 남기고 다음 파일로 넘어간다
+        queue = queueing.Queueing.from_models(
+            discovery.order_for_throughput(models, parallel_conversion),
+            conversion_workers=args.converter_threads,
+            keep_going=True,
+        )
+        try:
+            queue.run_to_completion()
+        finally:
+            queue.close()
+    except Exception as e:
+        # 배치가 중간에 멈춰도 그때까지 임포트한 것은 저장한다
+        error = f"{type(e).__name__}: {e}"
+
+    results = list(queue.file_results) if queue is not None else []
+    finished = {result['file'] for result in results}
+    if error is not None:
+        results += [_failed(path, error) for path in files if path not in finished]
+    try:
+        bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(args.output), relative_remap=False)
+    except Exception as e:
+        # 저장하지 못했으면 임포트한 파일도 결과에 남지 않는다
+        error = f"failed to save {args.output}: {e}"
+        results = [result if result['error'] else dict(result, error=error) for result in results]
+    return results
+
+def _failed(path, error):
+    return {'file': path, 'seconds': None, 'objects': 0, 'error': error}
+
+def run_worker(args):
+    addon = load_addon()
+    with open(args.file_list, 'r', encoding='utf-8') as f:
+        files = json.load(f)
+
+    results = import_files(addon, files, args)
+
+    with open(args.summary, 'w', encoding='utf-8') as f:
+        json.dump(results, f)
+    return 1 if any(result['error'] for result in results) else 0
+
+def spawn_workers(shards, args, parts_dir):
+    import bpy
+
+    workers = []
+    for index, files in enumerate(shards):
+        file_list = os.path.join(parts_dir, f'part_{index}.json')
+        with open(file_list, 'w', encoding='utf-8') as f:
+            json.dump(files, f)
+
+        part = os.path.join(parts_dir, f'part_{index}.blend')
+        result_path = os.path.join(parts_dir, f'part_{index}.result.json')
+        command = [
+            # 처리하지 못한 예외로 스크립트가 끝나면 Blender도 0이 아닌 코드로 끝나게 한다
+            bpy.app.binary_path, '--background', '--python-exit-code', '1', '--factory-startup',
+            '--python', os.path.abspath(__file__), '--',
+            '--worker', '--file-list', file_list, '--output', part, '--summary', result_path,
+            '--converter-threads', str(args.converter_threads),
+            '--shader-mix-style', args.shader_mix_style, '--node-layout', args.node_layout,
+            '--dae-import', args.dae_import, '--texture-size', args.texture_size,
+        ]
+        if args.no_second_shader:
+            command.append('--no-second-shader')
+        if args.pack_channels:
+            command.append('--pack-channels')
+        if args.share_meshes:
+            command.append('--share-meshes')
+        if args.bulk:
+            command.append('--bulk')
+        if args.texture_inventory:
+            command.append('--texture-inventory')
+        if args.armature_scale is not None:
+            command += ['--armature-scale', str(args.armature_scale)]
+        for alias in args.suffix_alias:
+            command += ['--suffix-alias', alias]
+        if args.profile:
+            command += ['--profile', shard_profile_path(args.profile, index)]
+
+        workers.append({
+            'shard': index,
+            'files': files,
+            'part': part,
+            'result_path': result_path,
+            'process': subprocess.Popen(command, stdout=subprocess.DEVNULL),
+        })
+    return workers
+
+def shard_profile_path(path, index):
+    """trace.json -> trace.shard0.json"""
+    stem, ext = os.path.splitext(os.path.abspath(path))
+    return f'{stem}.shard{index}{ext or ".json"}'
+
+def merge_parts(addon, parts, args):
+    """워커가 저장한 .blend의 오브젝트를 하나의 씬으로 모은다"""
+    import bpy
+
+    scene = reset_scene(addon)
+    for part in parts:
+        with bpy.data.libraries.load(part, link=args.link) as (data_from, data_to):
+            data_to.objects = list(data_from.objects)
+        for obj in data_to.objects:
+            if obj is not None:
+                scene.collection.objects.link(obj)
+
+    bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(args.output), relative_remap=False)
+
+def run_coordinator(args):
+    started = time.perf_counter()
+    addon = load_addon()
+    files = collect_files(args.paths, args)
+    shards = shard(files, args.jobs)
+    if args.converter_threads is None:
+        # 워커마다 CPU 수만큼 컨버터를 돌리면 jobs배로 과하게 뜬다
+        args.converter_threads = max(1, (os.cpu_count() or 1) // len(shards))
+
+    file_results = []
+    worker_results = []
+    profiles = []
+    if len(shards) <= 1:
+        # 워커를 띄울 필요가 없으면 이 프로세스에서 바로 처리한다
+        file_results = import_files(addon, files, args)
+        if args.profile:
+            profiles.append(os.path.abspath(args.profile))
+    else:
+        parts_dir = os.path.splitext(os.path.abspath(args.output))[0] + '_parts'
+        os.makedirs(parts_dir, exist_ok=True)
+
+        workers = spawn_workers(shards, args, parts_dir)
+        parts = []
+        for worker in workers:
+            returncode = worker['process'].wait()
+            results = _read_json(worker['result_path'])
+            if results is None:
+                # 워커가 결과를 남기지 못하고 죽은 경우
+                results = [_failed(path, f'worker exited with code {returncode}') for path in worker['files']]
+            for result in results:
+                result['shard'] = worker['shard']
+            file_results += results
+
+            if os.path.exists(worker['part']):
+                parts.append(worker['part'])
+            if args.profile:
+                profiles.append(shard_profile_path(args.profile, worker['shard']))
+            worker_results.append({
+                'shard': worker['shard'],
+                'returncode': returncode,
+                'files': len(worker['files']),
+                'part': worker['part'],
+            })
+
+        merge_parts(addon, parts, args)
+        if not args.keep_parts and not args.link:
+            _remove_parts(parts_dir)
+
+    failures = [{'file': result['file'], 'error': result['error']} for result in file_results if result['error']]
+    summary = {
+        'output': os.path.abspath(args.output),
+        'jobs': len(shards),
+        'seconds': round(time.perf_counter() - started, 3),
+        'imported': len(file_results) - len(failures),
+        'failed': len(failures),
+        'files': file_results,
+        'failures': failures,
+        'workers': worker_results,
+    }
+    if args.profile:
+        summary['profiles'] = [path for path in profiles if os.path.exists(path)]
+
+    text = json.dumps(summary, indent=2)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+
+    if failures or any(worker['returncode'] for worker in worker_results):
+        return 1
+    return 0
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _remove_parts(parts_dir):
+    for name in os.listdir(parts_dir):
+        try:
+            os.unlink(os.path.join(parts_dir, name))
+        except OSError:
+            pass
+    try:
+        os.rmdir(parts_dir)
+    except OSError:
+        pass
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    args = parse_args(argv)
+    return run_worker(args) if args.worker else run_coordinator(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
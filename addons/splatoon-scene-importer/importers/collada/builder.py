@@ -0,0 +1,286 @@
+import os
+import bpy
+import numpy as np
+from mathutils import Matrix
+from .reader import ColladaReader
+
+# (x, y, z) -> (x, -z, y)
+Y_UP_TO_Z_UP = np.array([
+    [1.0, 0.0, 0.0, 0.0],
+    [0.0, 0.0, -1.0, 0.0],
+    [0.0, 1.0, 0.0, 0.0],
+    [0.0, 0.0, 0.0, 1.0],
+])
+
+DEFAULT_BONE_LENGTH = 0.1
+
+def weight_runs(skin, vertex_count):
+    """
+    skin의 영향을 (joint 번호, 가중치, 정점 번호 목록)으로 묶는다.
+    (joint, 가중치)로 한 번 정렬하고 같은 값이 이어지는 구간마다 하나씩 내므로
+    vertex_group.add를 구간 수만큼만 부른다. 같은 joint 안에서는 가중치가 작은 것부터 나온다
+    """
+    vertices = np.repeat(np.arange(len(skin.weight_counts), dtype=np.int32), skin.weight_counts)
+    keep = vertices < vertex_count
+    vertices, joints, weights = vertices[keep], skin.weight_joints[keep], skin.weight_values[keep]
+    if not len(vertices):
+        return
+
+    order = np.lexsort((weights, joints))
+    vertices, joints, weights = vertices[order], joints[order], weights[order]
+    changes = np.flatnonzero((joints[1:] != joints[:-1]) | (weights[1:] != weights[:-1])) + 1
+    bounds = np.concatenate(([0], changes, [len(vertices)]))
+    for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        yield int(joints[start]), float(weights[start]), vertices[start:end].tolist()
+
+class ColladaBuilder:
+    """
+    ColladaReader의 handler.
+    geometry는 읽히는 즉시 mesh datablock으로 만들고 배열을 버린다.
+    오브젝트, 아마추어, 머티리얼은 visual_scene을 읽을 때 만든다.
+    """
+
+    def __init__(self, name, collection):
+        self.name = name
+        self.collection = collection
+        self.axis = np.identity(4)
+        self.images = {}
+        self.effects = {}
+        self.material_defs = {}
+        self.material_names = {}
+        # geometry id -> (mesh 이름, material symbol 목록)
+        self.meshes = {}
+        self.skins = {}
+        # skin의 joint 이름(sid일 수 있음) -> bone 이름
+        self.joint_names = {}
+        self.bound_meshes = set()
+        self.objects = []
+
+    # ---- ColladaReader handler ----
+
+    def asset(self, up_axis, meter):
+        if up_axis == 'Y_UP':
+            self.axis = Y_UP_TO_Z_UP
+
+    def image(self, image_id, path):
+        self.images[image_id] = path
+
+    def effect(self, effect_id, diffuse_image):
+        self.effects[effect_id] = diffuse_image
+
+    def material(self, material_id, name, effect_id):
+        self.material_defs[material_id] = (name, effect_id)
+
+    def geometry(self, geometry):
+        primitives = geometry.primitives
+        if not primitives:
+            return
+
+        symbols = []
+        for primitive in primitives:
+            if primitive.material not in symbols:
+                symbols.append(primitive.material)
+
+        positions = np.ascontiguousarray(geometry.positions[:, :3], dtype=np.float32)
+        loop_totals = np.concatenate([primitive.loop_totals for primitive in primitives])
+        vertex_indices = np.concatenate([primitive.vertex_indices for primitive in primitives])
+        loop_starts = np.cumsum(loop_totals, dtype=np.int32) - loop_totals
+        material_indices = np.repeat(
+            np.array([symbols.index(primitive.material) for primitive in primitives], dtype=np.int32),
+            [len(primitive.loop_totals) for primitive in primitives],
+        )
+
+        mesh = bpy.data.meshes.new(geometry.name)
+        mesh.vertices.add(len(positions))
+        mesh.vertices.foreach_set('co', positions.ravel())
+        mesh.loops.add(len(vertex_indices))
+        mesh.loops.foreach_set('vertex_index', vertex_indices)
+        # loop_total은 다음 loop_start로부터 계산된다
+        mesh.polygons.add(len(loop_totals))
+        mesh.polygons.foreach_set('loop_start', loop_starts)
+        mesh.polygons.foreach_set('material_index', material_indices)
+
+        uv_sets = sorted({uv_set for primitive in primitives for uv_set in primitive.uvs})
+        for uv_set in uv_sets:
+            uvs = np.concatenate([
+                primitive.uvs.get(uv_set, np.zeros((len(primitive.vertex_indices), 2), dtype=np.float32))
+                for primitive in primitives
+            ]).astype(np.float32)
+            uv_layer = mesh.uv_layers.new(name=f'UVMap{uv_set}' if uv_set else 'UVMap')
+            uv_layer.data.foreach_set('uv', uvs.ravel())
+
+        normals = None
+        if all(primitive.normals is not None for primitive in primitives):
+            normals = np.concatenate([primitive.normals for primitive in primitives]).astype(np.float32)
+
+        mesh.update(calc_edges=True)
+        mesh.validate(clean_customdata=False)
+
+        if normals is not None and len(normals) == len(mesh.loops):
+            lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+            np.divide(normals, lengths, out=normals, where=lengths > 0)
+            if hasattr(mesh, 'use_auto_smooth'):
+                # 4.0까지는 auto smooth가 꺼져 있으면 custom normal이 무시된다
+                mesh.use_auto_smooth = True
+            mesh.normals_split_custom_set(normals)
+
+        self.meshes[geometry.id] = (mesh.name, symbols)
+
+    def controller(self, skin):
+        self.skins[skin.id] = skin
+
+    def visual_scene(self, nodes):
+        joints = {}
+        self._collect_joints(nodes, self.axis, joints)
+
+        armature_object = self._build_armature(joints) if joints else None
+
+        for node in nodes:
+            self._build_node(node, self.axis, armature_object)
+
+    # ---- 빌드 ----
+
+    def _collect_joints(self, nodes, parent_matrix, joints, parent_name=None):
+        for node in nodes:
+            world = parent_matrix @ node.matrix
+            name = parent_name
+            if node.type == 'JOINT':
+                joints[node.name] = (node, world, parent_name)
+                name = node.name
+            self._collect_joints(node.children, world, joints, name)
+
+    def _bind_matrices(self):
+        """skin의 inverse bind matrix로부터 joint별 rest 행렬을 구한다"""
+        bind = {}
+        for skin in self.skins.values():
+            if skin.inverse_bind_matrices is None:
+                continue
+            for joint, inverse_bind in zip(skin.joints, skin.inverse_bind_matrices):
+                if joint not in bind:
+                    bind[joint] = self.axis @ np.linalg.inv(inverse_bind.astype(np.float64))
+        return bind
+
+    def _build_armature(self, joints):
+        armature = bpy.data.armatures.new(self.name)
+        armature_object = bpy.data.objects.new(self.name, armature)
+        self.collection.objects.link(armature_object)
+        self.objects.append(armature_object)
+
+        bind = self._bind_matrices()
+        self.joint_names = {node.sid: name for name, (node, _, _) in joints.items() if node.sid}
+
+        rest = {}
+        for name, (node, world, _) in joints.items():
+            rest[name] = bind.get(name, bind.get(node.sid, world))
+
+        # 자식 joint까지의 거리로 bone 길이를 정한다
+        lengths = {}
+        for name, (_, _, parent_name) in joints.items():
+            if parent_name:
+                distance = np.linalg.norm(rest[name][:3, 3] - rest[parent_name][:3, 3])
+                if distance > 1e-5:
+                    lengths.setdefault(parent_name, distance)
+
+        view_layer = bpy.context.view_layer
+        view_layer.objects.active = armature_object
+        bpy.ops.object.mode_set(mode='EDIT')
+        try:
+            edit_bones = {}
+            for name, (_, _, parent_name) in joints.items():
+                edit_bone = armature.edit_bones.new(name)
+                edit_bone.head = (0.0, 0.0, 0.0)
+                edit_bone.tail = (0.0, lengths.get(name, DEFAULT_BONE_LENGTH), 0.0)
+                edit_bone.matrix = Matrix(rest[name].tolist())
+                if parent_name:
+                    edit_bone.parent = edit_bones[parent_name]
+                edit_bones[name] = edit_bone
+        finally:
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        return armature_object
+
+    def _build_node(self, node, parent_matrix, armature_object):
+        world = parent_matrix @ node.matrix
+
+        if node.controller and node.controller in self.skins:
+            skin = self.skins[node.controller]
+            obj = self._build_mesh_object(node, skin.source, world)
+            if obj is not None:
+                self._apply_skin(obj, skin, armature_object)
+        elif node.geometry:
+            self._build_mesh_object(node, node.geometry, world)
+
+        for child in node.children:
+            self._build_node(child, world, armature_object)
+
+    def _build_mesh_object(self, node, geometry_id, world):
+        if geometry_id not in self.meshes:
+            return None
+
+        mesh_name, symbols = self.meshes[geometry_id]
+        mesh = bpy.data.meshes[mesh_name]
+        if not mesh.materials:
+            for symbol in symbols:
+                mesh.materials.append(self._material(node.materials.get(symbol, symbol)))
+
+        obj = bpy.data.objects.new(node.name, mesh)
+        obj.matrix_world = Matrix(world.tolist())
+        self.collection.objects.link(obj)
+        self.objects.append(obj)
+        return obj
+
+    def _apply_skin(self, obj, skin, armature_object):
+        # 같은 geometry를 여러 노드가 써도 bind shape는 한 번만 적용한다
+        if obj.data.name not in self.bound_meshes:
+            obj.data.transform(Matrix(skin.bind_shape_matrix.astype(np.float64).tolist()))
+            self.bound_meshes.add(obj.data.name)
+        if armature_object is None:
+            return
+
+        vertex_groups = [obj.vertex_groups.new(name=self.joint_names.get(joint, joint)) for joint in skin.joints]
+        for joint_index, weight, indices in weight_runs(skin, len(obj.data.vertices)):
+            vertex_groups[joint_index].add(indices, weight, 'REPLACE')
+
+        modifier = obj.modifiers.new(name='Armature', type='ARMATURE')
+        modifier.object = armature_object
+        world = obj.matrix_world.copy()
+        obj.parent = armature_object
+        obj.matrix_world = world
+
+    def _material(self, material_id):
+        if material_id in self.material_names:
+            material = bpy.data.materials.get(self.material_names[material_id])
+            if material is not None:
+                return material
+
+        name, effect_id = self.material_defs.get(material_id, (material_id, None))
+        material = bpy.data.materials.new(name)
+        material.use_nodes = True
+        self.material_names[material_id] = material.name
+
+        image_path = self.images.get(self.effects.get(effect_id))
+        if image_path and os.path.exists(image_path):
+            nodes = material.node_tree.nodes
+            principled = next((node for node in nodes if node.type == 'BSDF_PRINCIPLED'), None)
+            if principled is not None:
+                tex_image_node = nodes.new('ShaderNodeTexImage')
+                tex_image_node.image = bpy.data.images.load(image_path, check_existing=True)
+                tex_image_node.location = (principled.location.x - 300, principled.location.y)
+                material.node_tree.links.new(tex_image_node.outputs['Color'], principled.inputs['Base Color'])
+
+        return material
+
+def import_dae(file_path, name=None, collection=None):
+    """DAE 파일을 읽어 만들어진 오브젝트 목록을 반환한다"""
+    name = name or os.path.splitext(os.path.basename(file_path))[0]
+    collection = collection or bpy.context.collection
+
+    builder = ColladaBuilder(name, collection)
+    ColladaReader(file_path).read(builder)
+
+    for obj in builder.objects:
+        obj.select_set(True)
+    if builder.objects:
+        bpy.context.view_layer.objects.active = builder.objects[0]
+
+    return builder.objects
@@ -0,0 +1,431 @@
+import os
+import warnings
+import xml.etree.ElementTree as ET
+from urllib.parse import unquote, urlparse
+import numpy as np
+
+class ColladaPrimitive:
+    """<triangles>/<polylist> 하나. 배열은 모두 loop 단위"""
+    __slots__ = ('material', 'loop_totals', 'vertex_indices', 'normals', 'uvs')
+
+    def __init__(self, material, loop_totals, vertex_indices, normals, uvs):
+        self.material = material
+        self.loop_totals = loop_totals
+        self.vertex_indices = vertex_indices
+        self.normals = normals
+        self.uvs = uvs
+
+class ColladaGeometry:
+    __slots__ = ('id', 'name', 'positions', 'primitives')
+
+    def __init__(self, id, name, positions, primitives):
+        self.id = id
+        self.name = name
+        self.positions = positions
+        self.primitives = primitives
+
+class ColladaSkin:
+    __slots__ = ('id', 'source', 'bind_shape_matrix', 'joints', 'inverse_bind_matrices',
+                 'weight_counts', 'weight_joints', 'weight_values')
+
+    def __init__(self, id, source, bind_shape_matrix, joints, inverse_bind_matrices,
+                 weight_counts, weight_joints, weight_values):
+        self.id = id
+        self.source = source
+        self.bind_shape_matrix = bind_shape_matrix
+        self.joints = joints
+        self.inverse_bind_matrices = inverse_bind_matrices
+        # 정점별 영향 개수와, 그 순서대로 펼친 joint 인덱스 / 가중치
+        self.weight_counts = weight_counts
+        self.weight_joints = weight_joints
+        self.weight_values = weight_values
+
+class ColladaNode:
+    __slots__ = ('id', 'sid', 'name', 'type', 'matrix', 'children',
+                 'geometry', 'controller', 'materials')
+
+    def __init__(self, id, sid, name, type, matrix):
+        self.id = id
+        self.sid = sid
+        self.name = name
+        self.type = type
+        self.matrix = matrix
+        self.children = []
+        # instance_geometry / instance_controller의 url (없으면 None)
+        self.geometry = None
+        self.controller = None
+        # bind_material의 symbol -> material id
+        self.materials = {}
+
+class ColladaReader:
+    """
+    Switch Toolbox가 내보낸 .dae를 iterparse로 읽는 스트리밍 리더.
+    라이브러리 항목 하나를 다 읽으면 handler에 넘기고 바로 element를 지우므로
+    파일 크기와 상관없이 XML 트리가 메모리에 쌓이지 않는다.
+
+    handler는 asset, image, effect, material, geometry, controller, visual_scene 메서드를 가진다.
+    """
+
+    # 다 읽은 즉시 handler로 넘기고 지우는 태그 -> 부모 태그
+    ITEM_TAGS = {
+        'asset': 'COLLADA',
+        'image': 'library_images',
+        'effect': 'library_effects',
+        'material': 'library_materials',
+        'geometry': 'library_geometries',
+        'controller': 'library_controllers',
+        'visual_scene': 'library_visual_scenes',
+    }
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.directory = os.path.dirname(os.path.abspath(file_path))
+
+    def read(self, handler):
+        try:
+            self._read(handler)
+        except ET.ParseError as e:
+            raise ColladaError(f"Invalid COLLADA file: {e}") from e
+
+    def _read(self, handler):
+        stack = []
+        for event, elem in ET.iterparse(self.file_path, events=('start', 'end')):
+            if event == 'start':
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            tag = _local(elem.tag)
+            # <asset>, <image> 등은 다른 항목 안에도 나올 수 있으므로 부모까지 확인한다
+            if tag not in self.ITEM_TAGS or not stack or _local(stack[-1].tag) != self.ITEM_TAGS[tag]:
+                # 쓰지 않는 라이브러리(animation 등)도 다 읽으면 버린다
+                if len(stack) == 1:
+                    elem.clear()
+                    stack[0].remove(elem)
+                continue
+
+            try:
+                getattr(self, f'_read_{tag}')(elem, handler)
+            except (KeyError, IndexError, ValueError, TypeError, AttributeError) as e:
+                # 빠진 source/accessor, 잘못된 offset 등 구조가 깨진 항목. handler(builder)의 실패도 같이 받는다
+                raise ColladaError(f"Malformed <{tag}> '{elem.get('id')}': {type(e).__name__}: {e}") from e
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+    def _read_asset(self, elem, handler):
+        up_axis = _text(_find(elem, 'up_axis')) or 'Y_UP'
+        unit = _find(elem, 'unit')
+        meter = float(unit.get('meter', 1.0)) if unit is not None else 1.0
+        handler.asset(up_axis.strip(), meter)
+
+    def _read_image(self, elem, handler):
+        init_from = _find(elem, 'init_from')
+        # 1.5는 <init_from><ref>, 1.4는 <init_from> 텍스트
+        ref = _find(init_from, 'ref') if init_from is not None else None
+        uri = _text(ref if ref is not None else init_from)
+        if uri:
+            handler.image(elem.get('id'), self._resolve_path(uri))
+
+    def _resolve_path(self, uri):
+        uri = uri.strip()
+        if uri.startswith('file:'):
+            path = unquote(urlparse(uri).path)
+            # file:///C:/... -> C:/...
+            if len(path) > 2 and path[0] == '/' and path[2] == ':':
+                path = path[1:]
+        else:
+            path = unquote(uri)
+        if not os.path.isabs(path):
+            path = os.path.join(self.directory, path)
+        return os.path.normpath(path)
+
+    def _read_effect(self, elem, handler):
+        surfaces = {}
+        samplers = {}
+        for newparam in _iter(elem, 'newparam'):
+            sid = newparam.get('sid')
+            surface = _find(newparam, 'surface')
+            if surface is not None:
+                surfaces[sid] = _text(_find(surface, 'init_from'))
+            sampler = _find(newparam, 'sampler2D')
+            if sampler is not None:
+                source = _find(sampler, 'source')
+                if source is not None:
+                    samplers[sid] = ('surface', _text(source))
+                else:
+                    instance_image = _find(sampler, 'instance_image')
+                    if instance_image is not None:
+                        samplers[sid] = ('image', instance_image.get('url', '').lstrip('#'))
+
+        diffuse_image = None
+        diffuse = _find(elem, 'diffuse')
+        texture = _find(diffuse, 'texture') if diffuse is not None else None
+        if texture is not None:
+            name = texture.get('texture')
+            kind, target = samplers.get(name, ('image', name))
+            diffuse_image = surfaces.get(target, target) if kind == 'surface' else target
+
+        handler.effect(elem.get('id'), diffuse_image)
+
+    def _read_material(self, elem, handler):
+        instance_effect = _find(elem, 'instance_effect')
+        effect_id = instance_effect.get('url', '').lstrip('#') if instance_effect is not None else None
+        handler.material(elem.get('id'), elem.get('name') or elem.get('id'), effect_id)
+
+    def _read_geometry(self, elem, handler):
+        mesh = _find(elem, 'mesh')
+        if mesh is None:
+            return
+
+        sources = {source.get('id'): source for source in _children(mesh, 'source')}
+
+        # <vertices>는 POSITION source를 다른 id로 감싼다
+        vertices_elem = _find(mesh, 'vertices')
+        vertices_id = vertices_elem.get('id') if vertices_elem is not None else None
+        positions = None
+        if vertices_elem is not None:
+            for input_elem in _children(vertices_elem, 'input'):
+                if input_elem.get('semantic') == 'POSITION':
+                    positions = _read_source(sources[input_elem.get('source').lstrip('#')])
+        if positions is None:
+            return
+
+        primitives = []
+        for primitive in mesh:
+            tag = _local(primitive.tag)
+            if tag not in ('triangles', 'polylist'):
+                continue
+
+            p = _find(primitive, 'p')
+            if p is None or not p.text:
+                continue
+
+            inputs = list(_children(primitive, 'input'))
+            stride = max(int(input_elem.get('offset', 0)) for input_elem in inputs) + 1
+            indices = _int_array(p.text).reshape(-1, stride)
+
+            if tag == 'triangles':
+                loop_totals = np.full(len(indices) // 3, 3, dtype=np.int32)
+            else:
+                loop_totals = _int_array(_text(_find(primitive, 'vcount')))
+            if int(loop_totals.sum()) != len(indices):
+                raise ValueError(f"{tag} has {len(indices)} indices for {int(loop_totals.sum())} loops")
+
+            vertex_indices = None
+            normals = None
+            uvs = {}
+            for input_elem in inputs:
+                semantic = input_elem.get('semantic')
+                column = indices[:, int(input_elem.get('offset', 0))]
+                source_id = input_elem.get('source', '').lstrip('#')
+                if semantic == 'VERTEX' and source_id == vertices_id:
+                    vertex_indices = _check_range(column, len(positions), 'VERTEX')
+                elif semantic == 'NORMAL':
+                    normals = _take(_read_source(sources[source_id]), column, 'NORMAL')[:, :3]
+                elif semantic == 'TEXCOORD':
+                    uvs[int(input_elem.get('set', len(uvs)))] = _take(_read_source(sources[source_id]), column, 'TEXCOORD')[:, :2]
+
+            if vertex_indices is None:
+                continue
+
+            primitives.append(ColladaPrimitive(
+                primitive.get('material'),
+                loop_totals,
+                vertex_indices.astype(np.int32),
+                normals,
+                uvs,
+            ))
+
+        handler.geometry(ColladaGeometry(elem.get('id'), elem.get('name') or elem.get('id'), positions, primitives))
+
+    def _read_controller(self, elem, handler):
+        skin = _find(elem, 'skin')
+        if skin is None:
+            return
+
+        sources = {source.get('id'): source for source in _children(skin, 'source')}
+
+        bind_shape = _find(skin, 'bind_shape_matrix')
+        bind_shape_matrix = _float_array(_text(bind_shape)).reshape(4, 4) if bind_shape is not None else np.identity(4, dtype=np.float32)
+
+        joints = []
+        inverse_bind_matrices = None
+        joints_elem = _find(skin, 'joints')
+        for input_elem in _children(joints_elem, 'input'):
+            source = sources[input_elem.get('source').lstrip('#')]
+            if input_elem.get('semantic') == 'JOINT':
+                joints = _read_names(source)
+            elif input_elem.get('semantic') == 'INV_BIND_MATRIX':
+                inverse_bind_matrices = _array_elem(_find(source, 'float_array'), np.float32).reshape(-1, 4, 4)
+
+        weights_elem = _find(skin, 'vertex_weights')
+        offsets = {}
+        weights = None
+        for input_elem in _children(weights_elem, 'input'):
+            offsets[input_elem.get('semantic')] = int(input_elem.get('offset', 0))
+            if input_elem.get('semantic') == 'WEIGHT':
+                weights = _array_elem(_find(sources[input_elem.get('source').lstrip('#')], 'float_array'), np.float32)
+
+        weight_counts = _int_array(_text(_find(weights_elem, 'vcount')))
+        pairs = _int_array(_text(_find(weights_elem, 'v'))).reshape(-1, max(offsets.values()) + 1)
+        if int(weight_counts.sum()) != len(pairs):
+            raise ValueError(f"vertex_weights has {len(pairs)} influences for vcount total {int(weight_counts.sum())}")
+        _check_range(pairs[:, offsets['JOINT']], len(joints), 'JOINT')
+
+        handler.controller(ColladaSkin(
+            elem.get('id'),
+            skin.get('source', '').lstrip('#'),
+            bind_shape_matrix,
+            joints,
+            inverse_bind_matrices,
+            weight_counts,
+            pairs[:, offsets['JOINT']],
+            _take(weights, pairs[:, offsets['WEIGHT']], 'WEIGHT'),
+        ))
+
+    def _read_visual_scene(self, elem, handler):
+        handler.visual_scene([_read_node(node) for node in _children(elem, 'node')])
+
+def _read_node(elem):
+    node = ColladaNode(
+        elem.get('id'),
+        elem.get('sid'),
+        elem.get('name') or elem.get('id'),
+        elem.get('type', 'NODE'),
+        _node_matrix(elem),
+    )
+
+    for child in elem:
+        tag = _local(child.tag)
+        if tag == 'node':
+            node.children.append(_read_node(child))
+        elif tag in ('instance_geometry', 'instance_controller'):
+            url = child.get('url', '').lstrip('#')
+            if tag == 'instance_geometry':
+                node.geometry = url
+            else:
+                node.controller = url
+            for instance_material in _iter(child, 'instance_material'):
+                node.materials[instance_material.get('symbol')] = instance_material.get('target', '').lstrip('#')
+
+    return node
+
+def _node_matrix(elem):
+    """<matrix>, <translate>, <rotate>, <scale>을 선언 순서대로 합성한다"""
+    matrix = np.identity(4)
+    for child in elem:
+        tag = _local(child.tag)
+        if tag == 'matrix':
+            transform = _float_array(child.text).reshape(4, 4)
+        elif tag == 'translate':
+            transform = np.identity(4)
+            transform[:3, 3] = _float_array(child.text)[:3]
+        elif tag == 'scale':
+            transform = np.diag(np.append(_float_array(child.text)[:3], 1.0))
+        elif tag == 'rotate':
+            transform = _rotation_matrix(_float_array(child.text))
+        else:
+            continue
+        matrix = matrix @ transform
+    return matrix
+
+def _rotation_matrix(axis_angle):
+    x, y, z, angle = axis_angle[:4]
+    length = np.sqrt(x * x + y * y + z * z)
+    matrix = np.identity(4)
+    if length == 0:
+        return matrix
+    x, y, z = x / length, y / length, z / length
+    c = np.cos(np.radians(angle))
+    s = np.sin(np.radians(angle))
+    t = 1 - c
+    matrix[:3, :3] = [
+        [t * x * x + c, t * x * y - s * z, t * x * z + s * y],
+        [t * x * y + s * z, t * y * y + c, t * y * z - s * x],
+        [t * x * z - s * y, t * y * z + s * x, t * z * z + c],
+    ]
+    return matrix
+
+def _read_source(source):
+    """<source>의 float_array를 accessor stride에 맞춰 (count, stride) 배열로 읽는다"""
+    values = _array_elem(_find(source, 'float_array'), np.float32)
+    accessor = _find(source, 'accessor')
+    stride = int(accessor.get('stride', 1)) if accessor is not None else 1
+    count = accessor.get('count') if accessor is not None else None
+    if count is not None and len(values) < int(count) * stride:
+        raise ValueError(f"source '{source.get('id')}' has {len(values)} values for accessor count {count} x {stride}")
+    return values[:len(values) - len(values) % stride].reshape(-1, stride)
+
+def _read_names(source):
+    names = _find(source, 'Name_array')
+    if names is None:
+        names = _find(source, 'IDREF_array')
+    return (_text(names) or '').split()
+
+def _check_range(indices, count, semantic):
+    """음수 인덱스는 NumPy에서 조용히 뒤에서부터 세므로 범위를 직접 확인한다"""
+    if len(indices) and (indices.min() < 0 or indices.max() >= count):
+        raise IndexError(f"{semantic} index out of range 0..{count - 1}")
+    return indices
+
+def _take(values, indices, semantic):
+    return values[_check_range(indices, len(values), semantic)]
+
+def _float_array(text, count=None):
+    return _parse_array(text, np.float32, count)
+
+def _int_array(text, count=None):
+    return _parse_array(text, np.int32, count)
+
+def _array_elem(elem, dtype):
+    """<float_array count="N">처럼 count가 있는 배열 요소를 읽는다"""
+    return _parse_array(_text(elem), dtype, elem.get('count') if elem is not None else None)
+
+def _parse_array(text, dtype, count):
+    """
+    공백으로 구분된 숫자를 토큰마다 str을 만들지 않고 바로 배열로 읽는다.
+    잘못된 토큰에서 NumPy 2는 ValueError를 내지만 이전 버전은 DeprecationWarning과 함께 잘린 배열을 돌려주므로
+    경고를 오류로 바꾸고, count가 있으면 개수도 맞춰 본다
+    """
+    if not text:
+        values = np.empty(0, dtype=dtype)
+    else:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', DeprecationWarning)
+            try:
+                values = np.fromstring(text, dtype=dtype, sep=' ')
+            except DeprecationWarning as e:
+                raise ValueError(str(e)) from None
+    if count is not None and len(values) != int(count):
+        raise ValueError(f"array has {len(values)} values for count {count}")
+    return values
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+def _text(elem):
+    return elem.text if elem is not None else None
+
+def _children(elem, name):
+    if elem is None:
+        return
+    for child in elem:
+        if _local(child.tag) == name:
+            yield child
+
+def _iter(elem, name):
+    for child in elem.iter():
+        if _local(child.tag) == name:
+            yield child
+
+def _find(elem, name):
+    if elem is None:
+        return None
+    for child in elem.iter():
+        if child is not elem and _local(child.tag) == name:
+            return child
+    return None
+
+class ColladaError(Exception):
+    pass
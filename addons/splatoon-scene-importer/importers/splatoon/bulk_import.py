@@ -0,0 +1,69 @@
+import bpy
+from contextlib import contextmanager
+
+class BulkImport:
+    """
+    큰 배치용 임포트 모드.
+    배치 동안 임포트한 오브젝트를 viewport에서 끈 staging 컬렉션에 모아 둔다.
+    그래서 파일마다 임포터가 하는 view layer 갱신과 modal 틱마다의 다시 그리기가 새 오브젝트를 평가하지 않는다.
+    새 오브젝트는 선택 상태 대신 staging 컬렉션에서 찾고, 선택은 bpy.ops 대신 data API로 푼다.
+    끝나면 오브젝트를 원래 컬렉션으로 옮기고 view layer를 한 번만 갱신한다.
+
+    파이썬에서 부른 오퍼레이터는 undo step을 남기지 않으므로 undo는 배치 오퍼레이터가 끝날 때 한 번만 쌓인다.
+    """
+
+    STAGING_NAME = 'Splatoon Import'
+
+    def __init__(self, context):
+        self.view_layer = context.view_layer
+        self.layer_collection = self.view_layer.active_layer_collection
+        self.target = self.layer_collection.collection
+
+        self.staging = bpy.data.collections.new(self.STAGING_NAME)
+        self.target.children.link(self.staging)
+        self.staging.hide_viewport = True
+        # 임포터는 active 컬렉션에 오브젝트를 넣는다
+        self.view_layer.active_layer_collection = self.layer_collection.children[self.staging.name]
+        # staging에서 이미 돌려준 오브젝트 수
+        self._seen = 0
+        self.staged = 0
+
+    def new_objects(self):
+        """마지막 호출 이후 staging에 들어온 오브젝트"""
+        objects = list(self.staging.objects[self._seen:])
+        self._seen += len(objects)
+        self.staged += len(objects)
+        return objects
+
+    @staticmethod
+    def deselect(objects):
+        for obj in objects:
+            obj.select_set(False)
+
+    @contextmanager
+    def visible(self):
+        """edit mode가 필요한 임포트(아마추어를 만드는 FBX 임포터와 내장 DAE 리더) 동안만 staging을 보이게 한다"""
+        self.staging.hide_viewport = False
+        try:
+            yield
+        finally:
+            self.staging.hide_viewport = True
+
+    def finish(self):
+        """staging의 오브젝트를 원래 컬렉션으로 옮기고 view layer를 한 번 갱신한다"""
+        if self.staging is None:
+            return
+
+        target_objects = self.target.objects
+        for obj in list(self.staging.objects):
+            if target_objects.get(obj.name) is None:
+                target_objects.link(obj)
+            self.staging.objects.unlink(obj)
+
+        self.view_layer.active_layer_collection = self.layer_collection
+        bpy.data.collections.remove(self.staging)
+        self.staging = None
+        self.view_layer.update()
+
+    def summary(self):
+        return f"Bulk import: {self.staged} objects, view layer updated once"
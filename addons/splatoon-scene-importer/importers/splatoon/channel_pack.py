@@ -0,0 +1,151 @@
+import os
+import json
+import hashlib
+import threading
+import numpy as np
+from collections import namedtuple
+from ...utilities.cache_dir import cache_dir
+from ...utilities.file_cache import EvictionBudget, atomic_write, file_hash, touch
+from ...utilities.png import decode_png_texels, encode_png, read_png_header
+
+# suffix -> (채널 번호, 소스가 없을 때 채울 값)
+# 알파에 opa를 두면 이미지 노드의 Alpha 출력을 그대로 쓸 수 있다
+PACKED_CHANNELS = {
+    '_mtl': (0, 0),
+    '_rgh': (1, 255),
+    '_ao': (2, 255),
+    '_opa': (3, 255),
+}
+
+# 캐시 디렉토리 용량. 넘으면 오래 쓰지 않은 PNG와 .json부터 지운다
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+PARTIAL_SUFFIXES = ('.partial.png', '.partial.json')
+
+# path: 묶은 PNG, channels: {suffix: 채널 번호}
+PackedTexture = namedtuple('PackedTexture', ['path', 'channels'])
+
+class ChannelPacker:
+    """
+    한 채널만 의미가 있는 흑백 맵(_mtl, _rgh, _ao, _opa)을 base name마다 하나의 RGBA PNG로 묶는다.
+    결과는 소스 파일 내용의 해시를 키로 디스크에 보관하므로 다음 임포트에서는 디코딩하지 않는다.
+    캐시가 max_bytes를 넘으면 오래 쓰지 않은 것부터 지운다.
+    MaterialPlanner가 플랜 스레드에서 부르므로 bpy를 쓰지 않는다.
+
+    흑백이 아니거나 크기가 다르거나 디코딩할 수 없는 소스는 묶지 않고 따로 불러오게 남긴다.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory or cache_dir('packed')
+        self.eviction = EvictionBudget(self.directory, max_bytes, PARTIAL_SUFFIXES)
+        self._lock = threading.Lock()
+        # 키 -> PackedTexture 또는 None(묶을 수 없음)
+        self._results = {}
+        self.packed = 0
+        self.reused = 0
+        # 따로 올렸을 RGBA8 텍스처를 하나로 줄여 아낀 GPU 메모리
+        self.saved_bytes = 0
+
+    def key(self, sources):
+        digest = hashlib.sha256()
+        for suffix in sorted(sources):
+            digest.update(suffix.encode('utf-8'))
+            digest.update(file_hash(sources[suffix]).encode('ascii'))
+        return digest.hexdigest()
+
+    def pack(self, sources):
+        """
+        sources는 {suffix: 경로}. 두 개 이상 묶을 수 있으면 PackedTexture, 아니면 None
+        """
+        sources = {suffix: path for suffix, path in sources.items() if suffix in PACKED_CHANNELS}
+        if len(sources) < 2:
+            return None
+        try:
+            key = self.key(sources)
+        except OSError:
+            return None
+
+        with self._lock:
+            if key in self._results:
+                return self._results[key]
+
+        result = self._pack(key, sources)
+        with self._lock:
+            self._results[key] = result
+        return result
+
+    def _pack(self, key, sources):
+        channels_path = os.path.join(self.directory, key + '.json')
+        packed_path = os.path.join(self.directory, key + '.png')
+        if os.path.exists(packed_path) and os.path.exists(channels_path):
+            try:
+                with open(channels_path, 'r', encoding='utf-8') as f:
+                    channels = json.load(f)
+            except (OSError, ValueError):
+                # 다른 스레드가 쓰는 중이면 다시 묶는다
+                channels = None
+            if channels:
+                touch(packed_path)
+                touch(channels_path)
+                size = self._size(packed_path)
+                with self._lock:
+                    self.reused += 1
+                    self.saved_bytes += (len(channels) - 1) * size
+                return PackedTexture(packed_path, channels)
+
+        planes = {}
+        shape = None
+        for suffix, path in sorted(sources.items()):
+            plane = self._gray_plane(path)
+            if plane is None:
+                continue
+            if shape is None:
+                shape = plane.shape
+            if plane.shape == shape:
+                planes[suffix] = plane
+        if len(planes) < 2:
+            return None
+
+        texels = np.empty(shape + (4,), dtype=np.uint8)
+        for suffix, (index, fill) in PACKED_CHANNELS.items():
+            texels[..., index] = planes[suffix] if suffix in planes else fill
+
+        atomic_write(packed_path, lambda partial_path: encode_png(partial_path, texels), PARTIAL_SUFFIXES[0])
+
+        channels = {suffix: PACKED_CHANNELS[suffix][0] for suffix in planes}
+        atomic_write(channels_path, lambda partial_path: self._write_channels(partial_path, channels), PARTIAL_SUFFIXES[1])
+        self.eviction.wrote(packed_path, channels_path)
+
+        with self._lock:
+            self.packed += 1
+            self.saved_bytes += (len(channels) - 1) * shape[0] * shape[1] * 4
+        return PackedTexture(packed_path, channels)
+
+    @staticmethod
+    def _write_channels(path, channels):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(channels, f)
+
+    @staticmethod
+    def _gray_plane(path):
+        """흑백 PNG의 한 채널. 색이 있거나 디코딩할 수 없으면 None"""
+        texels = decode_png_texels(path)
+        if texels is None:
+            return None
+        if texels.shape[2] >= 3:
+            red = texels[..., 0]
+            if not (np.array_equal(red, texels[..., 1]) and np.array_equal(red, texels[..., 2])):
+                return None
+        return np.ascontiguousarray(texels[..., 0])
+
+    @staticmethod
+    def _size(path):
+        header = read_png_header(path)
+        return header.width * header.height * 4 if header else 0
+
+    def summary(self):
+        return (
+            f"Channel-packed textures: {self.packed + self.reused} "
+            f"(~{self.saved_bytes / (1024 * 1024):.1f} MB VRAM saved)"
+        )
@@ -0,0 +1,178 @@
+import os
+import fnmatch
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+MODEL_EXTENSIONS = ('.dae', '.fbx')
+TEXTURE_EXTENSION = '.png'
+# 모델 옆에 PNG가 없을 때 찾아보는 텍스처 폴더 이름
+TEXTURE_FOLDER_NAMES = ('textures', 'texture', 'tex', 'images')
+
+# path: 모델 파일, size: 바이트, texture_dir: 텍스처를 찾을 디렉토리
+ModelFile = namedtuple('ModelFile', ['path', 'size', 'texture_dir'])
+
+def split_patterns(text):
+    """'*.dae;Obj_*' 같은 세미콜론 구분 glob 목록"""
+    return [pattern.strip() for pattern in (text or '').split(';') if pattern.strip()]
+
+class DirectoryScanner:
+    """
+    맵 폴더 트리에서 DAE/FBX 파일을 찾는다.
+    디렉토리 하나의 scandir를 작업 하나로 스레드 풀에 넣고, 찾은 하위 디렉토리를 다시 넣는다.
+    네트워크 드라이브나 느린 디스크에서는 scandir 대기가 대부분이라 스레드로 겹칠 수 있다.
+
+    include/exclude glob은 스캔 루트 기준 상대 경로('/' 구분)와 파일 이름 모두에 맞춰 본다.
+    exclude에 걸린 디렉토리는 아래로 내려가지 않는다.
+    """
+
+    def __init__(self, include=(), exclude=(), max_workers=None):
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) * 2)
+        self.directories = 0
+        self.models = 0
+        self._lock = threading.Lock()
+        # 디렉토리 -> PNG가 있는지
+        self._has_textures = {}
+
+    @staticmethod
+    def _matches(patterns, relative_path):
+        name = relative_path.rsplit('/', 1)[-1]
+        return any(
+            fnmatch.fnmatch(relative_path.lower(), pattern.lower()) or fnmatch.fnmatch(name.lower(), pattern.lower())
+            for pattern in patterns
+        )
+
+    def accepts(self, relative_path):
+        if self._matches(self.exclude, relative_path):
+            return False
+        return not self.include or self._matches(self.include, relative_path)
+
+    def scan(self, paths):
+        """paths(파일 또는 디렉토리)에서 찾은 ModelFile 목록. 순서는 정해져 있지 않다"""
+        models = []
+        directories = []
+        for path in paths:
+            path = os.path.abspath(path)
+            if os.path.isdir(path):
+                directories.append((path, path))
+            elif path.lower().endswith(MODEL_EXTENSIONS) and self.accepts(os.path.basename(path)):
+                models.append(path)
+
+        found = self.describe(models)
+        if not directories:
+            return found
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='splatoon-scan') as executor:
+            pending = [executor.submit(self._scan_directory, root, directory) for root, directory in directories]
+            while pending:
+                future = pending.pop()
+                subdirectories, directory_models = future.result()
+                found += directory_models
+                pending += [executor.submit(self._scan_directory, root, directory) for root, directory in subdirectories]
+        return found
+
+    def _scan_directory(self, root, directory):
+        subdirectories = []
+        models = []
+        has_textures = False
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            entries = []
+
+        for entry in entries:
+            relative_path = os.path.relpath(entry.path, root).replace(os.sep, '/')
+            lower_name = entry.name.lower()
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                if not self._matches(self.exclude, relative_path):
+                    subdirectories.append((root, entry.path))
+            elif lower_name.endswith(TEXTURE_EXTENSION):
+                has_textures = True
+            elif lower_name.endswith(MODEL_EXTENSIONS) and self.accepts(relative_path):
+                try:
+                    size = entry.stat().st_size
+                except OSError:
+                    size = 0
+                models.append((entry.path, size))
+
+        with self._lock:
+            self._has_textures[directory] = has_textures
+            self.directories += 1
+            self.models += len(models)
+
+        texture_dir = self.texture_directory(directory) if models else directory
+        return subdirectories, [ModelFile(path, size, texture_dir) for path, size in models]
+
+    def _contains_textures(self, directory):
+        with self._lock:
+            cached = self._has_textures.get(directory)
+        if cached is not None:
+            return cached
+        try:
+            has_textures = any(name.lower().endswith(TEXTURE_EXTENSION) for name in os.listdir(directory))
+        except OSError:
+            has_textures = False
+        with self._lock:
+            self._has_textures[directory] = has_textures
+        return has_textures
+
+    def texture_directory(self, directory):
+        """
+        모델 디렉토리에 짝지을 텍스처 디렉토리.
+        PNG가 같은 폴더에 있으면 그 폴더, 없으면 Textures 같은 하위 폴더, 그 다음은 상위 폴더
+        """
+        if self._contains_textures(directory):
+            return directory
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            names = []
+        for name in names:
+            folder = os.path.join(directory, name)
+            if name.lower() in TEXTURE_FOLDER_NAMES and os.path.isdir(folder) and self._contains_textures(folder):
+                return folder
+        parent = os.path.dirname(directory)
+        if parent != directory and self._contains_textures(parent):
+            return parent
+        return directory
+
+    def describe(self, paths):
+        """직접 고른 파일 목록을 ModelFile로 만든다"""
+        models = []
+        for path in paths:
+            path = os.path.abspath(path)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0
+            models.append(ModelFile(path, size, self.texture_directory(os.path.dirname(path))))
+        return models
+
+def order_for_throughput(models, parallel_conversion):
+    """
+    처리 순서.
+    텍스처 디렉토리별로 묶어 텍스처 색인과 이미지 캐시가 이어서 쓰이게 한다.
+    변환을 병렬로 돌릴 수 있으면 가장 큰 DAE 변환이 먼저 시작되도록 큰 그룹, 큰 파일 순서로,
+    아니면 경로 순서로 둔다.
+    """
+    groups = {}
+    for model in models:
+        groups.setdefault(model.texture_dir, []).append(model)
+
+    if not parallel_conversion:
+        return [model for texture_dir in sorted(groups) for model in sorted(groups[texture_dir])]
+
+    def conversion_size(model):
+        return model.size if model.path.lower().endswith('.dae') else 0
+
+    ordered = []
+    for group in sorted(groups.values(), key=lambda group: max(conversion_size(model) for model in group), reverse=True):
+        ordered += sorted(group, key=lambda model: (-conversion_size(model), model.path))
+    return ordered
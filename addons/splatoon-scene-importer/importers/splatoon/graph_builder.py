@@ -0,0 +1,127 @@
+class NodeGraph:
+    """
+    노드 트리 하나에 노드와 링크를 만드는 헬퍼.
+    location, hide, 링크를 노드마다 바로 쓴다. BatchedNodeGraph와 결과가 같아야 한다
+    """
+
+    def __init__(self, node_tree):
+        self.nodes = node_tree.nodes
+        self.links = node_tree.links
+        # 키 -> 노드
+        self.built = {}
+
+    def add_existing(self, key, name):
+        self.built[key] = self.nodes[name]
+
+    def new(self, key, node_type, location, hide):
+        node = self.nodes.new(node_type)
+        node.location = location
+        node.hide = hide
+        self.built[key] = node
+        return node
+
+    def place(self, key, location, hide=None):
+        node = self.built[key]
+        node.location = location
+        if hide is not None:
+            node.hide = hide
+
+    def input(self, key, socket):
+        return self.built[key].inputs[socket]
+
+    def output(self, key, socket):
+        return self.built[key].outputs[socket]
+
+    def link(self, from_key, from_socket, to_key, to_socket):
+        self.links.new(self.output(from_key, from_socket), self.input(to_key, to_socket))
+
+    def finish(self):
+        pass
+
+    def remove(self, key):
+        self.nodes.remove(self.built.pop(key))
+
+class BatchedNodeGraph(NodeGraph):
+    """
+    location과 hide는 노드마다 쓰지 않고 모아 두었다가 finish()에서 foreach_set으로 한 번에 쓴다.
+    노드 속성을 하나씩 쓰면 RNA update가 불려 그때마다 노드 트리 갱신이 예약되기 때문이다.
+    소켓은 (노드 키, 이름)마다 한 번만 찾는다.
+    새 노드의 입력은 아직 링크가 없으므로 처음 잇는 링크는 기존 링크를 찾아 지우는 검사를 건너뛴다.
+    """
+
+    def __init__(self, node_tree):
+        super().__init__(node_tree)
+        # 키 -> nodes 안의 번호. 새 노드는 끝에 붙으므로 만든 순서로 번호를 안다
+        self._indices = {}
+        # 번호 -> (location, hide). hide가 None이면 그대로 둔다
+        self._layout = {}
+        # (키, 출력인지, 소켓 이름) -> 소켓
+        self._sockets = {}
+        # 이번에 만든 노드의 키
+        self._new = set()
+        # 링크를 만든 새 노드 입력 (키, 소켓 이름)
+        self._linked = set()
+
+    def new(self, key, node_type, location, hide):
+        node = self.nodes.new(node_type)
+        self.built[key] = node
+        self._new.add(key)
+        self._indices[key] = len(self.nodes) - 1
+        self._layout[self._indices[key]] = (location, hide)
+        return node
+
+    def place(self, key, location, hide=None):
+        index = self._indices.get(key)
+        if index is None:
+            index = self._indices[key] = self.nodes.find(self.built[key].name)
+        previous_hide = self._layout.get(index, (None, None))[1]
+        self._layout[index] = (location, previous_hide if hide is None else hide)
+
+    def input(self, key, socket):
+        cache_key = (key, False, socket)
+        found = self._sockets.get(cache_key)
+        if found is None:
+            found = self._sockets[cache_key] = self.built[key].inputs[socket]
+        return found
+
+    def output(self, key, socket):
+        cache_key = (key, True, socket)
+        found = self._sockets.get(cache_key)
+        if found is None:
+            found = self._sockets[cache_key] = self.built[key].outputs[socket]
+        return found
+
+    def link(self, from_key, from_socket, to_key, to_socket):
+        fresh = to_key in self._new and (to_key, to_socket) not in self._linked
+        if fresh:
+            self._linked.add((to_key, to_socket))
+        self.links.new(self.output(from_key, from_socket), self.input(to_key, to_socket), verify_limits=not fresh)
+
+    def finish(self):
+        """모아 둔 location과 hide를 노드 트리 전체에 한 번씩 쓴다"""
+        if not self._layout:
+            return
+        count = len(self.nodes)
+        locations = [0.0] * (count * 2)
+        hides = [False] * count
+        self.nodes.foreach_get('location', locations)
+        self.nodes.foreach_get('hide', hides)
+
+        write_hide = False
+        for index, (location, hide) in self._layout.items():
+            if location is not None:
+                locations[index * 2:index * 2 + 2] = location
+            if hide is not None:
+                write_hide = write_hide or hides[index] != hide
+                hides[index] = hide
+
+        self.nodes.foreach_set('location', locations)
+        if write_hide:
+            self.nodes.foreach_set('hide', hides)
+        self._layout.clear()
+
+    def remove(self, key):
+        # 노드를 지우면 뒤 노드의 번호가 당겨지므로 모아 둔 배치를 쓴 뒤에만 지운다
+        assert not self._layout
+        super().remove(key)
+        self._indices.clear()
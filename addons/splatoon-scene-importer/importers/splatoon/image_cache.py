@@ -0,0 +1,86 @@
+import os
+import bpy
+from ...utilities.profiling import NULL_PROFILER
+
+NON_COLOR = 'Non-Color'
+
+class ImageCache:
+    """
+    배치 단위 이미지 datablock 캐시.
+    (실제 경로, 파일 크기, mtime, colorspace)를 키로 이미 로드한 이미지를 돌려준다.
+
+    같은 PNG가 Color와 Non-Color로 동시에 쓰이면 colorspace별로 datablock을 따로 둔다.
+    colorspace는 이미지 단위 설정이라 하나를 공유하면 한쪽 노드의 결과가 틀어지기 때문이다.
+    """
+
+    def __init__(self, profiler=NULL_PROFILER):
+        self.profiler = profiler
+        self._images = {}
+        self._keys = {}
+        self.loads = 0
+        self.hits = 0
+
+    @staticmethod
+    def _key(path, non_color):
+        real_path = os.path.realpath(path)
+        stat = os.stat(real_path)
+        return (os.path.normcase(real_path), stat.st_size, stat.st_mtime_ns, bool(non_color))
+
+    def _lookup(self, key):
+        image_name = self._images.get(key)
+        if image_name is None:
+            return None
+
+        image = bpy.data.images.get(image_name)
+        if image is None:
+            # 사용자가 지웠거나 이름이 바뀐 경우
+            del self._images[key]
+            self._keys.pop(image_name, None)
+        return image
+
+    def load(self, path, non_color=False):
+        """이미지를 로드하거나 캐시된 datablock을 반환한다"""
+        try:
+            key = self._key(path, non_color)
+        except OSError:
+            key = None
+
+        if key is not None:
+            image = self._lookup(key)
+            if image is not None:
+                self.hits += 1
+                return image
+
+        with self.profiler.span('image_load'):
+            image = bpy.data.images.load(path)
+        self.loads += 1
+        if non_color:
+            image.colorspace_settings.name = NON_COLOR
+
+        if key is not None:
+            self._images[key] = image.name
+            self._keys[image.name] = key
+        return image
+
+    def names(self):
+        """캐시가 가진 이미지 이름"""
+        return set(self._keys)
+
+    def as_non_color(self, image):
+        """
+        image를 Non-Color로 쓰기 위한 datablock을 반환한다.
+        캐시가 만든 Color 이미지는 다른 머티리얼과 공유 중일 수 있으므로 Non-Color 버전을 따로 받는다.
+        """
+        if image.colorspace_settings.name == NON_COLOR:
+            return image
+
+        key = self._keys.get(image.name)
+        if key is None:
+            image.colorspace_settings.name = NON_COLOR
+            return image
+
+        return self.load(bpy.path.abspath(image.filepath), non_color=True)
+
+    def clear(self):
+        self._images.clear()
+        self._keys.clear()
@@ -0,0 +1,135 @@
+import os
+import json
+from ...utilities.file_cache import file_hash
+
+# 씬 custom property 이름
+MANIFEST_KEY = 'splatoon_import_manifest'
+MANIFEST_VERSION = 1
+
+# 파일별로 할 일
+IMPORT = 'IMPORT'        # 처음 임포트
+SKIP = 'SKIP'            # 소스와 옵션이 같음
+REBUILD = 'REBUILD'      # 머티리얼 옵션만 바뀜. 머티리얼만 다시 만든다
+REPLACE = 'REPLACE'      # 소스나 geometry 옵션이 바뀜. 이전 오브젝트를 지우고 다시 임포트한다
+
+class ImportManifest:
+    """
+    씬에 저장하는 배치 임포트 기록.
+    파일마다 소스 해시, 임포트 옵션, 만든 오브젝트/머티리얼/이미지 이름을 남기고
+    머티리얼마다 처리하기 전(임포터가 만든 상태)의 노드 그래프를 남긴다.
+    같은 파일을 다시 임포트하면 이것으로 건너뛸지, 머티리얼만 다시 만들지, 교체할지 정한다.
+    """
+
+    def __init__(self, files=None, materials=None):
+        # normcase 절대 경로 -> 파일 항목
+        self.files = files or {}
+        # 머티리얼 이름 -> {'nodes': [...], 'links': [...]}
+        self.materials = materials or {}
+
+    @classmethod
+    def load(cls, scene):
+        try:
+            data = json.loads(scene.get(MANIFEST_KEY, '') or '{}')
+        except ValueError:
+            data = {}
+        if data.get('version') != MANIFEST_VERSION:
+            return cls()
+        return cls(data.get('files'), data.get('materials'))
+
+    def save(self, scene):
+        # 이미 지워진 머티리얼의 그래프는 남기지 않는다
+        used = {name for entry in self.files.values() for name in entry['materials']}
+        self.materials = {name: graph for name, graph in self.materials.items() if name in used}
+        scene[MANIFEST_KEY] = json.dumps({
+            'version': MANIFEST_VERSION,
+            'files': self.files,
+            'materials': self.materials,
+        })
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def entry(self, path):
+        return self.files.get(self._key(path))
+
+    def action(self, path, geometry_options, material_options, objects_exist):
+        """
+        path를 어떻게 처리할지. 크기와 mtime이 같으면 해시를 다시 계산하지 않는다.
+        objects_exist는 이름 목록을 받아 모두 씬에 남아 있는지 확인하는 함수
+        """
+        entry = self.entry(path)
+        if entry is None:
+            return IMPORT
+        if not objects_exist(entry['objects']):
+            return REPLACE
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return REPLACE
+        changed = (stat.st_size, stat.st_mtime_ns) != (entry['size'], entry['mtime_ns'])
+        if changed and file_hash(path) != entry['hash']:
+            return REPLACE
+        if entry['geometry_options'] != geometry_options:
+            return REPLACE
+        if entry['material_options'] != material_options:
+            return REBUILD
+        return SKIP
+
+    def record(self, path, geometry_options, material_options, objects, materials, images):
+        stat = os.stat(path)
+        entry = self.entry(path)
+        # mtime만 바뀐 경우 등 이미 계산한 해시를 그대로 쓴다
+        if entry is not None and (stat.st_size, stat.st_mtime_ns) == (entry['size'], entry['mtime_ns']):
+            digest = entry['hash']
+        else:
+            digest = file_hash(path)
+
+        self.files[self._key(path)] = {
+            'path': os.path.abspath(path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash': digest,
+            'geometry_options': geometry_options,
+            'material_options': material_options,
+            'objects': sorted(objects),
+            'materials': sorted(materials),
+            'images': sorted(images),
+        }
+
+    def forget(self, path):
+        self.files.pop(self._key(path), None)
+
+def capture_graph(material):
+    """임포터가 만든 상태의 노드 이름과 링크"""
+    node_tree = material.node_tree
+    return {
+        'nodes': [node.name for node in node_tree.nodes],
+        'links': [
+            [link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier]
+            for link in node_tree.links
+        ],
+    }
+
+def restore_graph(material, graph):
+    """
+    capture_graph 때 없던 노드를 지우고 링크를 그때대로 되돌린다.
+    처리 중에 지운 노드(임포트된 alpha 노드 등)는 되살리지 않는다
+    """
+    node_tree = material.node_tree
+    original = set(graph['nodes'])
+    for node in list(node_tree.nodes):
+        if node.name not in original:
+            node_tree.nodes.remove(node)
+    node_tree.links.clear()
+
+    for from_node, from_socket, to_node, to_socket in graph['links']:
+        source = node_tree.nodes.get(from_node)
+        target = node_tree.nodes.get(to_node)
+        if source is None or target is None:
+            continue
+        output = next((socket for socket in source.outputs if socket.identifier == from_socket), None)
+        socket = next((socket for socket in target.inputs if socket.identifier == to_socket), None)
+        if output is not None and socket is not None:
+            node_tree.links.new(output, socket)
@@ -0,0 +1,585 @@
+"""
+머티리얼 처리 계획.
+bpy 없이 만들 수 있는 불변 데이터라서 배치 전체를 스레드에서 미리 계산할 수 있다.
+노드 트리에 적용하는 것은 MaterialProcessor가 한다.
+"""
+
+import os
+from collections import namedtuple
+from .texture_roles import ROLES, SuffixClassifier
+from ...utilities.png import is_grayscale_png
+from ...utilities.profiling import NULL_PROFILER
+
+# 노드 키는 플랜 안에서의 이름이다. 기존 노드는 existing에 (키, 노드 이름)으로 들어간다
+PRINCIPLED = 'principled'
+OUTPUT = 'output'
+PACKED = 'texture_packed'
+PACKED_SEPARATE = 'packed_separate'
+
+# 임포트할 때 노드 트리에 이미 있던 상태
+LinkedSource = namedtuple('LinkedSource', ['node', 'socket', 'image_path', 'image_source'])
+MaterialSnapshot = namedtuple('MaterialSnapshot', ['name', 'principled', 'location', 'linked', 'output', 'images'])
+
+MaterialOptions = namedtuple(
+    'MaterialOptions',
+    ['apply_second_shader', 'shader_mix_style', 'use_node_groups', 'pack_channels', 'texture_size', 'suffix_aliases'],
+    defaults=(False, 'FULL', ''),
+)
+
+# channel_packed이면 채널마다 다른 맵이 들어 있는 이미지다
+# source_path는 path가 줄인 프록시일 때의 원본 경로
+TexturePlan = namedtuple(
+    'TexturePlan', ['key', 'path', 'non_color', 'channel_packed', 'source_path'], defaults=(False, None),
+)
+# condition은 None 또는 (grayscale check 키, 기대값)
+NodeSpec = namedtuple(
+    'NodeSpec',
+    ['key', 'type', 'location', 'hide', 'label', 'texture', 'node_group', 'properties', 'defaults', 'output_defaults', 'condition'],
+    defaults=(False, '', None, None, (), (), (), None),
+)
+LinkSpec = namedtuple('LinkSpec', ['from_key', 'from_socket', 'to_key', 'to_socket', 'condition'], defaults=(None,))
+# hide가 None이면 그대로 둔다
+Placement = namedtuple('Placement', ['key', 'location', 'hide'])
+SocketDefault = namedtuple('SocketDefault', ['key', 'socket', 'value'])
+# grayscale이 None이면 헤더로 판단할 수 없으므로 적용할 때 픽셀을 확인한다
+GrayscaleCheck = namedtuple('GrayscaleCheck', ['key', 'grayscale'])
+
+# signature는 배치 안에서 처리한 머티리얼을 재사용할 때의 키.
+# base name, 찾은 텍스처 파일, 임포터가 연결해 둔 이미지, 셰이더 옵션이 같으면 같은 머티리얼이 된다
+MaterialPlan = namedtuple(
+    'MaterialPlan',
+    ['base_name', 'source_images', 'textures', 'existing', 'placements', 'nodes', 'links',
+     'socket_defaults', 'grayscale_checks', 'removals', 'signature'],
+)
+
+class MaterialPlanner:
+    """MaterialSnapshot과 텍스처 색인으로 MaterialPlan을 만든다"""
+
+    def __init__(
+        self, texture_index, profiler=NULL_PROFILER, channel_packer=None, texture_proxies=None, classifier=None,
+        texture_inventory=None,
+    ):
+        self.texture_index = texture_index
+        self.texture_inventory = texture_inventory
+        self.classifier = classifier if classifier is not None else SuffixClassifier()
+        self.profiler = profiler
+        self.channel_packer = channel_packer
+        self.texture_proxies = texture_proxies
+
+    def plan_all(self, jobs, executor=None):
+        """(snapshot, dir_path, options) 목록의 플랜. executor가 있으면 스레드에서 계산한다"""
+        if executor is None:
+            return [self.plan(*job) for job in jobs]
+        return list(executor.map(lambda job: self.plan(*job), jobs))
+
+    def plan(self, snapshot, dir_path, options):
+        with self.profiler.span('plan', material=snapshot.name):
+            return self._plan(snapshot, dir_path, options)
+
+    def _plan(self, snapshot, dir_path, options):
+        base_name = self.find_base_name(snapshot)
+        with self.profiler.span('texture_lookup'):
+            texture_set = self.classifier.classify(self.texture_index, dir_path, base_name)
+        draft = _Draft(snapshot, base_name, texture_set, self.profiler, self.texture_proxies)
+        if options.pack_channels and self.channel_packer is not None:
+            self._plan_packing(draft)
+
+        if snapshot.principled is None:
+            draft.node(PRINCIPLED, 'ShaderNodeBsdfPrincipled', (0, 0))
+        draft.default(PRINCIPLED, 'Base Color', (0, 0, 0, 1))
+
+        # 2nd texture의 영향을 받지않은 base color. emission에서 사용한다
+        base_color = self._plan_base_color(draft, options)
+
+        # metallic to 0
+        draft.default(PRINCIPLED, 'Metallic', 0)
+
+        # link textures
+        self._plan_principled_texture(draft, '_mtl')
+        self._plan_principled_texture(draft, '_rgh')
+
+        self._plan_alpha(draft)
+        self._plan_normal(draft)
+        self._plan_emission(draft, options, base_color)
+        if options.apply_second_shader:
+            if options.shader_mix_style == 'COLOR':
+                self._plan_second_color(draft, options)
+            elif options.shader_mix_style == 'SHADE':
+                self._plan_second_shader(draft, options)
+
+        return draft.freeze(options)
+
+    def _plan_packing(self, draft):
+        """이 머티리얼이 따로 불러올 흑백 맵을 하나의 RGBA 이미지로 묶는다"""
+        suffixes = ['_ao', '_opa']
+        # 임포터가 이미 연결한 입력은 그대로 두므로 묶지 않는다
+        if 'Metallic' not in draft.linked:
+            suffixes.append('_mtl')
+        if 'Roughness' not in draft.linked:
+            suffixes.append('_rgh')
+
+        sources = {}
+        for suffix in suffixes:
+            path = draft.find(suffix)
+            if path:
+                sources[suffix] = path
+        with self.profiler.span('channel_pack', material=draft.snapshot.name):
+            draft.packed = self.channel_packer.pack(sources)
+
+    def find_base_name(self, snapshot):
+        """텍스처 파일명의 base name. 찾지 못하면 머티리얼 이름에서 얻는다"""
+        for image_path in snapshot.images:
+            base_name = self.classifier.base_name(os.path.basename(image_path))
+            if base_name is not None:
+                return base_name
+
+        # Remove suffixes like '.001', '.002', etc.
+        return snapshot.name.split('.')[0]
+
+    def _plan_base_color(self, draft, options):
+        ao = draft.texture_output('_ao')
+        tcl = draft.texture('_tcl')
+
+        if 'Base Color' not in draft.linked:
+            return None
+
+        base_key, base_socket = draft.linked['Base Color']
+        draft.place(base_key, (draft.base_x, draft.y), hide=True)
+
+        if options.use_node_groups and (ao or tcl):
+            group = draft.node('base_color_group', 'ShaderNodeGroup', (draft.base_x + 300, draft.y), node_group='BASE_COLOR')
+            draft.link(base_key, base_socket, group, 'Color')
+            if ao:
+                draft.link(*ao, group, 'AO')
+            if tcl:
+                draft.link(tcl, 'Color', group, 'Tcl')
+            return draft.link_principled(group, 'Color', 'Base Color')
+
+        final = (base_key, base_socket)
+        x = draft.base_x + 300
+
+        if ao:
+            ao_multiply = draft.node(
+                'ao_multiply', 'ShaderNodeMixRGB', (x, draft.y), hide=True,
+                properties=(('blend_type', 'MULTIPLY'),),
+                defaults=(('Fac', 1.0), (2, (1, 1, 1, 1))),
+            )
+            x += 200
+            draft.link(*final, ao_multiply, 1)
+            draft.link(*ao, ao_multiply, 2)
+            final = (ao_multiply, 'Color')
+
+        if tcl:
+            tcl_mix = draft.node(
+                'tcl_mix', 'ShaderNodeMixRGB', (x, draft.y + 100), label='Tcl Mix',
+                properties=(('blend_type', 'MIX'),),
+                defaults=((2, (1, 1, 1, 1)),),
+            )
+            draft.link(*final, tcl_mix, 1)
+            draft.link(tcl, 'Color', tcl_mix, 'Fac')
+            final = (tcl_mix, 'Color')
+
+        return draft.link_principled(*final, 'Base Color')
+
+    def _plan_principled_texture(self, draft, suffix):
+        input_name = ROLES[suffix].principled_input
+        # 블랜더가 자동으로 import한것은 신뢰한다
+        if input_name in draft.linked:
+            draft.place(draft.linked[input_name][0], (draft.base_x, draft.y + ROLES[suffix].layout_y), hide=True)
+            return
+
+        texture = draft.texture_output(suffix)
+        if texture:
+            draft.link_principled(*texture, input_name)
+
+    def _plan_alpha(self, draft):
+        if 'Alpha' in draft.linked:
+            draft.removals.append(draft.linked.pop('Alpha')[0])
+
+        alpha = draft.texture_output('_opa')
+        if alpha:
+            draft.link_principled(*alpha, 'Alpha')
+
+    def _plan_normal(self, draft):
+        texture = draft.texture('_nrm')
+        if not texture:
+            return
+
+        location = (draft.base_x + 300, draft.y + ROLES['_nrm'].layout_y)
+        if 'Normal' in draft.linked:
+            normal_map = draft.linked['Normal'][0]
+            draft.place(normal_map, location, hide=True)
+        else:
+            normal_map = draft.node('normal_map', 'ShaderNodeNormalMap', location, hide=True)
+            draft.link_principled(normal_map, 'Normal', 'Normal')
+
+        draft.link(texture, 'Color', normal_map, 'Color')
+
+    def _plan_emission(self, draft, options, base_color):
+        location = (draft.base_x, draft.y + ROLES['_emm'].layout_y)
+        if 'Emission Color' in draft.linked:
+            emission, emission_socket = draft.linked['Emission Color']
+            source = draft.sources['Emission Color']
+            if not source.image_path:
+                return
+            draft.place(emission, location, hide=True)
+            # 파일이 흑백 PNG로 저장되어 있으면 디코딩하지 않는다
+            grayscale = self._is_grayscale(source.image_path) if source.image_source == 'FILE' else None
+        else:
+            emission_socket = 'Color'
+            emission = draft.texture('_emm') or draft.texture('_emi')
+            if not emission:
+                return
+            texture = draft.textures[emission]
+            grayscale = self._is_grayscale(texture.source_path or texture.path)
+
+        draft.grayscale_checks.append(GrayscaleCheck(emission, grayscale))
+        mix_location = (location[0] + 300, location[1])
+
+        if options.use_node_groups:
+            group = draft.node('emission_group', 'ShaderNodeGroup', mix_location, node_group='EMISSION')
+            if base_color:
+                draft.link(*base_color, group, 'Base Color')
+            draft.link(emission, emission_socket, group, 'Emission')
+            final = [(group, 'Color', None)]
+        else:
+            mix = draft.node(
+                'emission_mix', 'ShaderNodeMixRGB', mix_location, hide=True,
+                properties=(('blend_type', 'MULTIPLY'),),
+                defaults=(('Fac', 1.0),),
+            )
+            if base_color:
+                draft.link(*base_color, mix, 1)
+            draft.link(emission, emission_socket, mix, 2)
+
+            # 흑백 emission이면 tint용 multiply를 하나 더 둔다
+            multiply = draft.node(
+                'emission_multiply', 'ShaderNodeMixRGB', (mix_location[0] + 200, mix_location[1]), label='Emm Multiply',
+                properties=(('blend_type', 'MULTIPLY'),),
+                defaults=(('Fac', 1.0), (2, (1, 1, 1, 1))),
+                condition=(emission, True),
+            )
+            draft.link(mix, 'Color', multiply, 1, condition=(emission, True))
+            final = [(multiply, 'Color', (emission, True)), (mix, 'Color', (emission, False))]
+
+        # 최종 출력 연결
+        for key, socket, condition in final:
+            draft.link(key, socket, PRINCIPLED, 'Emission Color', condition=condition)
+        draft.default(PRINCIPLED, 'Emission Strength', 1.0)
+
+    def _is_grayscale(self, path):
+        """
+        GrayscaleCheck의 기대값. 헤더만으로는 흑백인지만 알 수 있으므로 아니면 None.
+        inventory가 있으면 저장된 검사 결과로 컬러인지도 정한다
+        """
+        if self.texture_inventory is not None:
+            with self.profiler.span('grayscale_inventory'):
+                return self.texture_inventory.grayscale(path)
+        return True if is_grayscale_png(path) else None
+
+    def _plan_second_color(self, draft, options):
+        trm = draft.texture('_trm')
+        mai = draft.texture('_mai')
+        thc = draft.texture('_thc')
+        if 'Base Color' not in draft.linked or (not trm and not mai and not thc):
+            return
+        base_color = draft.linked['Base Color']
+
+        if options.use_node_groups:
+            group = draft.node('second_color_group', 'ShaderNodeGroup', (draft.x, draft.y + 200), node_group='SECOND_COLOR')
+            draft.link(*base_color, group, 'Base Color')
+            if trm:
+                draft.link(trm, 'Color', group, 'Trm')
+            if mai:
+                draft.link(mai, 'Color', group, 'Mai')
+            if thc:
+                draft.link(thc, 'Color', group, 'Thc')
+            draft.link_principled(group, 'Color', 'Base Color')
+            return
+
+        # Create and setup screen node
+        screen = draft.node(
+            'second_screen', 'ShaderNodeMixRGB', (draft.x, draft.y + 200), hide=True,
+            properties=(('blend_type', 'SCREEN'),),
+            defaults=(('Fac', 1.0), (2, (0, 0, 0, 1))),
+        )
+        draft.link(*base_color, screen, 1)
+        second_texture = screen
+
+        # trm process
+        if trm:
+            trm_multiply = draft.node(
+                'trm_multiply', 'ShaderNodeMixRGB', (draft.base_x + 300, draft.y + 300), label='Trm Multiply',
+                properties=(('blend_type', 'MULTIPLY'),),
+                defaults=(('Fac', 1.0), (2, (0, 0, 0, 1))),
+            )
+            draft.link(trm, 'Color', trm_multiply, 1)
+
+            trm_second_screen = draft.node(
+                'trm_second_screen', 'ShaderNodeMixRGB', (draft.base_x + 500, draft.y + 300), label='Trm Second Screen',
+                properties=(('blend_type', 'SCREEN'),),
+                defaults=(('Fac', 1.0), (2, (0, 0, 0, 1))),
+            )
+            draft.link(trm_multiply, 'Color', trm_second_screen, 1)
+            second_texture = trm_second_screen
+
+        # mai process
+        if mai:
+            mai_multiply = draft.node(
+                'mai_multiply', 'ShaderNodeMixRGB', (draft.base_x + 700, draft.y + 500), hide=True,
+                properties=(('blend_type', 'MULTIPLY'),),
+                defaults=(('Fac', 1.0),),
+            )
+            draft.link(mai, 'Color', mai_multiply, 2)
+            draft.link(second_texture, 'Color', mai_multiply, 1)
+            second_texture = mai_multiply
+
+        # connect second_texture_node
+        if second_texture != screen:
+            draft.link(second_texture, 'Color', screen, 2)
+
+        # thc process
+        if thc:
+            invert = draft.node('thc_invert', 'ShaderNodeInvert', (draft.base_x + 300, draft.y + 600), hide=True)
+            draft.link(thc, 'Color', invert, 'Color')
+            draft.link(invert, 'Color', screen, 0)
+
+        # final connect base color
+        draft.link_principled(screen, 'Color', 'Base Color')
+
+    def _plan_second_shader(self, draft, options):
+        """
+        Import and setup shader-related textures (_trm and _thc).
+        Sets up complex shader mixing with translucent BSDF when _trm exists,
+        and optionally connects _thc as a factor if present.
+        """
+        trm = draft.texture('_trm')
+        thc = draft.texture('_thc')
+        # shader mix에서는 mai가 thc 아래 mix 노드 줄에 놓인다
+        mai = draft.texture('_mai', location_y=draft.y + 800)
+        if not trm:
+            return
+
+        normal = draft.linked.get('Normal')
+        roughness = draft.linked.get('Roughness')
+        trm_x = draft.base_x
+
+        if options.use_node_groups:
+            group = draft.node('second_shader_group', 'ShaderNodeGroup', (trm_x + 300, draft.y + 300), node_group='SECOND_SHADER')
+            draft.link(trm, 'Color', group, 'Trm')
+            if thc:
+                draft.link(thc, 'Color', group, 'Thc')
+            if mai:
+                draft.link(mai, 'Color', group, 'Mai')
+
+            if normal:
+                draft.link(*normal, group, 'Normal')
+            else:
+                # 그룹 입력은 연결되지 않으면 (0, 0, 0)이 되므로 셰이딩 노멀을 직접 넣는다
+                geometry = draft.node('geometry', 'ShaderNodeNewGeometry', (trm_x + 100, draft.y + 100), hide=True)
+                draft.link(geometry, 'Normal', group, 'Normal')
+
+            if roughness:
+                draft.link(*roughness, group, 'Roughness')
+
+            draft.link(PRINCIPLED, 'BSDF', group, 'BSDF')
+            output = draft.output((draft.x + 400, draft.y))
+            draft.link(group, 'Shader', output, 'Surface')
+            return
+
+        # Create and setup multiply mix node, connect _trm to mix color
+        multiply = draft.node(
+            'trm_multiply', 'ShaderNodeMixRGB', (trm_x + 300, draft.y + 300), label='Trm Multiply',
+            properties=(('blend_type', 'MULTIPLY'),),
+            defaults=(('Fac', 1.0), (2, (0, 0, 0, 1))),
+        )
+        draft.link(trm, 'Color', multiply, 1)  # A input
+
+        # Create and setup toBSDF
+        to_shade = draft.node('trm_diffuse', 'ShaderNodeBsdfDiffuse', (trm_x + 500, draft.y + 300), hide=True)
+        draft.link(multiply, 'Color', to_shade, 'Color')
+
+        # Create 2nd trm RGB node
+        second_trm_rgb = draft.node(
+            'trm_second_color', 'ShaderNodeRGB', (trm_x + 300, draft.y + 500), label='Trm Second Color',
+            output_defaults=((0, (0, 0, 0, 1)),),
+        )
+
+        # Create and set 2nd toBSDF
+        second_to_shade = draft.node('trm_second_diffuse', 'ShaderNodeBsdfDiffuse', (trm_x + 500, draft.y + 500), hide=True)
+        draft.link(second_trm_rgb, 'Color', second_to_shade, 'Color')
+
+        # Connect normal, rgh to toBSDF
+        for source, socket in ((normal, 'Normal'), (roughness, 'Roughness')):
+            if source:
+                draft.link(*source, to_shade, socket)
+                draft.link(*source, second_to_shade, socket)
+
+        # 200% mix shade
+        trm_add = draft.node('trm_add', 'ShaderNodeAddShader', (trm_x + 700, draft.y + 300), hide=True)
+        draft.link(to_shade, 'BSDF', trm_add, 0)
+        draft.link(second_to_shade, 'BSDF', trm_add, 1)
+
+        # knob shade
+        x = trm_x + 900
+        knob_mix = draft.node(
+            'knob_mix', 'ShaderNodeMixShader', (x, draft.y + 300),
+            defaults=(('Fac', 0.5),),  # default to 100%
+        )
+        draft.link(trm_add, 'Shader', knob_mix, 2)
+        final_shade = knob_mix
+
+        if thc:
+            x += 200
+            thc_mix = draft.node('thc_mix', 'ShaderNodeMixShader', (x, draft.y + 300), hide=True)
+            draft.link(thc, 'Color', thc_mix, 'Fac')
+            draft.link(final_shade, 'Shader', thc_mix, 1)
+            final_shade = thc_mix
+
+        if mai:
+            x += 200
+            mai_mix = draft.node('mai_mix', 'ShaderNodeMixShader', (x, draft.y + 300), hide=True)
+            draft.link(mai, 'Color', mai_mix, 'Fac')
+            draft.link(final_shade, 'Shader', mai_mix, 2)
+            final_shade = mai_mix
+
+        # Create Final add shader
+        add_shader = draft.node('final_add', 'ShaderNodeAddShader', (draft.x + 400, draft.y))
+        draft.link(final_shade, 'Shader', add_shader, 0)
+        draft.link(PRINCIPLED, 'BSDF', add_shader, 1)
+
+        # Connect to material output
+        output = draft.output((draft.x + 600, draft.y))
+        draft.link(add_shader, 'Shader', output, 'Surface')
+
+class _Draft:
+    """플랜을 만드는 동안만 쓰는 가변 상태"""
+
+    def __init__(self, snapshot, base_name, texture_set, profiler=NULL_PROFILER, texture_proxies=None):
+        self.snapshot = snapshot
+        self.profiler = profiler
+        self.texture_proxies = texture_proxies
+        self.base_name = base_name
+        # SuffixClassifier가 찾은 {suffix: 경로}
+        self.texture_set = texture_set
+
+        self.x, self.y = snapshot.location
+        self.base_x = self.x - 900
+
+        self.existing = {}
+        if snapshot.principled is not None:
+            self.existing[PRINCIPLED] = snapshot.principled
+        self.sources = dict(snapshot.linked)
+        # principled 입력 -> 현재 연결된 (노드 키, 출력 소켓)
+        self.linked = {}
+        for input_name, source in snapshot.linked:
+            key = f'linked:{input_name}'
+            self.existing[key] = source.node
+            self.linked[input_name] = (key, source.socket)
+
+        self.textures = {}
+        self.placements = {}
+        self.nodes = []
+        self.links = []
+        self.socket_defaults = []
+        self.grayscale_checks = []
+        self.removals = []
+        # ChannelPacker가 묶은 PackedTexture
+        self.packed = None
+
+    def find(self, suffix):
+        return self.texture_set.get(suffix)
+
+    def texture(self, suffix, non_color=None, location_y=None):
+        """
+        텍스처가 있으면 이미지 노드를 추가하고 키를, 없으면 None을 반환한다.
+        non_color와 location_y를 주지 않으면 ROLES의 값을 쓴다
+        """
+        path = self.find(suffix)
+        if not path:
+            return None
+
+        role = ROLES[suffix]
+        if non_color is None:
+            non_color = role.non_color
+        if location_y is None:
+            location_y = self.y + role.layout_y
+        key = f'texture{suffix}'
+        self.textures[key] = self.texture_plan(key, path, non_color)
+        return self.node(key, 'ShaderNodeTexImage', (self.base_x, location_y), hide=True, texture=key)
+
+    def texture_plan(self, key, path, non_color, channel_packed=False):
+        """프록시 모드이면 path를 줄인 이미지로 바꾸고 원본을 source_path에 남긴다"""
+        if self.texture_proxies is None:
+            return TexturePlan(key, path, non_color, channel_packed)
+        with self.profiler.span('texture_proxy'):
+            proxy_path = self.texture_proxies.proxy_path(path)
+        if proxy_path == path:
+            return TexturePlan(key, path, non_color, channel_packed)
+        return TexturePlan(key, proxy_path, non_color, channel_packed, path)
+
+    def texture_output(self, suffix):
+        """
+        흑백 Non-Color 맵의 (노드 키, 출력 소켓). 없으면 None.
+        묶인 맵이면 묶은 이미지의 Alpha 또는 Separate Color의 채널을 돌려준다
+        """
+        if self.packed is None or suffix not in self.packed.channels:
+            texture = self.texture(suffix, non_color=True)
+            return (texture, 'Color') if texture else None
+
+        if PACKED not in self.textures:
+            self.textures[PACKED] = self.texture_plan(PACKED, self.packed.path, True, True)
+            self.node(PACKED, 'ShaderNodeTexImage', (self.base_x, self.y - 85), hide=True, label='Packed', texture=PACKED)
+            self.node(PACKED_SEPARATE, 'ShaderNodeSeparateColor', (self.base_x + 150, self.y - 110), hide=True)
+            self.link(PACKED, 'Color', PACKED_SEPARATE, 'Color')
+
+        channel = self.packed.channels[suffix]
+        if channel == 3:
+            return (PACKED, 'Alpha')
+        return (PACKED_SEPARATE, ('Red', 'Green', 'Blue')[channel])
+
+    def node(self, key, node_type, location, **kwargs):
+        self.nodes.append(NodeSpec(key, node_type, tuple(location), **kwargs))
+        return key
+
+    def link(self, from_key, from_socket, to_key, to_socket, condition=None):
+        self.links.append(LinkSpec(from_key, from_socket, to_key, to_socket, condition))
+
+    def link_principled(self, from_key, from_socket, input_name):
+        self.link(from_key, from_socket, PRINCIPLED, input_name)
+        self.linked[input_name] = (from_key, from_socket)
+        return self.linked[input_name]
+
+    def place(self, key, location, hide=None):
+        self.placements[key] = Placement(key, tuple(location), hide)
+
+    def default(self, key, socket, value):
+        self.socket_defaults.append(SocketDefault(key, socket, value))
+
+    def output(self, location):
+        """principled BSDF가 연결된 출력 노드. 없으면 새로 만든다"""
+        if self.snapshot.output is None:
+            return self.node(OUTPUT, 'ShaderNodeOutputMaterial', location)
+        self.existing[OUTPUT] = self.snapshot.output
+        self.place(OUTPUT, location)
+        return OUTPUT
+
+    def signature(self, options):
+        # 노드 이름과 위치는 임포트마다 달라도 결과 머티리얼은 같으므로 넣지 않는다
+        linked_images = tuple(sorted((name, source.image_path) for name, source in self.snapshot.linked))
+        return (self.base_name, tuple(sorted(self.texture_set.items())), linked_images, options)
+
+    def freeze(self, options):
+        return MaterialPlan(
+            base_name=self.base_name,
+            source_images=tuple(sorted(self.snapshot.images)),
+            textures=tuple(self.textures.values()),
+            existing=tuple(sorted(self.existing.items())),
+            placements=tuple(self.placements.values()),
+            nodes=tuple(self.nodes),
+            links=tuple(self.links),
+            socket_defaults=tuple(self.socket_defaults),
+            grayscale_checks=tuple(self.grayscale_checks),
+            removals=tuple(self.removals),
+            signature=self.signature(options),
+        )
@@ -0,0 +1,84 @@
+import hashlib
+import bpy
+import numpy as np
+
+class MeshDeduplicator:
+    """
+    배치 안에서 geometry가 같은 mesh를 하나의 datablock으로 공유한다.
+    위치, loop, 면, UV, 색, custom normal, 머티리얼을 foreach_get으로 한 번에 읽어 해시하고
+    같은 해시의 mesh가 이미 있으면 오브젝트의 data만 바꾼다. transform과 오브젝트 쪽 머티리얼은 그대로다.
+
+    shape key나 vertex group이 있는 mesh는 오브젝트마다 달라질 수 있으므로 건드리지 않는다.
+    """
+
+    def __init__(self):
+        # geometry 해시 -> mesh 이름
+        self._meshes = {}
+        self.merged = 0
+
+    @staticmethod
+    def can_share(obj):
+        mesh = obj.data
+        return obj.type == 'MESH' and mesh is not None and mesh.shape_keys is None and not obj.vertex_groups
+
+    @staticmethod
+    def _read(collection, attribute, dtype, width=1):
+        buffer = np.empty(len(collection) * width, dtype=dtype)
+        collection.foreach_get(attribute, buffer)
+        return buffer.tobytes()
+
+    @classmethod
+    def _corner_normals(cls, mesh):
+        if hasattr(mesh, 'corner_normals'):
+            return cls._read(mesh.corner_normals, 'vector', np.float32, 3)
+        # corner_normals는 Blender 4.1부터 있다. 4.0에서는 계산해 둔 loop normal을 읽는다
+        if hasattr(mesh, 'calc_normals_split'):
+            mesh.calc_normals_split()
+        return cls._read(mesh.loops, 'normal', np.float32, 3)
+
+    def key(self, mesh):
+        digest = hashlib.blake2b(digest_size=20)
+        counts = (len(mesh.vertices), len(mesh.edges), len(mesh.loops), len(mesh.polygons))
+        digest.update(np.array(counts, dtype=np.int64).tobytes())
+
+        digest.update(self._read(mesh.vertices, 'co', np.float32, 3))
+        digest.update(self._read(mesh.edges, 'vertices', np.int32, 2))
+        digest.update(self._read(mesh.loops, 'vertex_index', np.int32))
+        digest.update(self._read(mesh.polygons, 'loop_total', np.int32))
+        digest.update(self._read(mesh.polygons, 'material_index', np.int32))
+        digest.update(self._read(mesh.polygons, 'use_smooth', bool))
+
+        for layer in mesh.uv_layers:
+            digest.update(layer.name.encode('utf-8'))
+            digest.update(self._read(layer.data, 'uv', np.float32, 2))
+        for layer in mesh.color_attributes:
+            digest.update(f'{layer.name}:{layer.domain}:{layer.data_type}'.encode('utf-8'))
+            digest.update(self._read(layer.data, 'color', np.float32, 4))
+        if mesh.has_custom_normals:
+            digest.update(self._corner_normals(mesh))
+
+        # 머티리얼이 mesh에 붙어 있으면(link='DATA') 같은 머티리얼일 때만 공유할 수 있다
+        materials = '\0'.join(material.name if material else '' for material in mesh.materials)
+        digest.update(materials.encode('utf-8'))
+        return digest.hexdigest()
+
+    def share(self, obj):
+        """obj의 mesh를 같은 geometry의 기존 mesh로 바꿨으면 True"""
+        if not self.can_share(obj):
+            return False
+
+        mesh = obj.data
+        key = self.key(mesh)
+        shared = bpy.data.meshes.get(self._meshes.get(key, ''))
+        if shared is None or shared == mesh:
+            self._meshes[key] = mesh.name
+            return False
+
+        obj.data = shared
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+        self.merged += 1
+        return True
+
+    def clear(self):
+        self._meshes.clear()
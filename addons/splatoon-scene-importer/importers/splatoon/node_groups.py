@@ -0,0 +1,210 @@
+import bpy
+
+# 템플릿 구조가 바뀌면 올린다. 버전이 다른 기존 그룹은 재사용하지 않는다
+TEMPLATE_VERSION = 1
+TEMPLATE_VERSION_KEY = 'splatoon_template_version'
+
+BASE_COLOR_GROUP = 'Splatoon Base Color'
+EMISSION_GROUP = 'Splatoon Emission'
+SECOND_COLOR_GROUP = 'Splatoon Second Color'
+SECOND_SHADER_GROUP = 'Splatoon Second Shader'
+
+# 템플릿 이름 -> 이번 세션에서 쓰는 node group 이름
+_session_groups = {}
+
+def _get_group(name, build):
+    """세션에서 한 번만 만든다. 같은 버전의 그룹이 이미 있으면 그대로 쓴다"""
+    group = bpy.data.node_groups.get(_session_groups.get(name, ''))
+    if group is not None:
+        return group
+
+    for group in bpy.data.node_groups:
+        if group.bl_idname == 'ShaderNodeTree' and group.get(TEMPLATE_VERSION_KEY) == TEMPLATE_VERSION \
+                and group.name.split('.')[0] == name:
+            _session_groups[name] = group.name
+            return group
+
+    group = bpy.data.node_groups.new(name, 'ShaderNodeTree')
+    group[TEMPLATE_VERSION_KEY] = TEMPLATE_VERSION
+    build(group)
+    _session_groups[name] = group.name
+    return group
+
+def _new_socket(group, name, in_out, socket_type, default=None, min_value=None, max_value=None):
+    socket = group.interface.new_socket(name=name, in_out=in_out, socket_type=socket_type)
+    if default is not None:
+        socket.default_value = default
+    if min_value is not None:
+        socket.min_value = min_value
+    if max_value is not None:
+        socket.max_value = max_value
+    return socket
+
+def _mix(nodes, blend_type, location, label='', fac=1.0, color2=None):
+    node = nodes.new('ShaderNodeMixRGB')
+    node.blend_type = blend_type
+    node.inputs['Fac'].default_value = fac
+    if color2 is not None:
+        node.inputs[2].default_value = color2
+    node.location = location
+    node.label = label
+    return node
+
+def _io_nodes(group, width):
+    group_input = group.nodes.new('NodeGroupInput')
+    group_input.location = (0, 0)
+    group_output = group.nodes.new('NodeGroupOutput')
+    group_output.location = (width, 0)
+    return group_input, group_output
+
+def _build_base_color(group):
+    """Color * AO -> Tcl로 흰색과 섞는다 (_init_base_color_node와 같은 구성)"""
+    _new_socket(group, 'Color', 'INPUT', 'NodeSocketColor', (0.0, 0.0, 0.0, 1.0))
+    _new_socket(group, 'AO', 'INPUT', 'NodeSocketColor', (1.0, 1.0, 1.0, 1.0))
+    _new_socket(group, 'Tcl', 'INPUT', 'NodeSocketFloat', 0.0, 0.0, 1.0)
+    _new_socket(group, 'Color', 'OUTPUT', 'NodeSocketColor')
+
+    nodes = group.nodes
+    links = group.links
+    group_input, group_output = _io_nodes(group, 700)
+
+    ao_multiply = _mix(nodes, 'MULTIPLY', (200, 0), 'AO Multiply')
+    tcl_mix = _mix(nodes, 'MIX', (450, 0), 'Tcl Mix', fac=0.0, color2=(1, 1, 1, 1))
+
+    links.new(group_input.outputs['Color'], ao_multiply.inputs[1])
+    links.new(group_input.outputs['AO'], ao_multiply.inputs[2])
+    links.new(ao_multiply.outputs['Color'], tcl_mix.inputs[1])
+    links.new(group_input.outputs['Tcl'], tcl_mix.inputs['Fac'])
+    links.new(tcl_mix.outputs['Color'], group_output.inputs['Color'])
+
+def _build_emission(group):
+    """Base Color * Emission * Tint (import_emission과 같은 구성)"""
+    _new_socket(group, 'Base Color', 'INPUT', 'NodeSocketColor', (0.5, 0.5, 0.5, 1.0))
+    _new_socket(group, 'Emission', 'INPUT', 'NodeSocketColor', (0.0, 0.0, 0.0, 1.0))
+    _new_socket(group, 'Tint', 'INPUT', 'NodeSocketColor', (1.0, 1.0, 1.0, 1.0))
+    _new_socket(group, 'Color', 'OUTPUT', 'NodeSocketColor')
+
+    nodes = group.nodes
+    links = group.links
+    group_input, group_output = _io_nodes(group, 700)
+
+    emission_multiply = _mix(nodes, 'MULTIPLY', (200, 0))
+    tint_multiply = _mix(nodes, 'MULTIPLY', (450, 0), 'Emm Multiply')
+
+    links.new(group_input.outputs['Base Color'], emission_multiply.inputs[1])
+    links.new(group_input.outputs['Emission'], emission_multiply.inputs[2])
+    links.new(emission_multiply.outputs['Color'], tint_multiply.inputs[1])
+    links.new(group_input.outputs['Tint'], tint_multiply.inputs[2])
+    links.new(tint_multiply.outputs['Color'], group_output.inputs['Color'])
+
+def _build_second_color(group):
+    """
+    Base Color를 (Trm * Trm Color screen Trm Screen) * Mai와 screen으로 섞는다.
+    Thc가 있으면 반전해서 screen의 Fac로 쓴다 (import_second_color와 같은 구성)
+    """
+    _new_socket(group, 'Base Color', 'INPUT', 'NodeSocketColor', (0.0, 0.0, 0.0, 1.0))
+    _new_socket(group, 'Trm', 'INPUT', 'NodeSocketColor', (0.0, 0.0, 0.0, 1.0))
+    _new_socket(group, 'Trm Color', 'INPUT', 'NodeSocketColor', (0.0, 0.0, 0.0, 1.0))
+    _new_socket(group, 'Trm Screen', 'INPUT', 'NodeSocketColor', (0.0, 0.0, 0.0, 1.0))
+    _new_socket(group, 'Mai', 'INPUT', 'NodeSocketColor', (1.0, 1.0, 1.0, 1.0))
+    _new_socket(group, 'Thc', 'INPUT', 'NodeSocketFloat', 0.0, 0.0, 1.0)
+    _new_socket(group, 'Color', 'OUTPUT', 'NodeSocketColor')
+
+    nodes = group.nodes
+    links = group.links
+    group_input, group_output = _io_nodes(group, 1100)
+
+    trm_multiply = _mix(nodes, 'MULTIPLY', (200, 200), 'Trm Multiply')
+    trm_screen = _mix(nodes, 'SCREEN', (400, 200), 'Trm Second Screen')
+    mai_multiply = _mix(nodes, 'MULTIPLY', (600, 200))
+    invert = nodes.new('ShaderNodeInvert')
+    invert.location = (600, -200)
+    screen = _mix(nodes, 'SCREEN', (850, 0))
+
+    links.new(group_input.outputs['Trm'], trm_multiply.inputs[1])
+    links.new(group_input.outputs['Trm Color'], trm_multiply.inputs[2])
+    links.new(trm_multiply.outputs['Color'], trm_screen.inputs[1])
+    links.new(group_input.outputs['Trm Screen'], trm_screen.inputs[2])
+    links.new(trm_screen.outputs['Color'], mai_multiply.inputs[1])
+    links.new(group_input.outputs['Mai'], mai_multiply.inputs[2])
+    links.new(group_input.outputs['Thc'], invert.inputs['Color'])
+    links.new(invert.outputs['Color'], screen.inputs['Fac'])
+    links.new(group_input.outputs['Base Color'], screen.inputs[1])
+    links.new(mai_multiply.outputs['Color'], screen.inputs[2])
+    links.new(screen.outputs['Color'], group_output.inputs['Color'])
+
+def _build_second_shader(group):
+    """
+    Trm을 두 Diffuse BSDF로 만들어 더하고 Knob/Thc/Mai로 섞은 뒤 BSDF에 더한다
+    (import_second_shader와 같은 구성)
+    """
+    _new_socket(group, 'Trm', 'INPUT', 'NodeSocketColor', (0.0, 0.0, 0.0, 1.0))
+    _new_socket(group, 'Trm Color', 'INPUT', 'NodeSocketColor', (0.0, 0.0, 0.0, 1.0))
+    _new_socket(group, 'Trm Second Color', 'INPUT', 'NodeSocketColor', (0.0, 0.0, 0.0, 1.0))
+    _new_socket(group, 'Normal', 'INPUT', 'NodeSocketVector')
+    _new_socket(group, 'Roughness', 'INPUT', 'NodeSocketFloat', 0.0, 0.0, 1.0)
+    _new_socket(group, 'Knob', 'INPUT', 'NodeSocketFloat', 0.5, 0.0, 1.0)
+    # 텍스처가 없을 때 섞지 않은 것과 같아지는 값이 기본값이다
+    _new_socket(group, 'Thc', 'INPUT', 'NodeSocketFloat', 0.0, 0.0, 1.0)
+    _new_socket(group, 'Mai', 'INPUT', 'NodeSocketFloat', 1.0, 0.0, 1.0)
+    _new_socket(group, 'BSDF', 'INPUT', 'NodeSocketShader')
+    _new_socket(group, 'Shader', 'OUTPUT', 'NodeSocketShader')
+
+    nodes = group.nodes
+    links = group.links
+    group_input, group_output = _io_nodes(group, 1500)
+
+    trm_multiply = _mix(nodes, 'MULTIPLY', (200, 0), 'Trm Multiply')
+    diffuse = nodes.new('ShaderNodeBsdfDiffuse')
+    diffuse.location = (400, 0)
+    second_diffuse = nodes.new('ShaderNodeBsdfDiffuse')
+    second_diffuse.location = (400, 200)
+    trm_add = nodes.new('ShaderNodeAddShader')
+    trm_add.location = (600, 0)
+    knob_mix = nodes.new('ShaderNodeMixShader')
+    knob_mix.location = (800, 0)
+    thc_mix = nodes.new('ShaderNodeMixShader')
+    thc_mix.location = (1000, 0)
+    mai_mix = nodes.new('ShaderNodeMixShader')
+    mai_mix.location = (1200, 0)
+    final_add = nodes.new('ShaderNodeAddShader')
+    final_add.location = (1350, 0)
+
+    links.new(group_input.outputs['Trm'], trm_multiply.inputs[1])
+    links.new(group_input.outputs['Trm Color'], trm_multiply.inputs[2])
+    links.new(trm_multiply.outputs['Color'], diffuse.inputs['Color'])
+    links.new(group_input.outputs['Trm Second Color'], second_diffuse.inputs['Color'])
+    for bsdf in (diffuse, second_diffuse):
+        links.new(group_input.outputs['Normal'], bsdf.inputs['Normal'])
+        links.new(group_input.outputs['Roughness'], bsdf.inputs['Roughness'])
+    links.new(diffuse.outputs['BSDF'], trm_add.inputs[0])
+    links.new(second_diffuse.outputs['BSDF'], trm_add.inputs[1])
+    links.new(group_input.outputs['Knob'], knob_mix.inputs['Fac'])
+    links.new(trm_add.outputs['Shader'], knob_mix.inputs[2])
+    links.new(group_input.outputs['Thc'], thc_mix.inputs['Fac'])
+    links.new(knob_mix.outputs['Shader'], thc_mix.inputs[1])
+    links.new(group_input.outputs['Mai'], mai_mix.inputs['Fac'])
+    links.new(thc_mix.outputs['Shader'], mai_mix.inputs[2])
+    links.new(mai_mix.outputs['Shader'], final_add.inputs[0])
+    links.new(group_input.outputs['BSDF'], final_add.inputs[1])
+    links.new(final_add.outputs['Shader'], group_output.inputs['Shader'])
+
+def base_color_group():
+    return _get_group(BASE_COLOR_GROUP, _build_base_color)
+
+def emission_group():
+    return _get_group(EMISSION_GROUP, _build_emission)
+
+def second_color_group():
+    return _get_group(SECOND_COLOR_GROUP, _build_second_color)
+
+def second_shader_group():
+    return _get_group(SECOND_SHADER_GROUP, _build_second_shader)
+
+# MaterialPlan의 NodeSpec.node_group -> node group을 얻는 함수
+TEMPLATES = {
+    'BASE_COLOR': base_color_group,
+    'EMISSION': emission_group,
+    'SECOND_COLOR': second_color_group,
+    'SECOND_SHADER': second_shader_group,
+}
@@ -0,0 +1,81 @@
+import bpy
+from collections import Counter
+
+# 지우는 순서. 머티리얼을 먼저 지워야 그 머티리얼만 쓰던 이미지의 users가 0이 된다
+KINDS = ('materials', 'meshes', 'armatures', 'images')
+
+class OrphanCleaner:
+    """
+    임포트가 만든 datablock 중 처리 후 아무도 쓰지 않는 것을 지운다.
+    track()으로 임포트 직후의 오브젝트에서 mesh, 아마추어, 머티리얼, 노드의 이미지를 기록하고
+    처리가 끝난 뒤 purge()가 users가 0인 것만 지운다.
+    fake user가 있거나 다른 곳에서 쓰는 datablock은 users가 0이 아니므로 남는다.
+    """
+
+    def __init__(self):
+        # 종류별로 지운 datablock 수
+        self.removed = Counter()
+        # 지운 픽셀/geometry 버퍼의 대략적인 크기
+        self.reclaimed_bytes = 0
+
+    @staticmethod
+    def track(objects):
+        """{종류: datablock 이름 집합}"""
+        candidates = {kind: set() for kind in KINDS}
+        for obj in objects:
+            if obj.type == 'MESH' and obj.data is not None:
+                candidates['meshes'].add(obj.data.name)
+            elif obj.type == 'ARMATURE' and obj.data is not None:
+                candidates['armatures'].add(obj.data.name)
+            OrphanCleaner.track_materials(
+                (slot.material for slot in getattr(obj, 'material_slots', ()) if slot.material is not None),
+                candidates,
+            )
+        return candidates
+
+    @staticmethod
+    def track_materials(materials, candidates=None):
+        if candidates is None:
+            candidates = {kind: set() for kind in KINDS}
+        for material in materials:
+            candidates['materials'].add(material.name)
+            if material.use_nodes:
+                candidates['images'].update(
+                    node.image.name
+                    for node in material.node_tree.nodes
+                    if node.type == 'TEX_IMAGE' and node.image
+                )
+        return candidates
+
+    def purge(self, candidates, keep_images=()):
+        """candidates 중 users가 0인 datablock을 지우고 지운 수를 반환한다"""
+        removed = 0
+        for kind in KINDS:
+            collection = getattr(bpy.data, kind)
+            for name in candidates.get(kind, ()):
+                if kind == 'images' and name in keep_images:
+                    continue
+                block = collection.get(name)
+                if block is None or block.users != 0:
+                    continue
+                self.reclaimed_bytes += self.estimate_bytes(kind, block)
+                collection.remove(block)
+                self.removed[kind] += 1
+                removed += 1
+        return removed
+
+    @staticmethod
+    def estimate_bytes(kind, block):
+        if kind == 'images':
+            if not block.has_data:
+                return 0
+            width, height = block.size
+            return width * height * block.channels * (4 if block.is_float else 1)
+        if kind == 'meshes':
+            # 위치, edge, corner(vertex + edge), face offset
+            return len(block.vertices) * 12 + len(block.edges) * 8 + len(block.loops) * 8 + len(block.polygons) * 4
+        return 0
+
+    def summary(self):
+        counts = ', '.join(f"{self.removed[kind]} {kind}" for kind in KINDS if self.removed[kind])
+        return f"Unused data removed: {counts} (~{self.reclaimed_bytes / (1024 * 1024):.1f} MB)"
@@ -0,0 +1,41 @@
+import numpy as np
+
+# 한 번에 비교할 texel 수. 컬러 이미지는 대부분 첫 chunk에서 끝난다
+GRAYSCALE_CHUNK_TEXELS = 1 << 16
+
+# image.pixels를 읽을 때 재사용하는 버퍼
+_pixel_buffer = np.empty(0, dtype=np.float32)
+
+def read_pixels(image):
+    """
+    image.pixels를 foreach_get으로 float32 버퍼에 읽는다.
+    반환값은 공유 버퍼의 view이므로 다음 호출 전까지만 유효하다.
+    """
+    global _pixel_buffer
+
+    size = len(image.pixels)
+    if _pixel_buffer.size < size:
+        _pixel_buffer = np.empty(size, dtype=np.float32)
+
+    pixels = _pixel_buffer[:size]
+    image.pixels.foreach_get(pixels)
+    return pixels
+
+def release_pixel_buffer():
+    global _pixel_buffer
+    _pixel_buffer = np.empty(0, dtype=np.float32)
+
+def is_grayscale_array(texels):
+    """(N, channels) 배열의 RGB가 모두 같은지 chunk 단위로 검사한다"""
+    if texels.shape[1] < 3:
+        return True
+
+    for start in range(0, len(texels), GRAYSCALE_CHUNK_TEXELS):
+        chunk = texels[start:start + GRAYSCALE_CHUNK_TEXELS]
+        if not np.array_equal(chunk[:, 0], chunk[:, 1]) or not np.array_equal(chunk[:, 1], chunk[:, 2]):
+            return False
+    return True
+
+def is_grayscale_pixels(image):
+    channels = image.channels or 4
+    return is_grayscale_array(read_pixels(image).reshape(-1, channels))
@@ -1,51 +1,195 @@
 import bpy
 import os
+import time
 from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 from .material_processor import MaterialProcessor
+from .material_plan import MaterialPlanner, MaterialOptions
+from .texture_index import TextureIndex
+from .texture_inventory import TextureInventory
+from .image_cache import ImageCache
+from .pixels import release_pixel_buffer
+from .mesh_dedup import MeshDeduplicator
+from .bulk_import import BulkImport
+from .orphan_cleanup import OrphanCleaner
+from .discovery import DirectoryScanner, order_for_throughput
+from .channel_pack import ChannelPacker
+from .texture_proxy import TextureProxies
+from .texture_roles import SuffixClassifier, parse_aliases
+from .manifest import ImportManifest, IMPORT, SKIP, REBUILD, REPLACE, capture_graph, restore_graph
+from ..collada.builder import import_dae
+from ..collada.reader import ColladaError
 from ...utilities.DAE_OT_import_via_fbx import DAE_OT_import_via_fbx, NotFoundConvertModule, FailConvert
+from ...utilities.conversion_cache import ConversionCache
+from ...utilities.conversion_pool import ConversionPool
+from ...utilities.profiling import Profiler, NULL_PROFILER
+from ...utilities.cache_dir import cache_dir
+
+# 다음 파일의 변환을 기다리는 중임을 나타내는 단계
+WAITING = object()
 
 class Queueing:
-    def __init__(self, files, directory):
+    def __init__(self, files, directory, conversion_workers=None, keep_going=False):
         self.processing_queue = deque()
         self.processing_queue.clear()
+        # 꺼져 있으면 NULL_PROFILER라서 계측 비용이 거의 없다
+        self.profiler = Profiler() if bpy.context.scene.is_profile_splatoon_scene_importer else NULL_PROFILER
+        self.profile_path = None
+        self.profile_error = None
+        # 배치 전체에서 공유하는 텍스처 색인
+        # 다시 임포트할 때 텍스처 폴더를 다시 읽지 않도록 목록과 PNG 정보를 디스크에 남긴다
+        self.texture_inventory = TextureInventory() if bpy.context.scene.is_texture_inventory_splatoon_scene_importer else None
+        self.texture_index = TextureIndex(self.texture_inventory)
+        self.image_cache = ImageCache(profiler=self.profiler)
+        # 흑백 맵을 RGBA 하나로 묶는다. 켜져 있을 때만 캐시 디렉토리를 만든다
+        self.channel_packer = ChannelPacker() if bpy.context.scene.is_pack_channels_splatoon_scene_importer else None
+        # 큰 텍스처를 줄인 프록시로 불러온다. FULL이면 원본 그대로
+        texture_size = bpy.context.scene.texture_size_splatoon_scene_importer
+        self.texture_proxies = TextureProxies(int(texture_size)) if texture_size != 'FULL' else None
+        # 등록된 suffix에 사용자 별칭을 더해 텍스처 세트를 분류한다
+        self.suffix_classifier = SuffixClassifier(parse_aliases(bpy.context.scene.suffix_aliases_splatoon_scene_importer))
+        self.material_planner = MaterialPlanner(
+            self.texture_index, self.profiler, self.channel_packer, self.texture_proxies, self.suffix_classifier,
+            self.texture_inventory,
+        )
+        # 플랜은 파일 I/O(디렉토리 목록, PNG 헤더)뿐이라 스레드에서 계산한다
+        self.plan_executor = ThreadPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1),
+            thread_name_prefix='splatoon-plan',
+        )
+        self.conversion_cache = ConversionCache()
+        self.conversion_pool = ConversionPool(self.conversion_cache, conversion_workers, profiler=self.profiler)
+        # 켜져 있으면 예상하지 못한 예외도 그 파일만 실패로 기록하고 다음 파일로 넘어간다
+        self.keep_going = keep_going
+        # 실패한 파일 (file_path, message)
+        self.errors = []
+        # 파일별 처리 결과 (file, seconds, objects, error)
+        self.file_results = []
+        # MaterialPlan.signature -> 이미 처리한 머티리얼 이름
+        self.material_cache = {}
+        self.deduplicated_materials = 0
+        # 배치 전체에서 geometry가 같은 mesh를 공유한다
+        self.mesh_deduplicator = MeshDeduplicator() if bpy.context.scene.is_share_meshes_splatoon_scene_importer else None
+        # 파일마다 임포트가 남긴 쓰지 않는 datablock을 지운다
+        self.orphan_cleaner = OrphanCleaner()
+        self.dae_import_method = self.resolve_dae_import_method()
+        # 큰 배치는 staging 컬렉션에 모았다가 끝에 한 번에 내놓는다
+        self.bulk_import = BulkImport(bpy.context) if bpy.context.scene.is_bulk_import_splatoon_scene_importer else None
 
         for file_elem in files:
             file_path = os.path.join(directory, file_elem.name)
-            dir_path = os.path.dirname(file_path)
-            file_splitext = os.path.splitext(file_elem.name)
+            # 폴더 임포트는 모델마다 짝지은 텍스처 디렉토리를 넘긴다
+            dir_path = getattr(file_elem, 'texture_dir', None) or os.path.dirname(file_path)
+            file_splitext = os.path.splitext(os.path.basename(file_elem.name))
             file_name = file_splitext[0]
             file_ext = file_splitext[1].lower()
             self.processing_queue.append((file_path, dir_path, file_name, file_ext))
 
-    def process_material(self, matarial, file_path):
-        """머티리얼 처리 함수"""
-        material_processor = MaterialProcessor(matarial, file_path)
+        # 이전 임포트 기록과 비교해 파일마다 할 일을 정한다
+        self.manifest = ImportManifest.load(bpy.context.scene)
+        self.file_actions = {
+            file_path: self.manifest.action(
+                file_path, self.geometry_options(), self.material_options()._asdict(), self.objects_exist,
+            )
+            for file_path, _, _, _ in self.processing_queue
+        }
+        # 할 일별 파일 수
+        self.action_counts = {}
+        # 이번 배치에서 다시 만든 머티리얼 이름
+        self.rebuilt_materials = set()
 
-        # metallic to 0
-        material_processor.principled_node.inputs['Metallic'].default_value = 0
+        self.total_files = len(self.processing_queue)
+        self.completed_files = 0
+        self.current_file = None
+        self._pipeline = None
+        self.start_conversions()
 
-        # link textures
-        material_processor.link_texture_principled_node(
-            'Metallic',
-            '_mtl',
-            non_color = True,
-            location_y = material_processor.principled_node.location.y - 85
-        )
-        material_processor.link_texture_principled_node(
-            'Roughness',
-            '_rgh',
-            non_color = True,
-            location_y = material_processor.principled_node.location.y - 99
+    @classmethod
+    def from_paths(cls, paths, **options):
+        """파일 경로 목록으로 큐를 만든다. 절대 경로는 os.path.join에서 directory를 무시한다"""
+        return cls([_PathElement(os.path.abspath(path)) for path in paths], '', **options)
+
+    @classmethod
+    def from_models(cls, models, **options):
+        """discovery.ModelFile 목록으로 큐를 만든다. 목록 순서대로 처리한다"""
+        return cls([_PathElement(model.path, model.texture_dir) for model in models], '', **options)
+
+    @classmethod
+    def from_directory(cls, paths, include=(), exclude=()):
+        """
+        폴더 트리에서 모델을 찾아 큐를 만든다.
+        텍스처 디렉토리별로 묶고, 변환을 병렬로 돌릴 수 있으면 큰 DAE부터 처리한다
+        """
+        scanner = DirectoryScanner(include, exclude)
+        models = scanner.scan(paths)
+        return cls.from_models(order_for_throughput(models, cls.resolve_dae_import_method() == 'CONVERTER'))
+
+    @staticmethod
+    def resolve_dae_import_method():
+        """AUTO는 FBX Converter가 설치되어 있으면 CONVERTER, 아니면 NATIVE"""
+        method = bpy.context.scene.dae_import_method_splatoon_scene_importer
+        if method == 'AUTO':
+            method = 'CONVERTER' if DAE_OT_import_via_fbx._find_fbx_converter() else 'NATIVE'
+        return method
+
+    def start_conversions(self):
+        """큐의 모든 DAE 변환을 미리 시작한다"""
+        if self.dae_import_method != 'CONVERTER':
+            return
+
+        for file_path, _, _, file_ext in self.processing_queue:
+            if file_ext == '.dae' and self.file_actions[file_path] in (IMPORT, REPLACE):
+                self.conversion_pool.submit(file_path)
+
+    def material_options(self):
+        scene = bpy.context.scene
+        return MaterialOptions(
+            apply_second_shader=scene.is_apply_second_shader,
+            shader_mix_style=scene.shader_mix_style,
+            use_node_groups=scene.node_layout_splatoon_scene_importer == 'GROUPS',
+            pack_channels=scene.is_pack_channels_splatoon_scene_importer,
+            texture_size=scene.texture_size_splatoon_scene_importer,
+            suffix_aliases=';'.join(f'{alias}={suffix}' for alias, suffix in sorted(self.suffix_classifier.aliases.items())),
         )
 
-        material_processor.import_alpha()
-        material_processor.import_normal()
-        material_processor.import_emission()
-        if bpy.context.scene.is_apply_second_shader:
-            if bpy.context.scene.shader_mix_style == 'COLOR':
-                material_processor.import_second_color()
-            elif bpy.context.scene.shader_mix_style == 'SHADE':
-                material_processor.import_second_shader()
+    def geometry_options(self):
+        """바뀌면 파일을 다시 임포트해야 하는 옵션"""
+        scene = bpy.context.scene
+        return {
+            'dae_import_method': self.dae_import_method,
+            'armature_scale': scene.scale_value_splatoon_scene_importer if scene.is_scale_armature_splatoon_scene_importer else None,
+            'share_meshes': scene.is_share_meshes_splatoon_scene_importer,
+        }
+
+    @staticmethod
+    def objects_exist(names):
+        return all(bpy.data.objects.get(name) is not None for name in names)
+
+    def material_stages(self, matarial, file_path, plan=None):
+        """머티리얼 처리 단계. 플랜이 없으면 만들고, 텍스처 하나를 불러올 때마다 yield한다"""
+        if plan is None:
+            snapshot = MaterialProcessor.snapshot(matarial)
+            plan = self.material_planner.plan(snapshot, file_path, self.material_options())
+            yield
+
+        yield from MaterialProcessor(matarial, self.image_cache, self.profiler).stages(plan)
+
+    def reuse_material(self, material, slots, plan):
+        """
+        같은 signature(base name, 텍스처 파일, 셰이더 옵션)로 처리한 머티리얼이 이미 있으면
+        슬롯을 그쪽으로 바꾸고 True
+        """
+        cached = bpy.data.materials.get(self.material_cache.get(plan.signature, ''))
+        if cached is None or cached == material:
+            return False
+
+        for obj, index in slots:
+            obj.material_slots[index].material = cached
+        if material.users == 0:
+            bpy.data.materials.remove(material)
+        self.deduplicated_materials += 1
+        return True
 
     def process_armature(self, obj, file_name):
         """아마추어 처리 함수"""
@@ -54,45 +198,351 @@ class Queueing:
             obj.scale = (scale, scale, scale)
         obj.name = file_name
 
+    def staging_visible(self):
+        """
+        FBX 임포터도 아마추어를 만들 때 edit mode로 들어가므로 staging이 숨겨져 있으면 실패한다.
+        Bulk Import일 때만 임포트 동안 staging을 보이게 한다
+        """
+        if self.bulk_import is None:
+            return nullcontext()
+        return self.bulk_import.visible()
+
     def import_file(self, file_path, file_ext):
         """파일 임포트 함수"""
         if file_ext == '.fbx':
-            bpy.ops.import_scene.fbx(filepath=file_path)
+            with self.profiler.span('import_fbx'), self.staging_visible():
+                bpy.ops.import_scene.fbx(filepath=file_path)
+        elif file_ext == '.dae' and self.dae_import_method == 'NATIVE':
+            with self.profiler.span('import_dae'):
+                if self.bulk_import is None:
+                    return import_dae(file_path)
+                with self.bulk_import.visible():
+                    import_dae(file_path)
         elif file_ext == '.dae':
-            converted_path = DAE_OT_import_via_fbx.convert(file_path)
-            bpy.ops.import_scene.fbx(filepath=converted_path)
+            # 변환 결과는 캐시 소유이므로 지우지 않는다
+            with self.profiler.span('conversion_wait'):
+                converted_path = self.conversion_pool.result(file_path)
             try:
-                os.unlink(converted_path)
-            except:
-                pass
+                with self.profiler.span('import_fbx'), self.staging_visible():
+                    bpy.ops.import_scene.fbx(filepath=converted_path)
+            finally:
+                self.conversion_cache.release(converted_path)
 
+        if self.bulk_import is not None:
+            return self.bulk_import.new_objects()
         return [obj for obj in bpy.context.selected_objects]
 
-    def process_imported_objects(self, objects, file_name, file_path):
-        """임포트된 객체들 처리 함수"""
-        materials = set()
+    def imported_object_stages(self, objects, file_name, file_path):
+        """임포트된 객체 처리 단계. 아마추어, 머티리얼 단계마다 yield한다"""
+        # 머티리얼 -> 그 머티리얼을 쓰는 (오브젝트, 슬롯 번호)
+        materials = {}
         for obj in objects:
             if obj.type == 'ARMATURE':
                 self.process_armature(obj, file_name)
+                yield
             elif obj.type == 'MESH':
-                for slot in obj.material_slots:
+                for index, slot in enumerate(obj.material_slots):
                     if slot.material and slot.material.use_nodes:
-                        materials.add(slot.material)
+                        materials.setdefault(slot.material, []).append((obj, index))
 
+        yield from self.material_set_stages(materials, file_path)
+
+        # 머티리얼을 재사용한 뒤에 해야 같은 머티리얼을 쓰는 mesh끼리 묶인다
+        if self.mesh_deduplicator is not None:
+            with self.profiler.span('mesh_dedup'):
+                for obj in objects:
+                    if obj.type == 'MESH':
+                        self.mesh_deduplicator.share(obj)
+            yield
+
+    def material_set_stages(self, materials, file_path):
+        """
+        {머티리얼: [(오브젝트, 슬롯 번호)]}를 처리하는 단계.
+        처리하기 전 노드 그래프를 manifest에 남겨 두어 나중에 옵션만 바꿔 다시 만들 수 있게 한다
+        """
         for material in materials:
+            self.manifest.materials[material.name] = capture_graph(material)
+
+        # 이 파일의 머티리얼 플랜을 한 번에 계산한다
+        options = self.material_options()
+        with self.profiler.span('snapshot', materials=len(materials)):
+            snapshots = [MaterialProcessor.snapshot(material) for material in materials]
+        with self.profiler.span('plan_materials', materials=len(materials)):
+            plans = self.material_planner.plan_all(
+                [(snapshot, file_path, options) for snapshot in snapshots],
+                self.plan_executor,
+            )
+        yield
+
+        for (material, slots), plan in zip(materials.items(), plans):
+            if self.reuse_material(material, slots, plan):
+                yield
+                continue
+
             material.blend_method = 'HASHED'
-            self.process_material(material, file_path)
+            yield from self.material_stages(material, file_path, plan)
+            self.material_cache[plan.signature] = material.name
+
+    def rebuild_stages(self, file_path, dir_path):
+        """머티리얼 옵션만 바뀐 파일. 머티리얼을 임포트 직후의 그래프로 되돌리고 다시 처리한다"""
+        entry = self.manifest.entry(file_path)
+        materials = {}
+        for name in entry['objects']:
+            obj = bpy.data.objects.get(name)
+            if obj is None or obj.type != 'MESH':
+                continue
+            for index, slot in enumerate(obj.material_slots):
+                material = slot.material
+                if material is None or not material.use_nodes or material.name in self.rebuilt_materials:
+                    continue
+                # 그래프가 없으면 되돌릴 수 없으므로 그대로 둔다
+                if material.name in self.manifest.materials:
+                    materials.setdefault(material, []).append((obj, index))
 
-    def process_next_file(self):
-        """큐의 다음 파일 처리 함수"""
-        if not self.processing_queue:
-            return None
+        candidates = self.orphan_cleaner.track_materials(materials)
+        for material in materials:
+            restore_graph(material, self.manifest.materials[material.name])
+        yield
 
-        file_path, dir_path, file_name, file_ext = self.processing_queue.popleft()
+        yield from self.material_set_stages(materials, dir_path)
+        with self.profiler.span('cleanup'):
+            self.orphan_cleaner.purge(candidates, self.image_cache.names())
+        self.rebuilt_materials.update(material.name for material in materials if material.name in bpy.data.materials)
+        return [bpy.data.objects[name] for name in entry['objects']]
 
-        prev_selected = set(obj.name for obj in bpy.context.selected_objects)
-        new_objects = self.import_file(file_path, file_ext)
-        self.process_imported_objects(new_objects, file_name, dir_path)
-        bpy.ops.object.select_all(action='DESELECT')
+    def remove_file_objects(self, file_path):
+        """소스가 바뀐 파일이 이전에 만든 오브젝트와 더 이상 쓰이지 않는 datablock을 지운다"""
+        entry = self.manifest.entry(file_path)
+        self.manifest.forget(file_path)
 
-        return True
+        objects = [bpy.data.objects.get(name) for name in entry['objects']]
+        objects = [obj for obj in objects if obj is not None]
+        candidates = self.orphan_cleaner.track(objects)
+        candidates['materials'].update(entry['materials'])
+        candidates['images'].update(entry['images'])
+
+        for obj in objects:
+            bpy.data.objects.remove(obj, do_unlink=True)
+        self.orphan_cleaner.purge(candidates, self.image_cache.names())
+
+    def record_file(self, file_path, objects):
+        """파일이 만든 오브젝트, 머티리얼, 이미지를 manifest에 남긴다"""
+        materials = set()
+        images = set()
+        for obj in objects:
+            for slot in getattr(obj, 'material_slots', ()):
+                material = slot.material
+                if material is None or material.name in materials:
+                    continue
+                materials.add(material.name)
+                if material.use_nodes:
+                    images.update(
+                        node.image.name
+                        for node in material.node_tree.nodes
+                        if node.type == 'TEX_IMAGE' and node.image
+                    )
+
+        self.manifest.record(
+            file_path,
+            self.geometry_options(),
+            self.material_options()._asdict(),
+            [obj.name for obj in objects],
+            materials,
+            images,
+        )
+
+    def file_stages(self, file_path, dir_path, file_name, file_ext):
+        """파일 하나의 처리 단계 (임포트 -> 아마추어 -> 머티리얼/텍스처)"""
+        self.current_file = file_name
+        started = time.perf_counter()
+        action = self.file_actions.get(file_path, IMPORT)
+        self.action_counts[action] = self.action_counts.get(action, 0) + 1
+
+        if action == SKIP:
+            self.finish_file(file_path, started, len(self.manifest.entry(file_path)['objects']), action=action)
+            return
+        if action == REBUILD:
+            objects = yield from self.rebuild_stages(file_path, dir_path)
+            self.record_file(file_path, objects)
+            self.finish_file(file_path, started, len(objects), action=action)
+            return
+        if action == REPLACE:
+            self.remove_file_objects(file_path)
+
+        try:
+            new_objects = self.import_file(file_path, file_ext)
+        except (NotFoundConvertModule, FailConvert, ColladaError) as e:
+            # 변환 실패는 해당 파일만 건너뛴다
+            self.errors.append((file_path, str(e)))
+            self.finish_file(file_path, started, 0, str(e), action)
+            return
+        # 처리 중에 교체되거나 떨어져 나갈 수 있는 datablock
+        candidates = self.orphan_cleaner.track(new_objects)
+        yield
+
+        yield from self.imported_object_stages(new_objects, file_name, dir_path)
+        # 배치 캐시가 가진 이미지는 다음 파일이 쓸 수 있으므로 배치가 끝날 때 지운다
+        with self.profiler.span('cleanup'):
+            self.orphan_cleaner.purge(candidates, self.image_cache.names())
+        if self.bulk_import is not None:
+            self.bulk_import.deselect(new_objects)
+        else:
+            bpy.ops.object.select_all(action='DESELECT')
+        self.record_file(file_path, new_objects)
+        self.finish_file(file_path, started, len(new_objects), action=action)
+
+    def finish_file(self, file_path, started, object_count, error=None, action=IMPORT):
+        # modal에서는 다른 틱을 기다린 시간까지 포함한 파일 단위 wall time이다
+        self.profiler.record('file', started, time.perf_counter(), file=os.path.basename(file_path), error=error)
+        if self.profiler.enabled:
+            self.profiler.sample(
+                'datablocks',
+                objects=len(bpy.data.objects),
+                meshes=len(bpy.data.meshes),
+                materials=len(bpy.data.materials),
+                images=len(bpy.data.images),
+                node_groups=len(bpy.data.node_groups),
+            )
+        self.completed_files += 1
+        self.file_results.append({
+            'file': file_path,
+            'seconds': round(time.perf_counter() - started, 4),
+            'objects': object_count,
+            'error': error,
+            'action': action.lower(),
+        })
+
+    def stages(self):
+        """
+        배치 전체를 단계 단위로 나눈 파이프라인.
+        다음 파일의 변환이 끝나지 않았으면 WAITING을 yield한다.
+        """
+        while self.processing_queue:
+            file_path, dir_path, file_name, file_ext = self.processing_queue[0]
+
+            # 변환이 끝난 파일만 큐 순서대로 처리한다
+            if not self.conversion_pool.is_ready(file_path):
+                yield WAITING
+                continue
+            self.processing_queue.popleft()
+
+            started = time.perf_counter()
+            try:
+                yield from self.file_stages(file_path, dir_path, file_name, file_ext)
+            except Exception as e:
+                if not self.keep_going:
+                    raise
+                message = f"{type(e).__name__}: {e}"
+                self.errors.append((file_path, message))
+                self.finish_file(file_path, started, 0, message, self.file_actions.get(file_path, IMPORT))
+
+    def run(self, budget):
+        """
+        budget(초)를 다 쓸 때까지 단계를 실행한다.
+        처리할 것이 남아 있으면 True, 배치가 끝났으면 False
+        """
+        if self._pipeline is None:
+            self._pipeline = self.stages()
+
+        deadline = time.perf_counter() + budget
+        for stage in self._pipeline:
+            if stage is WAITING or time.perf_counter() >= deadline:
+                return True
+        return False
+
+    def run_to_completion(self, poll_interval=0.05):
+        """UI 없이 배치를 끝까지 처리한다. 변환을 기다리는 동안은 잠깐씩 쉰다"""
+        while self.run(float('inf')):
+            time.sleep(poll_interval)
+
+    def progress_text(self):
+        text = f"Splatoon Scene Importer: {self.completed_files}/{self.total_files} files"
+        if self.current_file:
+            text += f" - {self.current_file}"
+        return text + " (Esc to cancel)"
+
+    def summary(self):
+        """배치 처리 결과 요약 문자열"""
+        parts = [f"Images loaded: {self.image_cache.loads}, reused from cache: {self.image_cache.hits}"]
+        if self.deduplicated_materials:
+            parts.append(f"Materials deduplicated: {self.deduplicated_materials}")
+        if self.channel_packer is not None and (self.channel_packer.packed or self.channel_packer.reused):
+            parts.append(self.channel_packer.summary())
+        if self.texture_proxies is not None and (self.texture_proxies.created or self.texture_proxies.reused):
+            parts.append(self.texture_proxies.summary())
+        if self.texture_inventory is not None:
+            parts.append(self.texture_inventory.summary())
+        if self.mesh_deduplicator is not None and self.mesh_deduplicator.merged:
+            parts.append(f"Meshes merged: {self.mesh_deduplicator.merged}")
+        if self.conversion_cache.hits or self.conversion_cache.misses:
+            parts.append(self.conversion_cache.summary())
+        if self.action_counts.get(SKIP):
+            parts.append(f"Unchanged files skipped: {self.action_counts[SKIP]}")
+        if self.action_counts.get(REBUILD):
+            parts.append(f"Files with rebuilt materials: {self.action_counts[REBUILD]}")
+        if self.action_counts.get(REPLACE):
+            parts.append(f"Changed files replaced: {self.action_counts[REPLACE]}")
+        if self.orphan_cleaner.removed:
+            parts.append(self.orphan_cleaner.summary())
+        if self.bulk_import is not None:
+            parts.append(self.bulk_import.summary())
+        if self.errors:
+            parts.append(f"Failed files: {len(self.errors)}")
+        if self.profiler.enabled:
+            parts.append(self.profiler.summary())
+            if self.profile_path:
+                parts.append(f"Trace: {self.profile_path}")
+            elif self.profile_error:
+                parts.append(self.profile_error)
+        return ' | '.join(parts)
+
+    def close(self):
+        self._stop_workers()
+        self.orphan_cleaner.purge({'images': self.image_cache.names()})
+        if self.bulk_import is not None:
+            with self.profiler.span('bulk_finish'):
+                self.bulk_import.finish()
+        self.manifest.save(bpy.context.scene)
+        if self.texture_inventory is not None:
+            self.texture_inventory.save()
+        self.write_profile()
+
+    def abandon(self):
+        """
+        undo로 datablock이 해제된 뒤에 배치를 멈춘다.
+        들고 있는 Material, Node, Collection 참조는 쓰지 않고 스레드와 디스크 캐시만 정리한다
+        """
+        self._stop_workers()
+        if self.texture_inventory is not None:
+            self.texture_inventory.save()
+        self.write_profile()
+
+    def _stop_workers(self):
+        if self._pipeline is not None:
+            self._pipeline.close()
+            self._pipeline = None
+        self.conversion_pool.shutdown()
+        # 흑백 검사 버퍼는 가장 큰 emission 이미지만큼 커져 있으므로 배치가 끝나면 놓는다
+        release_pixel_buffer()
+        self.plan_executor.shutdown(wait=False, cancel_futures=True)
+
+    def write_profile(self):
+        """프로파일링이 켜져 있으면 Chrome trace JSON을 쓴다. 경로가 비어 있으면 캐시 디렉토리에 쓴다"""
+        if not self.profiler.enabled or self.profile_path:
+            return
+
+        path = bpy.path.abspath(bpy.context.scene.profile_path_splatoon_scene_importer)
+        if not path:
+            path = os.path.join(cache_dir('profiles'), time.strftime('import-%Y%m%d-%H%M%S.json'))
+        try:
+            self.profile_path = self.profiler.write(path)
+        except OSError as e:
+            self.profile_error = f"Failed to write profile {path}: {e}"
+
+class _PathElement:
+    """OperatorFileListElement 대신 쓰는 파일 항목"""
+    __slots__ = ('name', 'texture_dir')
+
+    def __init__(self, name, texture_dir=None):
+        self.name = name
+        self.texture_dir = texture_dir
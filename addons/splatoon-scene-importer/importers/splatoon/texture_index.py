@@ -0,0 +1,74 @@
+import os
+
+class TextureIndex:
+    """
+    디렉토리별 텍스처 색인.
+    디렉토리를 한 번만 listdir 하고 소문자 파일명 -> 경로 맵과
+    base name별 suffix 맵을 만들어 둔다. 디렉토리 mtime이 바뀌면 다시 만든다.
+    inventory가 있으면 파일 목록을 TextureInventory에서 얻는다.
+    """
+
+    TEXTURE_EXT = '.png'
+
+    def __init__(self, inventory=None):
+        self.inventory = inventory
+        self._entries = {}
+
+    def _entry(self, dir_path):
+        try:
+            mtime = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            self._entries.pop(dir_path, None)
+            return None
+
+        entry = self._entries.get(dir_path)
+        if entry is None or entry.mtime != mtime:
+            if self.inventory is not None:
+                names = self.inventory.names(dir_path, mtime)
+            else:
+                try:
+                    names = os.listdir(dir_path)
+                except OSError:
+                    names = []
+            entry = _DirectoryEntry(dir_path, mtime, names)
+            self._entries[dir_path] = entry
+        return entry
+
+    def find(self, dir_path, base, suffix):
+        """base + suffix 텍스처 경로를 대소문자 구분없이 찾는다"""
+        entry = self._entry(dir_path)
+        if entry is None:
+            return None
+        return entry.files.get(f"{base}{suffix}{self.TEXTURE_EXT}".lower())
+
+    def suffixes(self, dir_path, base):
+        """base name에 대해 존재하는 {소문자 suffix: 경로} 맵"""
+        entry = self._entry(dir_path)
+        if entry is None or not base:
+            return {}
+        return entry.by_base.get(base.lower(), {})
+
+    def clear(self):
+        self._entries.clear()
+
+class _DirectoryEntry:
+    __slots__ = ('mtime', 'files', 'by_base')
+
+    def __init__(self, dir_path, mtime, names):
+        self.mtime = mtime
+        self.files = {}
+        self.by_base = {}
+
+        for name in names:
+            lower_name = name.lower()
+            stem, ext = os.path.splitext(lower_name)
+            if ext != TextureIndex.TEXTURE_EXT:
+                continue
+
+            path = os.path.join(dir_path, name)
+            self.files[lower_name] = path
+
+            # Foo_Bar_Nrm.png -> base 'foo_bar', suffix '_nrm'
+            separator = stem.rfind('_')
+            if separator > 0:
+                self.by_base.setdefault(stem[:separator], {})[stem[separator:]] = path
@@ -0,0 +1,190 @@
+import os
+import json
+import hashlib
+import threading
+from collections import namedtuple
+from .pixels import is_grayscale_array
+from ...utilities.cache_dir import cache_dir
+from ...utilities.file_cache import atomic_write
+from ...utilities.png import CHANNELS, COLOR_TYPE_GRAY, COLOR_TYPE_GRAY_ALPHA, decode_png_texels, read_png_header
+
+INVENTORY_VERSION = 1
+
+# grayscale은 True/False, 판단할 수 없으면 None
+TextureInfo = namedtuple('TextureInfo', ['size', 'mtime_ns', 'width', 'height', 'channels', 'grayscale'])
+
+# 저장 형식의 grayscale 값. 키가 없으면 아직 검사하지 않은 것
+_GRAY, _COLOR, _UNKNOWN = 1, 0, -1
+
+class TextureInventory:
+    """
+    텍스처 디렉토리마다 파일 목록과 PNG 정보(크기, mtime, 해상도, 채널 수, 흑백 여부)를 캐시 디렉토리에 보관한다.
+    맵 폴더는 보통 읽기 전용으로 풀어 둔 것이라 폴더 옆이 아니라 애드온 캐시에 디렉토리 경로별로 쓴다.
+    디렉토리 mtime이 같으면 저장된 목록을 믿으므로 다시 임포트할 때 listdir, PNG 헤더 읽기,
+    emission 흑백 검사를 하지 않는다. 파일을 덮어써도 디렉토리 mtime은 바뀌지 않으므로 그런 폴더에는 쓰지 않는다.
+
+    TextureIndex와 MaterialPlanner가 플랜 스레드에서 부르므로 bpy를 쓰지 않는다.
+    """
+
+    def __init__(self, directory=None):
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory or cache_dir('inventory')
+        self._lock = threading.Lock()
+        # 디렉토리 -> {'mtime_ns', 'names', 'textures'} 또는 None(저장된 것 없음)
+        self._listings = {}
+        # 이번 세션에 디렉토리 mtime으로 확인한 디렉토리
+        self._checked = set()
+        self._dirty = set()
+        # 저장된 목록을 쓴 디렉토리 수, 새로 listdir한 디렉토리 수
+        self.reused = 0
+        self.scanned = 0
+        # 새로 읽은 PNG 헤더, 픽셀로 판단한 흑백 검사
+        self.headers = 0
+        self.grayscale_scans = 0
+
+    def _file(self, dir_path):
+        key = hashlib.sha256(os.path.normcase(os.path.abspath(dir_path)).encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.directory, key + '.json')
+
+    def _listing(self, dir_path):
+        with self._lock:
+            if dir_path in self._listings:
+                return self._listings[dir_path]
+
+        try:
+            with open(self._file(dir_path), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        if not data or data.get('version') != INVENTORY_VERSION or data.get('directory') != dir_path:
+            data = None
+
+        with self._lock:
+            return self._listings.setdefault(dir_path, data)
+
+    def names(self, dir_path, mtime_ns):
+        """dir_path의 파일 이름 목록. 저장된 목록의 디렉토리 mtime이 같으면 listdir하지 않는다"""
+        listing = self._listing(dir_path)
+        if listing is not None and listing['mtime_ns'] == mtime_ns:
+            with self._lock:
+                self._checked.add(dir_path)
+                self.reused += 1
+            return listing['names']
+
+        try:
+            names = os.listdir(dir_path)
+        except OSError:
+            names = []
+
+        with self._lock:
+            self._listings[dir_path] = {
+                'version': INVENTORY_VERSION,
+                'directory': dir_path,
+                'mtime_ns': mtime_ns,
+                'names': names,
+                'textures': {},
+            }
+            self._checked.add(dir_path)
+            self._dirty.add(dir_path)
+            self.scanned += 1
+        return names
+
+    def _checked_listing(self, dir_path):
+        """디렉토리 mtime으로 확인한 목록. 확인하지 않은 디렉토리면 지금 확인한다"""
+        with self._lock:
+            if dir_path in self._checked:
+                return self._listings[dir_path]
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            return None
+        self.names(dir_path, mtime_ns)
+        with self._lock:
+            return self._listings[dir_path]
+
+    def info(self, path):
+        """path의 TextureInfo. 읽을 수 없는 PNG면 None"""
+        dir_path, name = os.path.split(path)
+        listing = self._checked_listing(dir_path)
+        record = listing['textures'].get(name) if listing is not None else None
+        if record is None:
+            record = self._probe(path)
+            if record is None:
+                return None
+            if listing is not None:
+                with self._lock:
+                    listing['textures'][name] = record
+                    self._dirty.add(dir_path)
+
+        grayscale = record[5] if len(record) > 5 else None
+        return TextureInfo(*record[:5], None if grayscale in (None, _UNKNOWN) else grayscale == _GRAY)
+
+    def _probe(self, path):
+        header = read_png_header(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if header is None:
+            return None
+        with self._lock:
+            self.headers += 1
+
+        record = [stat.st_size, stat.st_mtime_ns, header.width, header.height, CHANNELS.get(header.color_type, 0)]
+        if header.color_type in (COLOR_TYPE_GRAY, COLOR_TYPE_GRAY_ALPHA):
+            record.append(_GRAY)
+        elif header.bit_depth != 8 or header.interlace or header.color_type not in CHANNELS:
+            # decode_png_texels가 읽지 못하므로 처리할 때 Blender 픽셀로 검사한다
+            record.append(_UNKNOWN)
+        return record
+
+    def grayscale(self, path):
+        """
+        RGB가 모두 같은 이미지면 True. 헤더로 알 수 없으면 픽셀을 한 번 디코딩하고 결과를 저장한다.
+        판단할 수 없으면 None
+        """
+        info = self.info(path)
+        if info is None:
+            return None
+        if info.grayscale is not None:
+            return info.grayscale
+
+        dir_path, name = os.path.split(path)
+        listing = self._checked_listing(dir_path)
+        record = listing['textures'].get(name) if listing is not None else None
+        if record is not None and len(record) > 5:
+            return None
+
+        texels = decode_png_texels(path)
+        grayscale = None if texels is None else is_grayscale_array(texels.reshape(-1, texels.shape[2]))
+        with self._lock:
+            self.grayscale_scans += 1
+            if record is not None and len(record) == 5:
+                record.append(_UNKNOWN if grayscale is None else _GRAY if grayscale else _COLOR)
+                self._dirty.add(dir_path)
+        return grayscale
+
+    def save(self):
+        """바뀐 디렉토리의 목록을 쓴다"""
+        with self._lock:
+            dirty = [(dir_path, self._listings[dir_path]) for dir_path in self._dirty]
+            self._dirty.clear()
+
+        for dir_path, listing in dirty:
+            path = self._file(dir_path)
+            # 다른 Blender가 같은 파일을 읽는 중일 수 있다
+            try:
+                atomic_write(path, lambda partial_path: _write_json(partial_path, listing), '.partial.json')
+            except OSError:
+                pass
+
+    def summary(self):
+        return (
+            f"Texture inventory: {self.reused} folders reused, {self.scanned} scanned, "
+            f"{self.headers} headers read, {self.grayscale_scans} grayscale scans"
+        )
+
+def _write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
@@ -0,0 +1,130 @@
+import os
+import threading
+import numpy as np
+from ...utilities.cache_dir import cache_dir
+from ...utilities.file_cache import EvictionBudget, atomic_write, file_hash, touch
+from ...utilities.png import decode_png_texels, encode_png, read_png_header
+
+# 원본 경로를 기록하는 이미지 custom property. 전체 해상도로 바꿀 때 쓴다
+SOURCE_KEY = 'splatoon_full_resolution'
+# 캐시 디렉토리 용량. 넘으면 오래 쓰지 않은 프록시부터 지운다
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+PARTIAL_SUFFIX = '.partial.png'
+
+def halve(texels):
+    """2x2 box filter로 가로세로를 절반으로 줄인다. 홀수 크기는 가장자리를 늘려 맞춘다"""
+    height, width = texels.shape[:2]
+    if height % 2 or width % 2:
+        texels = np.pad(texels, ((0, height % 2), (0, width % 2), (0, 0)), mode='edge')
+    height, width, channels = texels.shape
+    blocks = texels.reshape(height // 2, 2, width // 2, 2, channels).astype(np.uint16)
+    return ((blocks.sum(axis=(1, 3)) + 2) >> 2).astype(np.uint8)
+
+class TextureProxies:
+    """
+    긴 변이 max_size보다 큰 텍스처를 줄인 PNG로 바꿔 준다.
+    절반씩 줄여 가며 max_size 이하가 되는 mip 단계를 만들고 그 단계만 디스크에 남긴다.
+    캐시는 원본 내용의 해시와 단계 크기로 찾는다. 더 작은 크기 제한으로 다시 임포트하면
+    캐시에 있는 더 큰 단계를 줄이므로 원본을 다시 디코딩하지 않는다.
+    캐시가 max_bytes를 넘으면 오래 쓰지 않은 것부터 지운다.
+    MaterialPlanner가 플랜 스레드에서 부르므로 bpy를 쓰지 않는다.
+    """
+
+    def __init__(self, max_size, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_size = max_size
+        self.directory = directory or cache_dir('proxies')
+        self.eviction = EvictionBudget(self.directory, max_bytes, (PARTIAL_SUFFIX,))
+        self._lock = threading.Lock()
+        # (경로, 크기, mtime) -> 프록시 경로
+        self._paths = {}
+        self.created = 0
+        self.reused = 0
+        # 원본 대신 올리지 않은 RGBA float 픽셀 크기 (Blender image.pixels 기준)
+        self.skipped_bytes = 0
+
+    def _level_path(self, digest, size, name):
+        return os.path.join(self.directory, digest, str(size), name)
+
+    def _larger_level(self, digest, size, name):
+        """캐시에 있는 size보다 큰 단계 중 가장 작은 것의 경로"""
+        try:
+            sizes = sorted(int(entry) for entry in os.listdir(os.path.join(self.directory, digest)) if entry.isdigit())
+        except OSError:
+            return None
+        for level in sizes:
+            if level <= size:
+                continue
+            level_path = self._level_path(digest, level, name)
+            if os.path.exists(level_path):
+                return level_path
+        return None
+
+    def proxy_path(self, path):
+        """path 대신 불러올 경로. 줄일 필요가 없거나 줄일 수 없으면 path 그대로"""
+        header = read_png_header(path)
+        if header is None or max(header.width, header.height) <= self.max_size:
+            return path
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return path
+        memo_key = (path, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._paths.get(memo_key)
+        if cached is not None:
+            return cached
+
+        proxy = self._proxy(path, header)
+        with self._lock:
+            self._paths[memo_key] = proxy
+        return proxy
+
+    def _proxy(self, path, header):
+        digest = file_hash(path)[:32]
+        name = os.path.basename(path)
+
+        # 긴 변이 max_size 이하가 되는 단계의 크기. halve()처럼 홀수는 올림
+        width, height = header.width, header.height
+        while max(width, height) > self.max_size:
+            width, height = (width + 1) // 2, (height + 1) // 2
+        size = max(width, height)
+        target = self._level_path(digest, size, name)
+        if os.path.exists(target):
+            touch(target)
+            with self._lock:
+                self.reused += 1
+                self.skipped_bytes += (header.width * header.height - width * height) * 16
+            return target
+
+        # mip 단계는 앞 단계를 절반으로 줄인 것이므로 더 큰 단계에서 시작해도 결과가 같다
+        texels = decode_png_texels(self._larger_level(digest, size, name) or path)
+        if texels is None:
+            # 팔레트, 16-bit 등은 원본을 쓴다
+            return path
+
+        while max(texels.shape[:2]) > self.max_size:
+            texels = halve(texels)
+        self._write(target, texels)
+        self.eviction.wrote(target)
+
+        with self._lock:
+            self.created += 1
+            self.skipped_bytes += (header.width * header.height - texels.shape[0] * texels.shape[1]) * 16
+        return target
+
+    @staticmethod
+    def _write(level_path, texels):
+        if os.path.exists(level_path):
+            return
+        directory = os.path.dirname(level_path)
+        os.makedirs(directory, exist_ok=True)
+        atomic_write(level_path, lambda partial_path: encode_png(partial_path, texels), PARTIAL_SUFFIX)
+
+    def summary(self):
+        return (
+            f"Proxy textures (max {self.max_size}px): {self.created + self.reused}, "
+            f"~{self.skipped_bytes / (1024 * 1024):.0f} MB of full-resolution pixels not loaded"
+        )
@@ -0,0 +1,82 @@
+"""
+텍스처 suffix 등록부.
+suffix마다 colorspace, 연결할 principled 입력, 노드 배치 위치를 한 곳에 둔다.
+플래너는 이 표와 SuffixClassifier가 찾은 텍스처 세트로 노드를 만든다.
+"""
+
+import re
+from collections import namedtuple
+
+# non_color: Non-Color로 불러온다
+# principled_input: 곧바로(또는 노멀 맵/곱셈을 거쳐) 연결되는 principled 입력. 없으면 None
+# layout_y: principled 노드 기준 이미지 노드의 y 오프셋
+TextureRole = namedtuple('TextureRole', ['suffix', 'non_color', 'principled_input', 'layout_y'])
+
+TEXTURE_ROLES = (
+    TextureRole('_alb', False, 'Base Color', 0),
+    TextureRole('_ao', True, 'Base Color', -50),
+    TextureRole('_tcl', True, 'Base Color', 100),
+    TextureRole('_mtl', True, 'Metallic', -85),
+    TextureRole('_rgh', True, 'Roughness', -99),
+    TextureRole('_opa', True, 'Alpha', -135),
+    TextureRole('_nrm', True, 'Normal', -180),
+    TextureRole('_emm', False, 'Emission Color', -250),
+    TextureRole('_emi', False, 'Emission Color', -250),
+    TextureRole('_trm', False, None, 300),
+    TextureRole('_mai', True, None, 500),
+    TextureRole('_thc', True, None, 600),
+)
+ROLES = {role.suffix: role for role in TEXTURE_ROLES}
+
+# 파일 이름에서 base name을 자를 때 쓰는 suffix
+BASE_SUFFIXES = ('_alb', '_emm', '_emi')
+
+def parse_aliases(text):
+    """
+    '_alb0=_alb;_nrm1=_nrm' 같은 세미콜론 구분 목록을 {별칭: 등록된 suffix}로 만든다.
+    밑줄로 시작하고 다른 밑줄이 없는 별칭만 받는다. 텍스처 색인이 마지막 '_'에서 base name을 자르기 때문이다
+    """
+    aliases = {}
+    for item in (text or '').split(';'):
+        alias, _, suffix = item.partition('=')
+        alias, suffix = alias.strip().lower(), suffix.strip().lower()
+        if suffix in ROLES and alias not in ROLES and re.fullmatch(r'_[^_]+', alias):
+            aliases[alias] = suffix
+    return aliases
+
+class SuffixClassifier:
+    """
+    base name 하나의 텍스처 세트를 suffix별로 한 번에 찾는다.
+    텍스처 색인에서 base name의 {suffix: 경로}를 한 번 읽고 등록된 suffix와 별칭으로 분류하므로
+    역할마다 파일 이름을 따로 조회하지 않는다.
+    같은 역할에 등록된 suffix와 별칭 파일이 모두 있으면 등록된 suffix가 이긴다.
+    """
+
+    def __init__(self, aliases=None):
+        self.aliases = dict(aliases or {})
+        # 소문자 suffix -> 등록된 suffix
+        self._canonical = {suffix: suffix for suffix in ROLES}
+        self._canonical.update(self.aliases)
+        # BASE_SUFFIXES 순서대로, 등록된 suffix 다음에 그 별칭. 이름에 여러 개가 있으면 앞 순서의 suffix로 자른다
+        self._base_patterns = [
+            re.compile(re.escape(suffix), re.IGNORECASE)
+            for base_suffix in BASE_SUFFIXES
+            for suffix in [base_suffix] + [alias for alias, canonical in self.aliases.items() if canonical == base_suffix]
+        ]
+
+    def base_name(self, basename):
+        """파일 이름에서 base suffix 앞부분. base suffix가 없으면 None"""
+        for pattern in self._base_patterns:
+            match = pattern.search(basename)
+            if match:
+                return basename[:match.start()]
+        return None
+
+    def classify(self, texture_index, dir_path, base_name):
+        """{등록된 suffix: 경로}"""
+        found = {}
+        for suffix, path in texture_index.suffixes(dir_path, base_name).items():
+            canonical = self._canonical.get(suffix)
+            if canonical is not None and (canonical == suffix or canonical not in found):
+                found[canonical] = path
+        return found
@@ -1,15 +1,22 @@
+import os
 import bpy
 from .importers.splatoon.queueing import Queueing
-from .utilities.DAE_OT_import_via_fbx import NotFoundConvertModule, FailConvert
+from .importers.splatoon.discovery import split_patterns
+from .importers.splatoon.texture_proxy import SOURCE_KEY
+from .utilities.DAE_OT_import_via_fbx import DAE_OT_import_via_fbx, NotFoundConvertModule, FailConvert, DEFAULT_TIMEOUT
 from bpy_extras.io_utils import (
     poll_file_object_drop,
 )
 
-class SplatoonSceneImporter(bpy.types.Operator):
-    bl_idname = "import_scene.splatoon_scene_importer"
-    bl_label = "Splatoon Scene (.dae .fbx)"
+class SplatoonSceneImporterBase:
+    """두 임포트 오퍼레이터가 공유하는 옵션 UI와 modal 스케줄러"""
     bl_options = {'REGISTER', 'UNDO'}
+    # 타이머는 짧게 두고 한 틱에서 쓰는 시간은 frame budget으로 제한한다
+    TIMER_INTERVAL = 0.01
     _timer = None
+    _undo_handler = None
+    # 임포트 중에 undo가 일어나면 큐가 들고 있는 Material, Node 등의 참조가 해제된다
+    _undone = False
     queue = None
 
     files: bpy.props.CollectionProperty(
@@ -36,28 +43,86 @@ class SplatoonSceneImporter(bpy.types.Operator):
         col.label(text="Shader Mix Style:")
         col.prop(context.scene, "shader_mix_style", expand=True)
 
+        layout.label(text="Node Layout:")
+        layout.prop(context.scene, 'node_layout_splatoon_scene_importer', expand=True)
+
+        layout.prop(context.scene, 'is_pack_channels_splatoon_scene_importer')
+        layout.prop(context.scene, 'texture_size_splatoon_scene_importer')
+        layout.prop(context.scene, 'suffix_aliases_splatoon_scene_importer')
+        layout.prop(context.scene, 'is_texture_inventory_splatoon_scene_importer')
+
+        layout.prop(context.scene, 'dae_import_method_splatoon_scene_importer')
+
         layout.prop(context.scene, 'is_scale_armature_splatoon_scene_importer')
         sub_col = layout.column()
         sub_col.enabled = context.scene.is_scale_armature_splatoon_scene_importer
         sub_col.prop(context.scene, 'scale_value_splatoon_scene_importer')
 
-    def invoke(self, context, event):
-        context.window_manager.fileselect_add(self)
+        layout.prop(context.scene, 'is_share_meshes_splatoon_scene_importer')
+
+        layout.prop(context.scene, 'is_bulk_import_splatoon_scene_importer')
+        layout.prop(context.scene, 'frame_budget_splatoon_scene_importer')
+
+        layout.prop(context.scene, 'is_profile_splatoon_scene_importer')
+        profile_col = layout.column()
+        profile_col.enabled = context.scene.is_profile_splatoon_scene_importer
+        profile_col.prop(context.scene, 'profile_path_splatoon_scene_importer')
+
+    def create_queue(self, context):
+        return Queueing(self.files, self.directory)
+
+    def execute(self, context):
+        self.queue = self.create_queue(context)
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(self.TIMER_INTERVAL, window=context.window)
+        wm.modal_handler_add(self)
+        wm.progress_begin(0, max(self.queue.total_files, 1))
+        self.update_progress(context)
+
+        # 단축키 undo는 modal에서 막고, 메뉴 등으로 undo가 일어나면 다음 이벤트에서 임포트를 멈춘다
+        def on_undo(*args):
+            self._undone = True
+        self._undo_handler = on_undo
+        bpy.app.handlers.undo_post.append(on_undo)
+        bpy.app.handlers.redo_post.append(on_undo)
+
         return {'RUNNING_MODAL'}
 
+    @staticmethod
+    def is_undo_event(event):
+        if event.value != 'PRESS' or not (event.ctrl or event.oskey):
+            return False
+        return event.type == 'Z' or (event.type == 'Y' and not event.shift)
+
     def modal(self, context, event):
+        if self._undone and self.queue:
+            self.report({'WARNING'}, f"Import stopped by undo after {self.queue.completed_files}/{self.queue.total_files} files")
+            # undo로 해제된 datablock은 건드리지 않고 스레드와 캐시만 정리한다
+            self.queue.abandon()
+            self.queue = None
+            self.cancel(context)
+            return {'CANCELLED'}
+
+        if self.is_undo_event(event):
+            self.report({'WARNING'}, "Undo is disabled while importing. Press Esc to cancel the import first")
+            return {'RUNNING_MODAL'}
+
+        if event.type == 'ESC' and event.value == 'PRESS' and self.queue:
+            self.report({'WARNING'}, f"Import cancelled after {self.queue.completed_files}/{self.queue.total_files} files")
+            self.cancel(context)
+            return {'CANCELLED'}
+
         if event.type == 'TIMER':
             try:
-                if not self.queue or not self.queue.processing_queue:
-                    # 모든 처리가 완료됨
-                    self.cancel(context)
-                    return {'FINISHED'}
+                if not self.queue:
+                    return self.finish(context)
 
-                result = self.queue.process_next_file()
-                if not result:
-                    # 큐가 비었음
-                    self.cancel(context)
-                    return {'FINISHED'}
+                budget = context.scene.frame_budget_splatoon_scene_importer / 1000
+                if not self.queue.run(budget):
+                    # 모든 처리가 완료됨
+                    return self.finish(context)
+                self.update_progress(context)
 
             except (NotFoundConvertModule, FailConvert) as e:
                 self.report({'ERROR'}, f"Failed to convert file: {str(e)}")
@@ -70,96 +135,151 @@ class SplatoonSceneImporter(bpy.types.Operator):
 
         return {'PASS_THROUGH'}
 
-    def execute(self, context):
-        self.queue = Queueing(self.files, self.directory)
+    def update_progress(self, context):
+        context.window_manager.progress_update(self.queue.completed_files)
+        if context.workspace:
+            context.workspace.status_text_set(self.queue.progress_text())
 
-        wm = context.window_manager
-        self._timer = wm.event_timer_add(0.1, window=context.window)
-        wm.modal_handler_add(self)
-
-        return {'RUNNING_MODAL'}
+    def finish(self, context):
+        self.cancel(context)
+        if self.queue:
+            for file_path, message in self.queue.errors:
+                self.report({'WARNING'}, f"Failed to import {file_path}: {message}")
+            self.report({'INFO'}, self.queue.summary())
+        return {'FINISHED'}
 
     def cancel(self, context):
         if self._timer:
             context.window_manager.event_timer_remove(self._timer)
+            context.window_manager.progress_end()
+            if context.workspace:
+                context.workspace.status_text_set(None)
             self._timer = None
+        if self._undo_handler is not None:
+            for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+                if self._undo_handler in handlers:
+                    handlers.remove(self._undo_handler)
+            self._undo_handler = None
+        if self.queue:
+            self.queue.close()
+
+class SplatoonSceneImporter(SplatoonSceneImporterBase, bpy.types.Operator):
+    bl_idname = "import_scene.splatoon_scene_importer"
+    bl_label = "Splatoon Scene (.dae .fbx)"
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
 
-class SplatoonSceneImporterDragDrop(bpy.types.Operator):
+class SplatoonSceneImporterDragDrop(SplatoonSceneImporterBase, bpy.types.Operator):
     bl_idname = "import_scene.splatoon_scene_importer_dragdrop"
     bl_label = "Splatoon Scene Drag & Drop (.dae .fbx)"
-    bl_options = {'REGISTER', 'UNDO'}
-    _timer = None
-    queue = None
 
-    files: bpy.props.CollectionProperty(
-        type=bpy.types.OperatorFileListElement,
-        options={'HIDDEN', 'SKIP_SAVE'},
-    )
-    directory: bpy.props.StringProperty(
-        subtype='DIR_PATH',
-        options={'HIDDEN'},
-    )
+    def invoke(self, context, event):
+        # 드래그 앤드롭으로 파일을 가져온 후, 레이아웃을 표시
+        return context.window_manager.invoke_props_dialog(self)
 
-    filter_glob: bpy.props.StringProperty(
-        default="*.dae;*.fbx",
+class SplatoonSceneImporterDirectory(SplatoonSceneImporterBase, bpy.types.Operator):
+    """Import every .dae/.fbx in a map folder and its subfolders"""
+    bl_idname = "import_scene.splatoon_scene_importer_directory"
+    bl_label = "Splatoon Map Folder (.dae .fbx)"
+
+    filter_folder: bpy.props.BoolProperty(
+        default=True,
         options={'HIDDEN'},
-        maxlen=255,
     )
 
     def draw(self, context):
+        super().draw(context)
         layout = self.layout
-        layout.prop(context.scene, 'is_apply_second_shader')
-
-        col = layout.column()
-        col.enabled = context.scene.is_apply_second_shader
-        col.label(text="Shader Mix Style:")
-        col.prop(context.scene, "shader_mix_style", expand=True)
-
-        layout.prop(context.scene, 'is_scale_armature_splatoon_scene_importer')
-        sub_col = layout.column()
-        sub_col.enabled = context.scene.is_scale_armature_splatoon_scene_importer
-        sub_col.prop(context.scene, 'scale_value_splatoon_scene_importer')
+        layout.label(text="Folder Filters:")
+        layout.prop(context.scene, 'include_glob_splatoon_scene_importer')
+        layout.prop(context.scene, 'exclude_glob_splatoon_scene_importer')
+
+    def create_queue(self, context):
+        scene = context.scene
+        return Queueing.from_directory(
+            [self.directory],
+            split_patterns(scene.include_glob_splatoon_scene_importer),
+            split_patterns(scene.exclude_glob_splatoon_scene_importer),
+        )
 
     def invoke(self, context, event):
-        # 드래그 앤드롭으로 파일을 가져온 후, 레이아웃을 표시
-        return context.window_manager.invoke_props_dialog(self)
-
-    def execute(self, context):
-        self.queue = Queueing(self.files, self.directory)
-
-        wm = context.window_manager
-        self._timer = wm.event_timer_add(0.1, window=context.window)
-        wm.modal_handler_add(self)
-
+        context.window_manager.fileselect_add(self)
         return {'RUNNING_MODAL'}
 
-    def modal(self, context, event):
-        if event.type == 'TIMER':
-            try:
-                if not self.queue or not self.queue.processing_queue:
-                    self.cancel(context)
-                    return {'FINISHED'}
+class SplatoonFullResolutionTextures(bpy.types.Operator):
+    """Reload proxy textures from their full-resolution originals. Node trees are left as they are"""
+    bl_idname = "image.splatoon_full_resolution_textures"
+    bl_label = "Splatoon Textures to Full Resolution"
+    bl_options = {'REGISTER', 'UNDO'}
 
-                result = self.queue.process_next_file()
-                if not result:
-                    self.cancel(context)
-                    return {'FINISHED'}
+    @classmethod
+    def poll(cls, context):
+        return any(SOURCE_KEY in image for image in bpy.data.images)
 
-            except (NotFoundConvertModule, FailConvert) as e:
-                self.report({'ERROR'}, f"Failed to convert file: {str(e)}")
-                self.cancel(context)
-                return {'CANCELLED'}
-            except Exception as e:
-                self.report({'ERROR'}, f"Unexpected error: {str(e)}")
-                self.cancel(context)
-                return {'CANCELLED'}
+    def execute(self, context):
+        # 같은 datablock의 파일만 바꾸므로 이미지를 쓰는 노드는 그대로 새 픽셀을 본다
+        swapped = 0
+        missing = 0
+        for image in bpy.data.images:
+            if SOURCE_KEY not in image:
+                continue
+            source_path = image[SOURCE_KEY]
+            if not os.path.exists(source_path):
+                missing += 1
+                continue
+            image.filepath = source_path
+            image.reload()
+            del image[SOURCE_KEY]
+            swapped += 1
+
+        message = f"Textures swapped to full resolution: {swapped}"
+        if missing:
+            message += f" | Missing originals: {missing}"
+        self.report({'WARNING'} if missing else {'INFO'}, message)
+        return {'FINISHED'}
+
+def _update_converter(self, context):
+    self.apply()
+
+class SplatoonSceneImporterPreferences(bpy.types.AddonPreferences):
+    bl_idname = __package__
+
+    converter_path: bpy.props.StringProperty(
+        name="DAE Converter",
+        description="Converter executable. Empty searches the default Autodesk FBX Converter install paths",
+        subtype='FILE_PATH',
+        default="",
+        update=_update_converter,
+    )
+    converter_backend: bpy.props.EnumProperty(
+        name="Converter Type",
+        description="How the converter is called",
+        items=[
+            ('AUTODESK', "Autodesk FBX Converter", "fbxconverter.exe <input.dae> <output.fbx> /v"),
+            ('COMMAND', "Command", "<converter> <input.dae> <output.fbx>, for stand-in scripts or other converters"),
+        ],
+        default='AUTODESK',
+        update=_update_converter,
+    )
+    converter_timeout: bpy.props.IntProperty(
+        name="Conversion Timeout (s)",
+        description="Stop a conversion that runs longer than this. 0 waits forever",
+        default=DEFAULT_TIMEOUT,
+        min=0,
+        update=_update_converter,
+    )
 
-        return {'PASS_THROUGH'}
+    def apply(self):
+        DAE_OT_import_via_fbx.configure(bpy.path.abspath(self.converter_path), self.converter_backend, self.converter_timeout)
 
-    def cancel(self, context):
-        if self._timer:
-            context.window_manager.event_timer_remove(self._timer)
-            self._timer = None
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, 'converter_path')
+        layout.prop(self, 'converter_backend')
+        layout.prop(self, 'converter_timeout')
+        layout.label(text=f"Environment variables {DAE_OT_import_via_fbx.CONVERTER_ENV}, {DAE_OT_import_via_fbx.BACKEND_ENV} and {DAE_OT_import_via_fbx.TIMEOUT_ENV} override these")
 
 class IO_FH_splatoon(bpy.types.FileHandler):
     bl_idname = "IO_FH_splatoon"
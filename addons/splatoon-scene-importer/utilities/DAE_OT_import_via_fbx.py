@@ -1,58 +1,258 @@
 
 import os
 import tempfile
+import threading
 import subprocess
+from collections import deque
+
+# 실패했을 때 오류 메시지에 남기는 컨버터 출력의 마지막 줄 수
+OUTPUT_TAIL_LINES = 40
+# 변환 하나의 기본 제한 시간(초). 0이면 제한하지 않는다
+DEFAULT_TIMEOUT = 600
+
+class ConverterBackend:
+    """
+    DAE -> FBX 컨버터 하나.
+    다른 컨버터는 이 클래스를 상속해 command()를 구현하고 DAE_OT_import_via_fbx.register_backend()로 등록한다.
+    """
+
+    name = None
+    # 설치 경로를 지정하지 않았을 때 찾아보는 경로
+    default_paths = ()
+
+    def __init__(self, executable):
+        self.executable = executable
+
+    @classmethod
+    def discover(cls):
+        for path in cls.default_paths:
+            if os.path.exists(path):
+                return cls(path)
+        return None
+
+    def command(self, input_path, output_path):
+        raise NotImplementedError
+
+    def version(self):
+        # 컨버터는 버전 조회 옵션이 없으므로 실행 파일의 크기와 mtime을 버전 대신 쓴다
+        stat = os.stat(self.executable)
+        return f"{self.name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+class AutodeskFbxConverter(ConverterBackend):
+    name = 'AUTODESK'
+    # FBX Converter의 일반적인 설치 경로들
+    default_paths = (
+        "C:\\Program Files\\Autodesk\\FBX\\FBX Converter\\2013.3\\bin\\fbxconverter.exe",
+        "C:\\Program Files (x86)\\Autodesk\\FBX\\FBX Converter\\2013.3\\bin\\fbxconverter.exe",
+    )
+
+    def command(self, input_path, output_path):
+        # verbose 출력은 실패했을 때 마지막 부분만 남긴다
+        return [self.executable, input_path, output_path, "/v"]
+
+class CommandConverter(ConverterBackend):
+    """`<실행 파일> <입력 .dae> <출력 .fbx>`로 부르는 컨버터. Linux용 대체 스크립트 등"""
+    name = 'COMMAND'
+
+    def command(self, input_path, output_path):
+        return [self.executable, input_path, output_path]
+
+class ProcessGroup:
+    """
+    실행 중인 컨버터 프로세스 묶음. 변환을 취소할 때 terminate()로 한 번에 끝낸다.
+    terminate() 뒤에 시작하는 프로세스는 바로 끝낸다
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._processes = set()
+        self._terminated = False
+
+    def add(self, process):
+        with self._lock:
+            if not self._terminated:
+                self._processes.add(process)
+                return
+        process.kill()
+
+    def discard(self, process):
+        with self._lock:
+            self._processes.discard(process)
+
+    def running(self):
+        with self._lock:
+            return len(self._processes)
+
+    def terminate(self):
+        with self._lock:
+            self._terminated = True
+            processes = list(self._processes)
+            self._processes.clear()
+        for process in processes:
+            try:
+                process.kill()
+            except OSError:
+                pass
+
+# 이름 -> ConverterBackend 클래스
+BACKENDS = {
+    AutodeskFbxConverter.name: AutodeskFbxConverter,
+    CommandConverter.name: CommandConverter,
+}
 
 class DAE_OT_import_via_fbx:
-    
+
+    # 컨버터 실행 파일을 직접 지정한다. Linux에서 대체 컨버터로 테스트할 때 사용
+    CONVERTER_ENV = 'SPLATOON_FBX_CONVERTER'
+    BACKEND_ENV = 'SPLATOON_FBX_CONVERTER_BACKEND'
+    TIMEOUT_ENV = 'SPLATOON_FBX_CONVERTER_TIMEOUT'
+
+    # 애드온 설정의 값. configure()로 바꾼다
+    _path = ''
+    _backend = AutodeskFbxConverter.name
+    _timeout = DEFAULT_TIMEOUT
+    # (경로, backend) -> 찾은 ConverterBackend 또는 None
+    _resolved = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def configure(path='', backend=AutodeskFbxConverter.name, timeout=DEFAULT_TIMEOUT):
+        """애드온 설정이 바뀌면 부른다. 찾아 둔 컨버터를 버린다"""
+        cls = DAE_OT_import_via_fbx
+        with cls._lock:
+            cls._path = path
+            cls._backend = backend
+            cls._timeout = timeout
+            cls._resolved.clear()
+
+    @staticmethod
+    def register_backend(backend):
+        """다른 컨버터를 추가한다. 이후 찾기부터 후보가 된다"""
+        cls = DAE_OT_import_via_fbx
+        with cls._lock:
+            BACKENDS[backend.name] = backend
+            cls._resolved.clear()
+
+    @staticmethod
+    def timeout():
+        cls = DAE_OT_import_via_fbx
+        env_timeout = os.environ.get(cls.TIMEOUT_ENV)
+        if env_timeout:
+            try:
+                return float(env_timeout)
+            except ValueError:
+                pass
+        return cls._timeout
+
     @staticmethod
     def _find_fbx_converter():
-        # FBX Converter의 일반적인 설치 경로들
-        possible_paths = [
-            "C:\\Program Files\\Autodesk\\FBX\\FBX Converter\\2013.3\\bin\\fbxconverter.exe",
-            "C:\\Program Files (x86)\\Autodesk\\FBX\\FBX Converter\\2013.3\\bin\\fbxconverter.exe",
-        ]
-        
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-                
-        return None
-    
+        """
+        사용할 ConverterBackend. 찾지 못하면 None.
+        환경 변수, 애드온 설정 순서로 경로와 backend를 정하고, 경로가 없으면 등록된 backend의 설치 경로를 찾아본다.
+        결과는 설정이 바뀔 때까지 캐시하므로 변환마다 경로를 확인하지 않는다
+        """
+        cls = DAE_OT_import_via_fbx
+        with cls._lock:
+            path = os.environ.get(cls.CONVERTER_ENV) or cls._path
+            backend_name = os.environ.get(cls.BACKEND_ENV) or cls._backend
+            key = (path, backend_name)
+            if key in cls._resolved:
+                return cls._resolved[key]
+
+        backend = BACKENDS.get(backend_name, AutodeskFbxConverter)
+        if path:
+            converter = backend(path) if os.path.exists(path) else None
+        else:
+            converter = None
+            for candidate in [backend] + [other for other in BACKENDS.values() if other is not backend]:
+                converter = candidate.discover()
+                if converter is not None:
+                    break
+
+        with cls._lock:
+            cls._resolved[key] = converter
+        return converter
+
     @staticmethod
-    def convert(file_path):
-        # FBX Converter 경로 찾기
-        converter_path = DAE_OT_import_via_fbx._find_fbx_converter()
-        if not converter_path:
+    def find_converter():
+        converter = DAE_OT_import_via_fbx._find_fbx_converter()
+        if not converter:
             raise NotFoundConvertModule("FBX Converter not found. Please install Autodesk FBX Converter.")
-            
-        # 임시 FBX 파일을 위한 경로 생성
-        with tempfile.NamedTemporaryFile(suffix='.fbx', delete=False) as temp_file:
-            temp_fbx_path = temp_file.name
-            
-        
-        # DAE를 FBX로 변환
-        conversion_command = [
-            converter_path,
-            file_path,  # 입력 DAE 파일
-            temp_fbx_path,  # 출력 FBX 파일
-            "/v"            # verbose 출력
-        ]
-        
-        process = subprocess.Popen(
-            conversion_command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        stdout, stderr = process.communicate()
-        
-        if process.returncode != 0:
-            raise FailConvert(f'Conversion failed: {stderr.decode()}')
-            
+        return converter
+
+    @staticmethod
+    def converter_version(converter):
+        return converter.version()
+
+    @staticmethod
+    def convert(file_path, output_path=None, converter=None, processes=None):
+        # FBX Converter 찾기
+        if converter is None:
+            converter = DAE_OT_import_via_fbx.find_converter()
+
+        if output_path:
+            temp_fbx_path = output_path
+        else:
+            # 임시 FBX 파일을 위한 경로 생성
+            with tempfile.NamedTemporaryFile(suffix='.fbx', delete=False) as temp_file:
+                temp_fbx_path = temp_file.name
+
+        try:
+            DAE_OT_import_via_fbx._run(converter.command(file_path, temp_fbx_path), processes)
+        except BaseException:
+            # 직접 만든 임시 파일은 실패해도 남기지 않는다
+            if not output_path:
+                try:
+                    os.unlink(temp_fbx_path)
+                except OSError:
+                    pass
+            raise
+
         return temp_fbx_path
 
+    @staticmethod
+    def _run(command, processes=None):
+        """
+        컨버터를 실행한다. 출력은 메모리에 모두 모으지 않고 마지막 OUTPUT_TAIL_LINES 줄만 남긴다.
+        제한 시간을 넘기면 프로세스를 끝내고 FailConvert를 발생시킨다.
+        processes(ProcessGroup)가 있으면 실행하는 동안 등록해 두어 취소할 때 끝낼 수 있게 한다
+        """
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        if processes is not None:
+            processes.add(process)
+        tail = deque(maxlen=OUTPUT_TAIL_LINES)
+
+        def drain():
+            for line in process.stdout:
+                tail.append(line)
+
+        reader = threading.Thread(target=drain, name='splatoon-convert-output', daemon=True)
+        reader.start()
+        timeout = DAE_OT_import_via_fbx.timeout()
+        try:
+            process.wait(timeout=timeout or None)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            reader.join()
+            raise FailConvert(f'Conversion timed out after {timeout:g}s: {_decode(tail)}')
+        except BaseException:
+            process.kill()
+            raise
+        finally:
+            reader.join()
+            process.stdout.close()
+            if processes is not None:
+                processes.discard(process)
+
+        if process.returncode != 0:
+            raise FailConvert(f'Conversion failed: {_decode(tail)}')
+
+def _decode(lines):
+    return b''.join(lines).decode(errors='replace').strip()
+
 class NotFoundConvertModule(Exception):
     pass
 
 class FailConvert(Exception):
-    pass
\ No newline at end of file
+    pass
@@ -0,0 +1,29 @@
+import os
+import tempfile
+
+CACHE_DIR_ENV = 'SPLATOON_IMPORTER_CACHE_DIR'
+
+def cache_root():
+    """애드온 디스크 캐시의 최상위 경로"""
+    root = os.environ.get(CACHE_DIR_ENV)
+    if root:
+        return root
+
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or tempfile.gettempdir()
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'splatoon-scene-importer')
+
+def cache_dir(name):
+    """
+    name 하위 캐시 디렉토리를 만들어 반환한다.
+    만들 수 없으면 임시 디렉토리 아래를 쓴다.
+    """
+    path = os.path.join(cache_root(), name)
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError:
+        path = os.path.join(tempfile.gettempdir(), 'splatoon-scene-importer', name)
+        os.makedirs(path, exist_ok=True)
+    return path
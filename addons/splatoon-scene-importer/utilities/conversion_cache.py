@@ -0,0 +1,76 @@
+import os
+import hashlib
+import threading
+from collections import Counter
+from .cache_dir import cache_dir
+from .file_cache import EvictionBudget, atomic_write, file_digest, touch
+from .DAE_OT_import_via_fbx import DAE_OT_import_via_fbx
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+PARTIAL_SUFFIX = '.partial.fbx'
+
+class ConversionCache:
+    """
+    DAE -> FBX 변환 결과를 디스크에 보관하는 캐시.
+    키는 DAE 내용 + 컨버터 경로 + 컨버터 backend와 버전의 해시이고,
+    용량이 max_bytes를 넘으면 가장 오래 쓰지 않은 파일부터 지운다.
+    convert()가 돌려준 파일은 release()할 때까지 지우지 않는다. ConversionPool이 큐 전체를 미리 변환하므로
+    아직 임포트하지 않은 FBX가 다른 변환의 정리에 지워지면 안 된다.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory or cache_dir('fbx')
+        self.max_bytes = max_bytes
+        self.eviction = EvictionBudget(self.directory, max_bytes, (PARTIAL_SUFFIX,))
+        # 돌려주고 아직 release()하지 않은 경로 -> 횟수
+        self._in_use = Counter()
+        self.hits = 0
+        self.misses = 0
+        # ConversionPool의 여러 스레드에서 동시에 호출된다
+        self._lock = threading.Lock()
+
+    def key(self, file_path, converter):
+        digest = hashlib.sha256()
+        digest.update(os.path.normcase(os.path.abspath(converter.executable)).encode('utf-8'))
+        digest.update(DAE_OT_import_via_fbx.converter_version(converter).encode('utf-8'))
+        return file_digest(file_path, digest).hexdigest()
+
+    def convert(self, file_path, processes=None):
+        """
+        변환된 FBX 경로를 반환한다. 반환된 파일은 캐시 소유이므로 지우면 안되고, 다 쓰면 release()한다.
+        processes는 컨버터 프로세스를 등록할 ProcessGroup
+        """
+        converter = DAE_OT_import_via_fbx.find_converter()
+        cached_path = os.path.join(self.directory, self.key(file_path, converter) + '.fbx')
+
+        if os.path.exists(cached_path):
+            with self._lock:
+                self.hits += 1
+                self._in_use[cached_path] += 1
+            # 접근 시간을 mtime으로 기록해 LRU 순서로 쓴다
+            touch(cached_path)
+            return cached_path
+
+        with self._lock:
+            self.misses += 1
+
+        # 변환이 중간에 실패해도 캐시에 반쪽짜리 FBX가 남지 않는다
+        atomic_write(cached_path, lambda partial_path: DAE_OT_import_via_fbx.convert(file_path, partial_path, converter, processes), PARTIAL_SUFFIX)
+
+        with self._lock:
+            self._in_use[cached_path] += 1
+            in_use = set(self._in_use)
+        self.eviction.wrote(cached_path, keep=in_use)
+        return cached_path
+
+    def release(self, cached_path):
+        """convert()가 돌려준 파일을 다 썼다. 이제 용량 정리로 지울 수 있다"""
+        with self._lock:
+            self._in_use[cached_path] -= 1
+            if self._in_use[cached_path] <= 0:
+                del self._in_use[cached_path]
+
+    def summary(self):
+        return f"FBX conversion cache hits: {self.hits}, misses: {self.misses}"
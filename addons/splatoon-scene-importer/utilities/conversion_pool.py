@@ -0,0 +1,58 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from .profiling import NULL_PROFILER
+from .DAE_OT_import_via_fbx import ProcessGroup
+
+class ConversionPool:
+    """
+    DAE -> FBX 변환을 미리 병렬로 돌려두는 풀.
+    각 작업은 외부 컨버터 subprocess를 기다리기만 하므로 스레드로 충분하다.
+    """
+
+    def __init__(self, conversion_cache, max_workers=None, profiler=NULL_PROFILER):
+        self.conversion_cache = conversion_cache
+        self.profiler = profiler
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None
+        self._futures = {}
+        # 실행 중인 컨버터. 취소할 때 끝낸다
+        self._processes = ProcessGroup()
+
+    def submit(self, file_path):
+        if file_path in self._futures:
+            return self._futures[file_path]
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='splatoon-convert',
+            )
+        future = self._executor.submit(self._convert, file_path, self._processes)
+        self._futures[file_path] = future
+        return future
+
+    def _convert(self, file_path, processes):
+        # 제출할 때의 ProcessGroup을 쓰므로 shutdown() 뒤에 시작한 프로세스도 바로 끝난다
+        with self.profiler.span('convert', file=os.path.basename(file_path)):
+            return self.conversion_cache.convert(file_path, processes)
+
+    def is_ready(self, file_path):
+        future = self._futures.get(file_path)
+        return future is None or future.done()
+
+    def result(self, file_path):
+        """변환된 FBX 경로. 변환 중 발생한 예외는 그대로 다시 발생한다"""
+        future = self._futures.pop(file_path, None)
+        if future is None:
+            future = self.submit(file_path)
+            self._futures.pop(file_path, None)
+        return future.result()
+
+    def shutdown(self):
+        """기다리는 변환은 취소하고 실행 중인 컨버터 프로세스는 끝낸다"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._processes.terminate()
+        self._processes = ProcessGroup()
+        self._futures.clear()
@@ -0,0 +1,122 @@
+import os
+import time
+import hashlib
+import tempfile
+import threading
+
+def file_digest(path, digest=None):
+    """path의 내용을 digest(기본 sha256)에 넣어 반환한다"""
+    if digest is None:
+        digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest
+
+def file_hash(path):
+    return file_digest(path).hexdigest()
+
+def atomic_write(path, write, suffix='.partial'):
+    """
+    write(임시 경로)로 같은 디렉토리의 임시 파일에 쓰고 path로 교체한다.
+    쓰다가 실패하거나 중단되어도 반쪽짜리 파일이 path에 남지 않고, 다른 프로세스는 완성된 파일만 읽는다
+    """
+    fd, partial_path = tempfile.mkstemp(suffix=suffix, dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        write(partial_path)
+        os.replace(partial_path, path)
+    except BaseException:
+        try:
+            os.unlink(partial_path)
+        except OSError:
+            pass
+        raise
+
+# 이보다 오래된 partial 파일은 중간에 종료된 쓰기가 남긴 것으로 보고 지운다
+STALE_PARTIAL_SECONDS = 60 * 60
+
+def evict_lru(directory, max_bytes, partial_suffixes=('.partial',), keep=()):
+    """
+    directory 아래(하위 디렉토리 포함) 파일의 크기 합이 max_bytes 이하가 될 때까지 mtime이 오래된 것부터 지운다.
+    캐시에서 꺼낼 때 os.utime으로 mtime을 갱신해 두면 LRU 순서가 된다.
+    partial_suffixes로 끝나는 파일은 세지 않고, STALE_PARTIAL_SECONDS보다 오래되었으면 지운다.
+    keep의 경로와 비게 된 하위 디렉토리는 남긴다
+    """
+    entries = []
+    total = 0
+    stale_before = time.time() - STALE_PARTIAL_SECONDS
+    pending = [directory]
+    while pending:
+        try:
+            it = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if entry.name.endswith(partial_suffixes):
+                    # 다른 스레드가 쓰는 중인 partial 파일은 이미 교체되었을 수도 있다
+                    if stat.st_mtime < stale_before:
+                        _unlink(entry.path)
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        if path in keep:
+            continue
+        if _unlink(path):
+            total -= size
+    return total
+
+def touch(path):
+    """LRU 순서를 위해 캐시 항목을 쓴 시각을 기록한다"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+        return True
+    except OSError:
+        return False
+
+class EvictionBudget:
+    """
+    캐시에 쓴 양을 세다가 max_bytes의 1/8을 쓸 때마다(그리고 처음 쓸 때) evict_lru를 돌린다.
+    작은 파일을 많이 쓰는 캐시가 쓸 때마다 디렉토리 전체를 훑지 않게 한다. 여러 스레드에서 불러도 된다
+    """
+
+    def __init__(self, directory, max_bytes, partial_suffixes=('.partial',)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.partial_suffixes = partial_suffixes
+        self._lock = threading.Lock()
+        self._written = None
+
+    def wrote(self, *paths, keep=()):
+        """paths를 캐시에 썼다. 필요하면 paths와 keep을 남기고 오래된 항목을 지운다"""
+        size = 0
+        for path in paths:
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        with self._lock:
+            if self._written is not None and self._written + size < self.max_bytes // 8:
+                self._written += size
+                return
+            self._written = 0
+        evict_lru(self.directory, self.max_bytes, self.partial_suffixes, keep=set(paths).union(keep))
@@ -0,0 +1,186 @@
+import zlib
+import math
+import struct
+import numpy as np
+from collections import namedtuple
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# IHDR color type
+COLOR_TYPE_GRAY = 0
+COLOR_TYPE_RGB = 2
+COLOR_TYPE_PALETTE = 3
+COLOR_TYPE_GRAY_ALPHA = 4
+COLOR_TYPE_RGBA = 6
+
+PngHeader = namedtuple('PngHeader', ['width', 'height', 'bit_depth', 'color_type', 'interlace'])
+
+def read_png_header(path):
+    """PNG 파일의 IHDR만 읽는다. PNG가 아니거나 읽을 수 없으면 None"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read(33)
+    except OSError:
+        return None
+
+    if len(data) < 33 or data[:8] != PNG_SIGNATURE or data[12:16] != b'IHDR':
+        return None
+
+    width, height, bit_depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', data[16:29])
+    return PngHeader(width, height, bit_depth, color_type, interlace)
+
+def is_grayscale_png(path):
+    """파일 자체가 흑백(gray, gray+alpha)으로 저장되어 있으면 True"""
+    header = read_png_header(path)
+    return header is not None and header.color_type in (COLOR_TYPE_GRAY, COLOR_TYPE_GRAY_ALPHA)
+
+# 한 픽셀의 채널 수
+CHANNELS = {
+    COLOR_TYPE_GRAY: 1,
+    COLOR_TYPE_RGB: 3,
+    COLOR_TYPE_GRAY_ALPHA: 2,
+    COLOR_TYPE_RGBA: 4,
+}
+
+FILTER_NONE, FILTER_SUB, FILTER_UP, FILTER_AVERAGE, FILTER_PAETH = range(5)
+
+def _read_idat(path):
+    """IHDR와 이어붙인 IDAT 데이터"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:8] != PNG_SIGNATURE:
+        return None, None
+
+    header = None
+    idat = []
+    offset = 8
+    while offset + 8 <= len(data):
+        length, chunk_type = struct.unpack('>I4s', data[offset:offset + 8])
+        body = data[offset + 8:offset + 8 + length]
+        if chunk_type == b'IHDR':
+            header = PngHeader(*struct.unpack('>IIBBBBB', body[:13])[:4], body[12])
+        elif chunk_type == b'IDAT':
+            idat.append(body)
+        elif chunk_type == b'IEND':
+            break
+        offset += 12 + length
+
+    if header is None or not idat:
+        return None, None
+    return header, zlib.decompress(b''.join(idat))
+
+# 블록마다 기울인 int16 배열 ((block_rows + width) x block_rows x channels)을 두 개 쓰므로
+# 블록 행 수를 이 값 수 안에 들도록 정한다. 작업 메모리는 이미지 모양과 상관없이 이 크기로 묶인다
+UNFILTER_BLOCK_VALUES = 1 << 22
+
+def _unfilter(raw, height, width, channels):
+    """
+    scanline filter를 되돌린다.
+    행 블록 단위로 처리하고 블록마다 바로 앞 블록의 마지막 행을 위쪽 이웃으로 넘긴다.
+    """
+    stride = width * channels
+    rows = np.frombuffer(raw, dtype=np.uint8, count=height * (stride + 1)).reshape(height, stride + 1)
+    filters = rows[:, 0]
+    if filters.max(initial=0) > FILTER_PAETH:
+        raise ValueError('unknown PNG filter type')
+    data = rows[:, 1:].reshape(height, width, channels)
+
+    out = np.empty((height, width, channels), dtype=np.uint8)
+    block_rows = _block_rows(width, channels)
+    previous = np.zeros((width, channels), dtype=np.uint8)
+    for y0 in range(0, height, block_rows):
+        y1 = min(height, y0 + block_rows)
+        if np.any(filters[y0:y1] >= FILTER_AVERAGE):
+            out[y0:y1] = _unfilter_diagonal(data[y0:y1], filters[y0:y1], previous)
+        else:
+            _unfilter_rows(data[y0:y1], filters[y0:y1], previous, out[y0:y1])
+        previous = out[y1 - 1]
+    return out
+
+def _block_rows(width, channels):
+    """(rows + width) * rows * channels <= UNFILTER_BLOCK_VALUES인 가장 큰 rows (최소 1)"""
+    budget = UNFILTER_BLOCK_VALUES // channels
+    rows = (math.isqrt(width * width + 4 * budget) - width) // 2
+    return max(1, rows)
+
+def _unfilter_rows(data, filters, previous, out):
+    """None/Sub/Up만 있는 행은 한 행씩 되돌린다"""
+    for y in range(len(data)):
+        row = data[y]
+        if filters[y] == FILTER_SUB:
+            row = np.cumsum(row, axis=0, dtype=np.uint8)
+        elif filters[y] == FILTER_UP:
+            row = row + previous
+        out[y] = row
+        previous = out[y]
+
+def _unfilter_diagonal(data, filters, previous):
+    """
+    Average/Paeth는 왼쪽, 위, 왼쪽 위 픽셀에 의존하므로 같은 대각선(row + col)의
+    픽셀끼리는 서로 독립이다. 대각선 단위로 한 번에 계산한다.
+    previous는 블록 바로 위의 행(첫 블록이면 0)이다.
+    """
+    height, width, channels = data.shape
+    # 대각선 d = y + x가 연속된 행이 되도록 기울여 둔다. 픽셀 (y, x)는 skewed[d + 2, y + 1]이고
+    # 앞의 두 행은 패딩(0), 0번 열은 위쪽 행 (-1, x)를 skewed[x + 1, 0]에 둔다
+    ys = np.arange(height, dtype=np.int32)[:, None]
+    xs = np.arange(width, dtype=np.int32)[None, :]
+    diagonals = ys + xs
+    skewed_data = np.zeros((height + width, height, channels), dtype=np.int16)
+    skewed_data[diagonals, ys] = data
+    skewed = np.zeros((height + width + 1, height + 1, channels), dtype=np.int16)
+    skewed[1:width + 1, 0] = previous
+
+    # None/Sub/Up은 쓰지 않는 이웃을 0으로 두면 Paeth 예측값과 같다
+    use_a = np.isin(filters, (FILTER_SUB, FILTER_AVERAGE, FILTER_PAETH)).astype(np.int16)[:, None]
+    use_b = np.isin(filters, (FILTER_UP, FILTER_AVERAGE, FILTER_PAETH)).astype(np.int16)[:, None]
+    use_c = (filters == FILTER_PAETH).astype(np.int16)[:, None]
+    average = (filters == FILTER_AVERAGE)[:, None]
+    for d in range(height + width - 1):
+        y0, y1 = max(0, d - width + 1), min(height, d + 1)
+        a = skewed[d + 1, y0 + 1:y1 + 1] * use_a[y0:y1]
+        b = skewed[d + 1, y0:y1] * use_b[y0:y1]
+        c = skewed[d, y0:y1] * use_c[y0:y1]
+
+        p = a + b - c
+        pa = np.abs(p - a)
+        pb = np.abs(p - b)
+        pc = np.abs(p - c)
+        predictor = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+        predictor = np.where(average[y0:y1], (a + b) >> 1, predictor)
+        skewed[d + 2, y0 + 1:y1 + 1] = (skewed_data[d, y0:y1] + predictor) & 0xFF
+    return skewed[diagonals + 2, ys + 1].astype(np.uint8)
+
+def decode_png_texels(path):
+    """
+    8-bit, 비인터레이스 PNG를 파일 순서(위 행부터)의 (height, width, channels) uint8 배열로 디코딩한다.
+    지원하지 않는 형식(팔레트, 16-bit, 인터레이스)이거나 읽을 수 없으면 None
+    """
+    try:
+        header, raw = _read_idat(path)
+    except (OSError, ValueError, struct.error, zlib.error):
+        return None
+    if header is None or header.bit_depth != 8 or header.interlace or header.color_type not in CHANNELS:
+        return None
+
+    try:
+        return _unfilter(raw, header.height, header.width, CHANNELS[header.color_type])
+    except ValueError:
+        return None
+
+def encode_png(path, texels, level=6):
+    """(height, width, channels) uint8 배열을 filter 없는 PNG로 저장한다. channels에 따라 gray/RGB/RGBA"""
+    height, width, channels = texels.shape
+    color_type = next(color_type for color_type, count in CHANNELS.items() if count == channels)
+    rows = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    rows[:, 1:] = texels.reshape(height, -1)
+
+    def chunk(kind, body):
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0)
+    with open(path, 'wb') as f:
+        f.write(PNG_SIGNATURE)
+        f.write(chunk(b'IHDR', header))
+        f.write(chunk(b'IDAT', zlib.compress(rows.tobytes(), level)))
+        f.write(chunk(b'IEND', b''))
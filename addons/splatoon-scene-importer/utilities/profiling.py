@@ -0,0 +1,192 @@
+import os
+import sys
+import json
+import time
+import threading
+
+class Profiler:
+    """
+    임포트 단계별 시간을 모으는 프로파일러.
+    span은 Chrome trace의 complete event(ph 'X')로, sample은 counter event(ph 'C')로 남는다.
+    chrome://tracing 또는 Perfetto에서 write()한 파일을 열 수 있다.
+
+    플래너, 변환, 디코딩 스레드에서도 호출되므로 기록은 lock으로 보호한다.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._events = []
+        # 단계 이름 -> [호출 수, 총 시간]
+        self._stages = {}
+        self.peak_rss = 0
+
+    def span(self, name, **args):
+        return _Span(self, name, args)
+
+    def record(self, name, started, ended, **args):
+        """perf_counter 기준 started ~ ended 구간을 name 단계로 기록한다"""
+        event = {
+            'name': name,
+            'ph': 'X',
+            'ts': round((started - self._origin) * 1e6, 1),
+            'dur': round((ended - started) * 1e6, 1),
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+        }
+        if args:
+            event['args'] = args
+
+        with self._lock:
+            self._events.append(event)
+            stage = self._stages.setdefault(name, [0, 0.0])
+            stage[0] += 1
+            stage[1] += ended - started
+
+    def sample(self, name, **counters):
+        """datablock 수 같은 값을 현재 시각의 counter로 기록한다. 피크 RSS도 함께 남긴다"""
+        rss = peak_rss()
+        if rss is not None:
+            self.peak_rss = max(self.peak_rss, rss)
+            counters['peak_rss_mb'] = round(rss / (1024 * 1024), 1)
+
+        event = {
+            'name': name,
+            'ph': 'C',
+            'ts': round((time.perf_counter() - self._origin) * 1e6, 1),
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': counters,
+        }
+        with self._lock:
+            self._events.append(event)
+
+    def stages(self):
+        """[(단계 이름, 호출 수, 총 시간)]을 총 시간이 긴 순서로"""
+        with self._lock:
+            items = [(name, count, total) for name, (count, total) in self._stages.items()]
+        return sorted(items, key=lambda item: item[2], reverse=True)
+
+    def summary(self, top=5):
+        parts = [f"{name} {total:.2f}s/{count}" for name, count, total in self.stages()[:top]]
+        text = "Top stages: " + (', '.join(parts) if parts else 'none')
+        if self.peak_rss:
+            text += f" | Peak RSS: {self.peak_rss / (1024 * 1024):.0f} MB"
+        return text
+
+    def write(self, path):
+        """Chrome trace 형식의 JSON을 쓴다. 단계별 합계는 otherData에 넣는다"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            events = list(self._events)
+        data = {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'stages': [
+                    {'name': name, 'count': count, 'seconds': round(total, 6)}
+                    for name, count, total in self.stages()
+                ],
+                'peak_rss_bytes': self.peak_rss or None,
+            },
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        return path
+
+class NullProfiler:
+    """프로파일링을 끈 상태. 모든 호출이 아무것도 하지 않는다"""
+
+    enabled = False
+    peak_rss = 0
+
+    def span(self, name, **args):
+        return _NULL_SPAN
+
+    def record(self, name, started, ended, **args):
+        pass
+
+    def sample(self, name, **counters):
+        pass
+
+    def stages(self):
+        return []
+
+    def summary(self, top=5):
+        return ''
+
+    def write(self, path):
+        return None
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'args', 'started')
+
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.started, time.perf_counter(), **self.args)
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+NULL_PROFILER = NullProfiler()
+
+def peak_rss():
+    """프로세스의 피크 RSS(바이트). 얻을 수 없으면 None"""
+    if os.name == 'nt':
+        return _peak_rss_windows()
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def _peak_rss_windows():
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD),
+            ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t),
+            ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t),
+            ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    try:
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+    except (AttributeError, OSError):
+        return None
+    return counters.PeakWorkingSetSize
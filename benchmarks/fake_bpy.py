@@ -0,0 +1,663 @@
+"""
+벤치마크용 메모리 내 bpy 대역.
+
+머티리얼 파이프라인(Queueing, MaterialProcessor, ImageCache, node_groups)이 쓰는
+bpy.data, bpy.context, bpy.ops, bpy.path만 흉내낸다. install()이 sys.modules['bpy']에 넣는다.
+Blender와 결과를 비교하려는 것이 아니라 파이썬 쪽 비용을 재기 위한 것이다.
+"""
+
+import os
+import sys
+import types
+from collections import Counter
+
+# 만든 datablock, 노드, 링크 수. 벤치마크가 할당 수로 보고한다
+allocations = Counter()
+
+# 노드 타입 -> (type, 입력 소켓, 출력 소켓)
+NODE_TYPES = {
+    'ShaderNodeBsdfPrincipled': (
+        'BSDF_PRINCIPLED',
+        ['Base Color', 'Metallic', 'Roughness', 'IOR', 'Alpha', 'Normal', 'Emission Color', 'Emission Strength'],
+        ['BSDF'],
+    ),
+    'ShaderNodeOutputMaterial': ('OUTPUT_MATERIAL', ['Surface', 'Volume', 'Displacement'], []),
+    'ShaderNodeTexImage': ('TEX_IMAGE', ['Vector'], ['Color', 'Alpha']),
+    'ShaderNodeMixRGB': ('MIX_RGB', ['Fac', 'Color1', 'Color2'], ['Color']),
+    'ShaderNodeNormalMap': ('NORMAL_MAP', ['Strength', 'Color'], ['Normal']),
+    'ShaderNodeInvert': ('INVERT', ['Fac', 'Color'], ['Color']),
+    'ShaderNodeSeparateColor': ('SEPARATE_COLOR', ['Color'], ['Red', 'Green', 'Blue']),
+    'ShaderNodeBsdfDiffuse': ('BSDF_DIFFUSE', ['Color', 'Roughness', 'Normal'], ['BSDF']),
+    'ShaderNodeAddShader': ('ADD_SHADER', ['Shader', 'Shader'], ['Shader']),
+    'ShaderNodeMixShader': ('MIX_SHADER', ['Fac', 'Shader', 'Shader'], ['Shader']),
+    'ShaderNodeRGB': ('RGB', [], ['Color']),
+    'ShaderNodeNewGeometry': ('NEW_GEOMETRY', [], ['Position', 'Normal', 'Tangent']),
+    'ShaderNodeGroup': ('GROUP', [], []),
+    'NodeGroupInput': ('GROUP_INPUT', [], []),
+    'NodeGroupOutput': ('GROUP_OUTPUT', [], []),
+}
+
+def _unique_name(existing, name):
+    if name not in existing:
+        return name
+    index = 1
+    while f'{name}.{index:03d}' in existing:
+        index += 1
+    return f'{name}.{index:03d}'
+
+class Vector(tuple):
+    @property
+    def x(self):
+        return self[0]
+
+    @property
+    def y(self):
+        return self[1]
+
+class _Collection:
+    """이름으로도, 번호로도 찾을 수 있는 목록"""
+
+    def __init__(self):
+        self._items = []
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, slice)):
+            return self._items[key]
+        for item in self._items:
+            if item.name == key:
+                return item
+        raise KeyError(key)
+
+    def get(self, name, default=None):
+        for item in self._items:
+            if item.name == name:
+                return item
+        return default
+
+    def _names(self):
+        return {item.name for item in self._items}
+
+class _IDCollection(_Collection):
+    def __init__(self, factory):
+        super().__init__()
+        self._factory = factory
+        self._by_name = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._items[key]
+        return self._by_name[key]
+
+    def get(self, name, default=None):
+        return self._by_name.get(name, default)
+
+    def _add(self, item, name):
+        item.name = _unique_name(self._by_name, name)
+        self._items.append(item)
+        self._by_name[item.name] = item
+        allocations[type(item).__name__] += 1
+        return item
+
+    def new(self, name, *args, **kwargs):
+        return self._add(self._factory(*args, **kwargs), name)
+
+    def remove(self, item, do_unlink=True):
+        self._items.remove(item)
+        del self._by_name[item.name]
+        release = getattr(item, '_release', None)
+        if release is not None:
+            release()
+
+    def clear(self):
+        self._items.clear()
+        self._by_name.clear()
+
+def _retarget(old, new):
+    """
+    참조를 old에서 new로 옮기며 users를 센다.
+    Blender도 users를 datablock에 저장해 두므로 읽을 때 bpy.data를 훑지 않는다
+    """
+    if old is not None:
+        old._users -= 1
+    if new is not None:
+        new._users += 1
+
+# --- nodes ---
+
+class Link:
+    __slots__ = ('from_node', 'from_socket', 'to_node', 'to_socket')
+
+    def __init__(self, from_socket, to_socket):
+        self.from_node = from_socket.node
+        self.from_socket = from_socket
+        self.to_node = to_socket.node
+        self.to_socket = to_socket
+
+class Socket:
+    __slots__ = ('node', 'name', 'identifier', 'is_output', 'links', 'default_value')
+
+    def __init__(self, node, name, is_output, default_value=0.0):
+        self.node = node
+        self.name = name
+        self.identifier = name
+        self.is_output = is_output
+        self.links = []
+        self.default_value = default_value
+
+    @property
+    def is_linked(self):
+        return bool(self.links)
+
+class _Sockets(_Collection):
+    def __init__(self, node, names, is_output):
+        super().__init__()
+        self._items = [Socket(node, name, is_output) for name in names]
+
+class Node:
+    def __init__(self, tree, bl_idname):
+        node_type, inputs, outputs = NODE_TYPES[bl_idname]
+        self.id_data = tree
+        self.bl_idname = bl_idname
+        self.type = node_type
+        self.name = ''
+        self.label = ''
+        self.hide = False
+        self.location = Vector((0.0, 0.0))
+        self.image = None
+        self.blend_type = 'MIX'
+        self._node_tree = None
+        self.inputs = _Sockets(self, inputs, False)
+        self.outputs = _Sockets(self, outputs, True)
+
+        # 그룹 입출력 노드의 소켓은 인터페이스를 따른다
+        if node_type == 'GROUP_INPUT':
+            self.outputs = _Sockets(self, tree.interface.names('INPUT'), True)
+        elif node_type == 'GROUP_OUTPUT':
+            self.inputs = _Sockets(self, tree.interface.names('OUTPUT'), False)
+
+    def __setattr__(self, name, value):
+        if name == 'location':
+            value = Vector(value)
+        if name == 'image':
+            _retarget(self.__dict__.get('image'), value)
+        object.__setattr__(self, name, value)
+
+    @property
+    def node_tree(self):
+        return self._node_tree
+
+    @node_tree.setter
+    def node_tree(self, group):
+        self._node_tree = group
+        self.inputs = _Sockets(self, group.interface.names('INPUT'), False)
+        self.outputs = _Sockets(self, group.interface.names('OUTPUT'), True)
+
+class Nodes(_Collection):
+    def __init__(self, tree):
+        super().__init__()
+        self._tree = tree
+
+    def new(self, type):
+        node = Node(self._tree, type)
+        node.name = _unique_name(self._names(), type.replace('ShaderNode', ''))
+        self._items.append(node)
+        allocations['Node'] += 1
+        return node
+
+    def find(self, name):
+        for index, node in enumerate(self._items):
+            if node.name == name:
+                return index
+        return -1
+
+    def foreach_get(self, attr, values):
+        if attr == 'location':
+            values[:] = [value for node in self._items for value in node.location]
+        else:
+            values[:] = [getattr(node, attr) for node in self._items]
+
+    def foreach_set(self, attr, values):
+        if attr == 'location':
+            for index, node in enumerate(self._items):
+                node.location = values[index * 2:index * 2 + 2]
+        else:
+            for node, value in zip(self._items, values):
+                setattr(node, attr, value)
+
+    def remove(self, node):
+        for socket in list(node.inputs) + list(node.outputs):
+            for link in list(socket.links):
+                self._tree.links.remove(link)
+        self._items.remove(node)
+        _retarget(node.image, None)
+
+class Links(_Collection):
+    def new(self, from_socket, to_socket, verify_limits=True):
+        # 입력 소켓에는 링크가 하나뿐이다. verify_limits=False면 Blender처럼 기존 링크를 지우지 않는다
+        if verify_limits:
+            for link in list(to_socket.links):
+                self.remove(link)
+        link = Link(from_socket, to_socket)
+        from_socket.links.append(link)
+        to_socket.links.append(link)
+        self._items.append(link)
+        allocations['Link'] += 1
+        return link
+
+    def remove(self, link):
+        link.from_socket.links.remove(link)
+        link.to_socket.links.remove(link)
+        self._items.remove(link)
+
+    def clear(self):
+        for link in list(self._items):
+            self.remove(link)
+
+class _InterfaceSocket:
+    def __init__(self, name, in_out, socket_type):
+        self.name = name
+        self.in_out = in_out
+        self.socket_type = socket_type
+        self.default_value = None
+        self.min_value = None
+        self.max_value = None
+
+class Interface:
+    def __init__(self):
+        self.items_tree = []
+
+    def new_socket(self, name, in_out='INPUT', socket_type='NodeSocketFloat'):
+        socket = _InterfaceSocket(name, in_out, socket_type)
+        self.items_tree.append(socket)
+        return socket
+
+    def names(self, in_out):
+        return [socket.name for socket in self.items_tree if socket.in_out == in_out]
+
+class NodeTree:
+    def __init__(self, bl_idname='ShaderNodeTree'):
+        self.name = ''
+        self.bl_idname = bl_idname
+        self.interface = Interface()
+        self.nodes = Nodes(self)
+        self.links = Links()
+        self._properties = {}
+
+    def __getitem__(self, key):
+        return self._properties[key]
+
+    def __setitem__(self, key, value):
+        self._properties[key] = value
+
+    def get(self, key, default=None):
+        return self._properties.get(key, default)
+
+    def _release(self):
+        for node in self.nodes:
+            _retarget(node.image, None)
+
+# --- datablocks ---
+
+class ColorManagedInputColorspaceSettings:
+    def __init__(self):
+        self.name = 'sRGB'
+
+class Pixels:
+    """image.pixels. 파일 이미지는 처음 읽을 때 디코딩한다"""
+
+    def __init__(self, image):
+        self._image = image
+        self._data = None
+
+    def _load(self):
+        import numpy as np
+
+        if self._data is None:
+            image = self._image
+            decoded = None
+            if image.source == 'FILE' and image.filepath and image._decode is not None:
+                decoded = image._decode(image.filepath)
+            if decoded is not None:
+                self._data = decoded[2]
+            else:
+                self._data = np.zeros(image.size[0] * image.size[1] * image.channels, dtype=np.float32)
+        return self._data
+
+    def __len__(self):
+        return self._image.size[0] * self._image.size[1] * self._image.channels
+
+    def foreach_get(self, buffer):
+        buffer[:] = self._load()
+
+    def foreach_set(self, values):
+        import numpy as np
+
+        self._data = np.array(values, dtype=np.float32)
+
+class Image:
+    # 파일 이미지를 디코딩하는 함수 (path -> (width, height, pixels) 또는 None)
+    _decode = None
+    _users = 0
+
+    def __init__(self, width=0, height=0, alpha=True, source='GENERATED', filepath=''):
+        self.name = ''
+        self.size = (width, height)
+        self.channels = 4
+        self.source = source
+        self.filepath = filepath
+        self.file_format = 'PNG'
+        self.colorspace_settings = ColorManagedInputColorspaceSettings()
+        self.pixels = Pixels(self)
+        self.is_float = False
+        self._properties = {}
+
+    def __contains__(self, key):
+        return key in self._properties
+
+    def __getitem__(self, key):
+        return self._properties[key]
+
+    def __setitem__(self, key, value):
+        self._properties[key] = value
+
+    def __delitem__(self, key):
+        del self._properties[key]
+
+    def reload(self):
+        self.pixels._data = None
+
+    @property
+    def has_data(self):
+        return self.pixels._data is not None
+
+    @property
+    def users(self):
+        return self._users
+
+    @property
+    def filepath_raw(self):
+        return self.filepath
+
+    @filepath_raw.setter
+    def filepath_raw(self, value):
+        self.filepath = value
+
+class Images(_IDCollection):
+    def __init__(self):
+        super().__init__(Image)
+
+    def new(self, name, width, height, alpha=False, float_buffer=False):
+        return self._add(Image(width, height, alpha), name)
+
+    def load(self, filepath, check_existing=False):
+        from_header = _png_size(filepath)
+        if from_header is None:
+            raise RuntimeError(f'Error: Cannot read image file "{filepath}"')
+        image = Image(*from_header, source='FILE', filepath=filepath)
+        return self._add(image, os.path.basename(filepath))
+
+class Material:
+    _users = 0
+
+    def __init__(self):
+        self.name = ''
+        self.use_nodes = True
+        self.blend_method = 'OPAQUE'
+        self.node_tree = NodeTree()
+
+    @property
+    def users(self):
+        return self._users
+
+    def _release(self):
+        self.node_tree._release()
+
+class MaterialSlot:
+    def __init__(self, material):
+        self._material = None
+        self.material = material
+
+    @property
+    def material(self):
+        return self._material
+
+    @material.setter
+    def material(self, material):
+        _retarget(self._material, material)
+        self._material = material
+
+class Object:
+    def __init__(self, object_type='MESH', data_block=None):
+        self.name = ''
+        self.type = object_type
+        self._data = None
+        self.data = data_block
+        self.scale = (1.0, 1.0, 1.0)
+        self.material_slots = []
+        self._selected = False
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data_block):
+        _retarget(self._data, data_block)
+        self._data = data_block
+
+    def select_set(self, state):
+        self._selected = state
+
+    def _release(self):
+        self.data = None
+        for slot in self.material_slots:
+            slot.material = None
+
+class Mesh:
+    _users = 0
+
+    def __init__(self):
+        self.name = ''
+        self.vertices = []
+        self.edges = []
+        self.loops = []
+        self.polygons = []
+
+    @property
+    def users(self):
+        return self._users
+
+class _CollectionObjects(_Collection):
+    def link(self, obj):
+        self._items.append(obj)
+
+    def unlink(self, obj):
+        self._items.remove(obj)
+
+class _CollectionChildren(_Collection):
+    def link(self, collection):
+        self._items.append(collection)
+
+class Collection:
+    def __init__(self):
+        self.name = ''
+        self.objects = _CollectionObjects()
+        self.children = _CollectionChildren()
+        self.hide_viewport = False
+
+    @property
+    def all_objects(self):
+        objects = list(self.objects)
+        for child in self.children:
+            objects += child.all_objects
+        return objects
+
+    def visible_objects(self):
+        if self.hide_viewport:
+            return []
+        objects = list(self.objects)
+        for child in self.children:
+            objects += child.visible_objects()
+        return objects
+
+class BlendData:
+    def __init__(self):
+        self.materials = _IDCollection(Material)
+        self.images = Images()
+        self.node_groups = _IDCollection(NodeTree)
+        self.objects = _IDCollection(Object)
+        self.meshes = _IDCollection(Mesh)
+        self.collections = _IDCollection(Collection)
+        self.armatures = _IDCollection(Mesh)
+
+    def clear(self):
+        for collection in (self.materials, self.images, self.node_groups, self.objects, self.meshes, self.collections,
+                           self.armatures):
+            collection.clear()
+
+# --- context / ops ---
+
+class Scene:
+    def __init__(self):
+        self.is_apply_second_shader = True
+        self.shader_mix_style = 'COLOR'
+        self.node_layout_splatoon_scene_importer = 'EXPANDED'
+        self.dae_import_method_splatoon_scene_importer = 'NATIVE'
+        self.is_scale_armature_splatoon_scene_importer = False
+        self.scale_value_splatoon_scene_importer = 1.0
+        self.frame_budget_splatoon_scene_importer = 50
+        # fake mesh에는 geometry가 없으므로 mesh 공유는 재지 않는다
+        self.is_share_meshes_splatoon_scene_importer = False
+        self.is_profile_splatoon_scene_importer = False
+        self.profile_path_splatoon_scene_importer = ''
+        self.is_bulk_import_splatoon_scene_importer = False
+        self.is_pack_channels_splatoon_scene_importer = False
+        self.texture_size_splatoon_scene_importer = 'FULL'
+        self.suffix_aliases_splatoon_scene_importer = ''
+        self.is_texture_inventory_splatoon_scene_importer = False
+        self.collection = Collection()
+        self._properties = {}
+
+    def __getitem__(self, key):
+        return self._properties[key]
+
+    def __setitem__(self, key, value):
+        self._properties[key] = value
+
+    def get(self, key, default=None):
+        return self._properties.get(key, default)
+
+class LayerCollection:
+    def __init__(self, collection):
+        self.collection = collection
+
+    @property
+    def name(self):
+        return self.collection.name
+
+    @property
+    def children(self):
+        children = _Collection()
+        children._items = [LayerCollection(child) for child in self.collection.children]
+        return children
+
+    def __eq__(self, other):
+        return isinstance(other, LayerCollection) and other.collection is self.collection
+
+class ViewLayer:
+    def __init__(self, scene):
+        self.scene = scene
+        self.layer_collection = LayerCollection(scene.collection)
+        self.active_layer_collection = self.layer_collection
+
+    def update(self):
+        # depsgraph가 평가할 오브젝트 수. viewport에서 끈 컬렉션은 평가하지 않는다
+        allocations['evaluated_objects'] += len(self.scene.collection.visible_objects())
+
+class Context:
+    def __init__(self):
+        self.scene = Scene()
+        self.view_layer = ViewLayer(self.scene)
+
+    @property
+    def collection(self):
+        return self.view_layer.active_layer_collection.collection
+
+    @property
+    def selected_objects(self):
+        return [obj for obj in self.scene.collection.all_objects if obj._selected]
+
+class _ImportScene:
+    # 파일 경로 -> 임포트된 오브젝트를 만드는 함수. 벤치마크 fixture가 채운다
+    handlers = {}
+
+    def fbx(self, *args, filepath):
+        # 임포터처럼 active 컬렉션에 넣고 선택한 뒤 view layer를 갱신한다
+        for obj in self.handlers[os.path.abspath(filepath)]():
+            context.collection.objects.link(obj)
+            obj.select_set(True)
+        context.view_layer.update()
+        return {'FINISHED'}
+
+class _ObjectOps:
+    def select_all(self, action='SELECT'):
+        if action == 'DESELECT':
+            objects = context.scene.collection.visible_objects()
+            allocations['select_all_objects'] += len(objects)
+            for obj in objects:
+                obj.select_set(False)
+        return {'FINISHED'}
+
+class _Path:
+    @staticmethod
+    def abspath(path):
+        return path[2:] if path.startswith('//') else path
+
+def _png_size(path):
+    import struct
+
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(24)
+    except OSError:
+        return None
+    if len(header) < 24 or header[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+data = BlendData()
+context = Context()
+ops = types.SimpleNamespace(import_scene=_ImportScene(), object=_ObjectOps())
+path = _Path()
+
+def reset():
+    """새 씬처럼 datablock과 선택을 비운다"""
+    data.clear()
+    context.scene._properties.clear()
+    context.scene.collection = Collection()
+    context.view_layer = ViewLayer(context.scene)
+    _ImportScene.handlers.clear()
+    allocations.clear()
+
+class _Matrix:
+    """collada.builder를 import만 할 수 있게 둔다. 벤치마크는 DAE를 읽지 않는다"""
+
+    def __init__(self, *args, **kwargs):
+        raise NotImplementedError('mathutils is not available in the benchmark')
+
+def install(decode=None):
+    """
+    sys.modules['bpy']를 이 모듈로 바꾼다. decode는 파일 이미지 픽셀을 만드는 함수.
+    mathutils도 import만 되도록 채운다
+    """
+    Image._decode = staticmethod(decode) if decode is not None else None
+    module = sys.modules[__name__]
+    sys.modules['bpy'] = module
+    sys.modules.setdefault('mathutils', types.SimpleNamespace(Matrix=_Matrix, Vector=Vector))
+    return module
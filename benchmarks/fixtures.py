@@ -0,0 +1,151 @@
+"""
+합성 맵 fixture.
+디렉토리마다 머티리얼 base name별 텍스처 세트를 만들고, 파일마다 FBX 임포터가 만들었을
+오브젝트와 머티리얼(principled + _alb 이미지)을 fake_bpy에 등록한다.
+"""
+
+import os
+import zlib
+import struct
+import itertools
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+COLOR_TYPE_GRAY = 0
+COLOR_TYPE_RGB = 2
+COLOR_TYPE_RGBA = 6
+
+# _alb는 항상 있고 나머지 조합을 머티리얼마다 돌아가며 쓴다
+BASE_SUFFIX = '_alb'
+OPTIONAL_SUFFIXES = ['_mtl', '_rgh', '_opa', '_nrm', '_ao', '_tcl', '_emm', '_trm', '_mai', '_thc']
+# 한 채널만 의미가 있는 맵. 흑백 PNG로 만든다
+GRAYSCALE_SUFFIXES = ('_mtl', '_rgh', '_opa', '_ao')
+
+# 모든 선택 suffix 조합, 텍스처 수가 적은 것부터. 머티리얼이 이 수 이상이면 모든 조합이 한 번씩 나온다
+SUFFIX_COMBINATIONS = [
+    combination
+    for count in range(len(OPTIONAL_SUFFIXES) + 1)
+    for combination in itertools.combinations(OPTIONAL_SUFFIXES, count)
+]
+
+def suffix_combinations():
+    """SUFFIX_COMBINATIONS를 끝없이 돌려준다"""
+    return itertools.cycle(SUFFIX_COMBINATIONS)
+
+def write_png(path, pixels, color_type):
+    """filter 0으로 저장하는 간단한 PNG 인코더. pixels는 (height, width, channels) uint8"""
+    height, width = pixels.shape[:2]
+    rows = np.zeros((height, pixels[0].size + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels.reshape(height, -1)
+
+    def chunk(kind, body):
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0)
+    with open(path, 'wb') as f:
+        f.write(PNG_SIGNATURE)
+        f.write(chunk(b'IHDR', header))
+        f.write(chunk(b'IDAT', zlib.compress(rows.tobytes(), 1)))
+        f.write(chunk(b'IEND', b''))
+
+class MapFixture:
+    """
+    directory 아래에 files개의 .fbx 자리표시 파일과 materials개의 텍스처 세트를 만든다.
+    머티리얼은 파일에 고르게 나누고, duplicate_ratio만큼은 다른 파일에서 같은 세트를 다시 쓴다.
+    _emm은 처음 large_emissions개만 emission_size로 만들고 나머지는 texture_size로 만든다.
+    """
+
+    def __init__(self, directory, materials=len(SUFFIX_COMBINATIONS), files=10, texture_size=64, emission_size=1024,
+                 large_emissions=12, duplicate_ratio=0.25, seed=0):
+        self.directory = directory
+        self.material_count = materials
+        self.file_count = files
+        self.texture_size = texture_size
+        self.emission_size = emission_size
+        self.large_emissions = large_emissions
+        self.duplicate_ratio = duplicate_ratio
+        self.random = np.random.default_rng(seed)
+        # base name -> suffix 목록
+        self.texture_sets = {}
+        # 파일 경로 -> base name 목록
+        self.files = {}
+        self.emission_paths = []
+
+    def build(self):
+        os.makedirs(self.directory, exist_ok=True)
+        combinations = suffix_combinations()
+        bases = []
+        for index in range(self.material_count):
+            base = f'Bench_Mat{index:04d}'
+            suffixes = (BASE_SUFFIX,) + next(combinations)
+            for suffix in suffixes:
+                self._write_texture(os.path.join(self.directory, f'{base}{suffix}.png'), suffix, index)
+            self.texture_sets[base] = suffixes
+            bases.append(base)
+
+        per_file = max(1, len(bases) // max(1, self.file_count))
+        duplicates = int(per_file * self.duplicate_ratio)
+        for index in range(self.file_count):
+            file_path = os.path.join(self.directory, f'Bench_Part{index:03d}.fbx')
+            with open(file_path, 'wb'):
+                pass
+            own = bases[index * per_file:(index + 1) * per_file]
+            shared = list(self.random.choice(bases, size=min(duplicates, len(bases)), replace=False))
+            self.files[file_path] = own + shared
+        return self
+
+    def _write_texture(self, path, suffix, index):
+        if suffix == '_emm':
+            size = self.emission_size if len(self.emission_paths) < self.large_emissions else self.texture_size
+            # 흑백 PNG, RGB로 저장된 흑백, 컬러를 번갈아 만든다
+            kind = index % 3
+            value = self.random.integers(0, 256, (size, size, 1), dtype=np.uint8)
+            if kind == 0:
+                write_png(path, value, COLOR_TYPE_GRAY)
+            elif kind == 1:
+                write_png(path, np.repeat(value, 3, axis=2), COLOR_TYPE_RGB)
+            else:
+                write_png(path, self.random.integers(0, 256, (size, size, 3), dtype=np.uint8), COLOR_TYPE_RGB)
+            self.emission_paths.append(path)
+            return
+
+        size = self.texture_size
+        if suffix in GRAYSCALE_SUFFIXES:
+            write_png(path, self.random.integers(0, 256, (size, size, 1), dtype=np.uint8), COLOR_TYPE_GRAY)
+            return
+        write_png(path, self.random.integers(0, 256, (size, size, 4), dtype=np.uint8), COLOR_TYPE_RGBA)
+
+    def register(self, bpy):
+        """각 파일의 임포트 결과를 bpy.ops.import_scene.fbx 핸들러로 등록한다"""
+        for file_path, bases in self.files.items():
+            bpy.ops.import_scene.handlers[os.path.abspath(file_path)] = (
+                lambda bases=bases, file_path=file_path: self.import_objects(bpy, file_path, bases)
+            )
+
+    def import_objects(self, bpy, file_path, bases):
+        objects = []
+        for base in bases:
+            material = new_imported_material(bpy, base, os.path.join(self.directory, f'{base}{BASE_SUFFIX}.png'))
+            mesh = bpy.data.meshes.new(base)
+            obj = bpy.data.objects.new(base, 'MESH', mesh)
+            obj.material_slots.append(bpy.MaterialSlot(material))
+            objects.append(obj)
+        return objects
+
+def new_imported_material(bpy, name, albedo_path, with_alpha=True):
+    """FBX 임포터가 만드는 것처럼 principled BSDF에 _alb 이미지가 연결된 머티리얼"""
+    material = bpy.data.materials.new(name)
+    nodes = material.node_tree.nodes
+    links = material.node_tree.links
+
+    principled = nodes.new('ShaderNodeBsdfPrincipled')
+    principled.location = (10.0, 300.0)
+    output = nodes.new('ShaderNodeOutputMaterial')
+    links.new(principled.outputs['BSDF'], output.inputs['Surface'])
+
+    albedo = nodes.new('ShaderNodeTexImage')
+    albedo.image = bpy.data.images.load(albedo_path)
+    links.new(albedo.outputs['Color'], principled.inputs['Base Color'])
+    if with_alpha:
+        links.new(albedo.outputs['Alpha'], principled.inputs['Alpha'])
+    return material
@@ -0,0 +1,330 @@
+"""
+Offline benchmarks for the material pipeline.
+
+    python benchmarks/run.py [--materials N] [--files F] [--json out.json] [--baseline base.json]
+
+Blender 없이 CPython에서 fake_bpy로 Queueing과 MaterialProcessor를 돌린다.
+합성 맵 fixture에 대해 단계별 처리량(materials/s, textures/s)과 할당 수를 출력하고,
+--baseline 결과보다 --tolerance 이상 느려진 단계가 있으면 종료 코드 1로 끝난다.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import importlib
+import types
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'addons', 'splatoon-scene-importer')
+# 애드온의 __init__은 오퍼레이터를 등록하므로 실행하지 않고 패키지 경로만 잡는다
+ADDON_MODULE = 'splatoon_scene_importer_bench'
+
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+from benchmarks import fake_bpy
+from benchmarks.fixtures import MapFixture, new_imported_material, BASE_SUFFIX, OPTIONAL_SUFFIXES, SUFFIX_COMBINATIONS
+
+def decode_pixels(png, path):
+    """PNG를 Blender image.pixels 순서(아래 행부터)의 RGBA float32로 디코딩한다. 읽지 못하면 None"""
+    texels = png.decode_png_texels(path)
+    if texels is None:
+        return None
+
+    height, width, channels = texels.shape
+    texels = texels[::-1]
+    rgba = np.empty((height, width, 4), dtype=np.float32)
+    rgba[..., :3] = texels[..., :1] if channels <= 2 else texels[..., :3]
+    rgba[..., 3] = texels[..., channels - 1] if channels in (2, 4) else 255
+    rgba *= 1.0 / 255.0
+    return width, height, rgba.reshape(-1)
+
+def load_addon():
+    package = types.ModuleType(ADDON_MODULE)
+    package.__path__ = [ADDON_DIR]
+    sys.modules[ADDON_MODULE] = package
+    png = importlib.import_module(f'{ADDON_MODULE}.utilities.png')
+    fake_bpy.install(decode=lambda path: decode_pixels(png, path))
+    return types.SimpleNamespace(
+        png=png,
+        pixels=importlib.import_module(f'{ADDON_MODULE}.importers.splatoon.pixels'),
+        texture_index=importlib.import_module(f'{ADDON_MODULE}.importers.splatoon.texture_index'),
+        image_cache=importlib.import_module(f'{ADDON_MODULE}.importers.splatoon.image_cache'),
+        graph_builder=importlib.import_module(f'{ADDON_MODULE}.importers.splatoon.graph_builder'),
+        material_plan=importlib.import_module(f'{ADDON_MODULE}.importers.splatoon.material_plan'),
+        channel_pack=importlib.import_module(f'{ADDON_MODULE}.importers.splatoon.channel_pack'),
+        texture_proxy=importlib.import_module(f'{ADDON_MODULE}.importers.splatoon.texture_proxy'),
+        texture_roles=importlib.import_module(f'{ADDON_MODULE}.importers.splatoon.texture_roles'),
+        texture_inventory=importlib.import_module(f'{ADDON_MODULE}.importers.splatoon.texture_inventory'),
+        material_processor=importlib.import_module(f'{ADDON_MODULE}.importers.splatoon.material_processor'),
+        node_groups=importlib.import_module(f'{ADDON_MODULE}.importers.splatoon.node_groups'),
+        queueing=importlib.import_module(f'{ADDON_MODULE}.importers.splatoon.queueing'),
+    )
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Benchmark the material pipeline without Blender.')
+    parser.add_argument('--materials', type=int, default=len(SUFFIX_COMBINATIONS), help='number of synthetic texture sets (default: one per suffix combination)')
+    parser.add_argument('--files', type=int, default=8, help='number of synthetic .fbx files')
+    parser.add_argument('--texture-size', type=int, default=64)
+    parser.add_argument('--emission-size', type=int, default=512, help='size of the large _emm textures')
+    parser.add_argument('--large-emissions', type=int, default=12, help='number of _emm textures made at --emission-size')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case; the fastest is reported')
+    parser.add_argument('--node-layout', choices=['EXPANDED', 'GROUPS'], default='EXPANDED')
+    parser.add_argument('--shader-mix-style', choices=['COLOR', 'SHADE'], default='COLOR')
+    parser.add_argument('--pack-channels', action='store_true', help='merge the grayscale maps into one RGBA image')
+    parser.add_argument('--texture-inventory', action='store_true', help='reuse the cached texture folder inventory')
+    parser.add_argument('--proxy-size', choices=['FULL', '1024', '512', '256'], default='FULL', help='load larger textures as downscaled proxies')
+    parser.add_argument('--case', action='append', help='run only these cases')
+    parser.add_argument('--fixture-dir', help='keep the synthetic map in this directory')
+    parser.add_argument('--json', help='write the results to this path')
+    parser.add_argument('--baseline', help='compare against a previous --json result')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown against --baseline')
+    return parser.parse_args(argv)
+
+def legacy_is_grayscale(pixels):
+    """벡터화 전 MaterialProcessor._is_grayscale_image의 루프"""
+    for i in range(0, len(pixels), 4):
+        r, g, b = pixels[i], pixels[i + 1], pixels[i + 2]
+        if r != g or g != b or b != r:
+            return False
+    return True
+
+class Bench:
+    def __init__(self, addon, fixture, args):
+        self.addon = addon
+        self.fixture = fixture
+        self.args = args
+
+    def reset(self):
+        fake_bpy.reset()
+        scene = fake_bpy.context.scene
+        scene.node_layout_splatoon_scene_importer = self.args.node_layout
+        scene.shader_mix_style = self.args.shader_mix_style
+        scene.is_pack_channels_splatoon_scene_importer = self.args.pack_channels
+        scene.texture_size_splatoon_scene_importer = self.args.proxy_size
+        scene.is_texture_inventory_splatoon_scene_importer = self.args.texture_inventory
+        self.addon.node_groups._session_groups.clear()
+
+    def options(self):
+        scene = fake_bpy.context.scene
+        return self.addon.material_plan.MaterialOptions(
+            apply_second_shader=scene.is_apply_second_shader,
+            shader_mix_style=scene.shader_mix_style,
+            use_node_groups=scene.node_layout_splatoon_scene_importer == 'GROUPS',
+            pack_channels=scene.is_pack_channels_splatoon_scene_importer,
+            texture_size=scene.texture_size_splatoon_scene_importer,
+            suffix_aliases=scene.suffix_aliases_splatoon_scene_importer,
+        )
+
+    def planner(self):
+        packer = self.addon.channel_pack.ChannelPacker() if self.args.pack_channels else None
+        proxies = None
+        if self.args.proxy_size != 'FULL':
+            proxies = self.addon.texture_proxy.TextureProxies(int(self.args.proxy_size))
+        inventory = self.addon.texture_inventory.TextureInventory() if self.args.texture_inventory else None
+        return self.addon.material_plan.MaterialPlanner(
+            self.addon.texture_index.TextureIndex(inventory), channel_packer=packer, texture_proxies=proxies,
+            texture_inventory=inventory,
+        )
+
+    def snapshots(self):
+        materials = [
+            new_imported_material(fake_bpy, base, os.path.join(self.fixture.directory, f'{base}{BASE_SUFFIX}.png'))
+            for base in self.fixture.texture_sets
+        ]
+        MaterialProcessor = self.addon.material_processor.MaterialProcessor
+        return materials, [MaterialProcessor.snapshot(material) for material in materials]
+
+    # 각 case는 setup을 하고 (측정할 함수, 결과 -> 처리량 dict 함수)를 반환한다
+
+    def case_texture_lookup(self):
+        suffixes = [BASE_SUFFIX] + OPTIONAL_SUFFIXES
+        bases = list(self.fixture.texture_sets)
+        directory = self.fixture.directory
+        classifier = self.addon.texture_roles.SuffixClassifier()
+
+        def run():
+            # 플래너처럼 base name마다 한 번 분류해서 모든 suffix를 찾는다
+            index = self.addon.texture_index.TextureIndex()
+            for base in bases:
+                classifier.classify(index, directory, base)
+            return len(bases) * len(suffixes)
+
+        return run, lambda lookups, seconds: {'lookups/s': lookups / seconds}
+
+    def case_grayscale(self):
+        images = [fake_bpy.data.images.load(path) for path in self.fixture.emission_paths]
+        # 디코딩은 재지 않도록 미리 픽셀을 읽어 둔다
+        for image in images:
+            image.pixels._load()
+        texels = sum(image.size[0] * image.size[1] for image in images)
+        # 결과가 바뀌었으면 처리량은 의미가 없으므로 재기 전에 벡터화 전 루프와 비교한다
+        for image in images:
+            expected = legacy_is_grayscale(image.pixels._load().tolist())
+            if self.addon.pixels.is_grayscale_pixels(image) != expected:
+                raise AssertionError(f'is_grayscale_pixels differs from the legacy loop for {image.filepath}')
+
+        def run():
+            for image in images:
+                self.addon.pixels.is_grayscale_pixels(image)
+            return len(images)
+
+        return run, lambda count, seconds: {
+            'textures/s': count / seconds,
+            'megatexels/s': texels / seconds / 1e6,
+        }
+
+    def case_plan(self):
+        _, snapshots = self.snapshots()
+        options = self.options()
+
+        def run():
+            planner = self.planner()
+            plans = planner.plan_all([(snapshot, self.fixture.directory, options) for snapshot in snapshots])
+            if planner.texture_inventory is not None:
+                # 다음 반복은 다시 임포트하는 경우처럼 저장된 inventory를 읽는다
+                planner.texture_inventory.save()
+            return len(plans), sum(len(plan.textures) for plan in plans)
+
+        return run, _material_rates
+
+    def case_build(self, node_graph=None):
+        planner = self.planner()
+        options = self.options()
+        MaterialProcessor = self.addon.material_processor.MaterialProcessor
+        if node_graph is not None:
+            MaterialProcessor = type('MaterialProcessor', (MaterialProcessor,), {'node_graph': node_graph})
+
+        def run():
+            self.reset()
+            materials, snapshots = self.snapshots()
+            plans = planner.plan_all([(snapshot, self.fixture.directory, options) for snapshot in snapshots])
+            image_cache = self.addon.image_cache.ImageCache()
+            for material, plan in zip(materials, plans):
+                MaterialProcessor(material, image_cache).apply(plan)
+            return len(plans), sum(len(plan.textures) for plan in plans)
+
+        return run, _material_rates
+
+    def case_build_batched(self):
+        # build와 같지만 location과 hide를 foreach_set으로 모아 쓰고 소켓을 캐시한다. build와 wall time을 비교한다
+        return self.case_build(node_graph=self.addon.graph_builder.BatchedNodeGraph)
+
+    def case_queueing(self, bulk=False):
+        files = sorted(self.fixture.files)
+
+        def run():
+            self.reset()
+            fake_bpy.context.scene.is_bulk_import_splatoon_scene_importer = bulk
+            self.fixture.register(fake_bpy)
+            queue = self.addon.queueing.Queueing.from_paths(files)
+            try:
+                queue.run_to_completion(poll_interval=0)
+            finally:
+                queue.close()
+            materials = sum(len(bases) for bases in self.fixture.files.values())
+            return materials, queue.image_cache.loads + queue.image_cache.hits
+
+        return run, _material_rates
+
+    def case_queueing_bulk(self):
+        # allocations의 evaluated_objects, select_all_objects를 queueing과 비교한다
+        return self.case_queueing(bulk=True)
+
+    CASES = ['texture_lookup', 'grayscale', 'plan', 'build', 'build_batched', 'queueing', 'queueing_bulk']
+
+    def measure(self, name):
+        self.reset()
+        run, rates = getattr(self, f'case_{name}')()
+
+        best = None
+        result = None
+        for _ in range(max(1, self.args.repeat)):
+            started = time.perf_counter()
+            result = run()
+            seconds = time.perf_counter() - started
+            best = seconds if best is None else min(best, seconds)
+
+        # 할당은 따로 한 번 더 돌려서 잰다 (tracemalloc이 느리게 만들므로)
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        blocks = len(tracemalloc.take_snapshot().traces)
+        tracemalloc.stop()
+
+        return {
+            'seconds': round(best, 6),
+            'rates': {key: round(value, 2) for key, value in rates(result, best).items()},
+            'allocations': {
+                'peak_kib': round(peak / 1024, 1),
+                'live_blocks': blocks,
+                **dict(fake_bpy.allocations),
+            },
+        }
+
+def _material_rates(result, seconds):
+    materials, textures = result
+    return {'materials/s': materials / seconds, 'textures/s': textures / seconds}
+
+def compare(results, baseline, tolerance):
+    """baseline보다 처리량이 tolerance 넘게 떨어진 (case, 지표, 이전, 현재) 목록"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for key, value in result['rates'].items():
+            before = previous['rates'].get(key)
+            if before and value < before * (1 - tolerance):
+                regressions.append((name, key, before, value))
+    return regressions
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    addon = load_addon()
+
+    fixture_dir = args.fixture_dir or tempfile.mkdtemp(prefix='splatoon-bench-')
+    # 묶은 텍스처 같은 디스크 캐시는 fixture 옆에 둔다
+    os.environ.setdefault('SPLATOON_IMPORTER_CACHE_DIR', os.path.join(fixture_dir, 'cache'))
+    try:
+        fixture = MapFixture(
+            fixture_dir,
+            materials=args.materials,
+            files=args.files,
+            texture_size=args.texture_size,
+            emission_size=args.emission_size,
+            large_emissions=args.large_emissions,
+        ).build()
+        if args.materials < len(SUFFIX_COMBINATIONS):
+            print(f'note: {args.materials} materials cover {args.materials} of {len(SUFFIX_COMBINATIONS)} suffix combinations', file=sys.stderr)
+
+        bench = Bench(addon, fixture, args)
+        results = {}
+        for name in args.case or Bench.CASES:
+            results[name] = bench.measure(name)
+            rates = ', '.join(f'{value:,.1f} {key}' for key, value in results[name]['rates'].items())
+            print(f'{name:18s} {results[name]["seconds"] * 1000:9.1f} ms  {rates}')
+    finally:
+        fake_bpy.reset()
+        if not args.fixture_dir:
+            shutil.rmtree(fixture_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, key, before, value in regressions:
+            print(f'REGRESSION {name}: {key} {before:,.1f} -> {value:,.1f}')
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
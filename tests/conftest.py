@@ -0,0 +1,24 @@
+import os
+import sys
+import importlib
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks import fake_bpy
+from benchmarks.run import ADDON_MODULE, load_addon
+
+# 애드온 모듈은 bpy를 import하므로 벤치마크와 같이 fake_bpy를 깔고 불러온다
+ADDON = load_addon()
+
+def addon_module(name):
+    """'utilities.conversion_pool'처럼 애드온 패키지 기준 이름으로 모듈을 불러온다"""
+    return importlib.import_module(f'{ADDON_MODULE}.{name}')
+
+@pytest.fixture
+def addon():
+    return ADDON
+
+@pytest.fixture
+def bpy():
+    fake_bpy.reset()
+    return fake_bpy
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+FBX Converter 대신 쓰는 컨버터. CommandConverter로 `<이 파일> <입력 .dae> <출력 .fbx>`처럼 부른다.
+입력을 그대로 출력에 복사한다. 입력 이름에 'broken'이 있으면 실패하고, 'slow'가 있으면 오래 기다린다
+"""
+
+import sys
+import time
+import shutil
+
+def main(input_path, output_path):
+    print(f'Converting {input_path}', flush=True)
+    if 'broken' in input_path:
+        print('Error: not a COLLADA file', flush=True)
+        return 1
+    if 'slow' in input_path:
+        time.sleep(60)
+    shutil.copyfile(input_path, output_path)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(*sys.argv[1:3]))
@@ -0,0 +1,24 @@
+import os
+from benchmarks.fixtures import MapFixture
+
+def test_fbx_import_sees_visible_staging(addon, bpy, tmp_path):
+    # FBX 임포터는 아마추어를 만들 때 edit mode로 들어가므로 staging이 숨겨져 있으면 안 된다
+    fixture = MapFixture(str(tmp_path), materials=2, files=2, texture_size=8, emission_size=8).build()
+    bpy.context.scene.is_bulk_import_splatoon_scene_importer = True
+    hidden = []
+    for file_path in fixture.files:
+        def import_objects(file_path=file_path):
+            hidden.append(bpy.context.collection.hide_viewport)
+            return fixture.import_objects(bpy, file_path, fixture.files[file_path])
+        bpy.ops.import_scene.handlers[os.path.abspath(file_path)] = import_objects
+
+    queue = addon.queueing.Queueing.from_paths(sorted(fixture.files))
+    try:
+        queue.run_to_completion(poll_interval=0)
+        staging = queue.bulk_import.staging
+        assert staging is None or staging.hide_viewport
+    finally:
+        queue.close()
+
+    assert hidden == [False, False]
+    assert len(bpy.context.scene.collection.all_objects) == sum(len(bases) for bases in fixture.files.values())
@@ -0,0 +1,50 @@
+import types
+import numpy as np
+from conftest import addon_module
+
+builder = addon_module('importers.collada.builder')
+
+def legacy_weights(skin, vertex_count):
+    """joint마다 mask를 만들고 가중치 값마다 add하던 이전 방식이 남기는 최종 가중치"""
+    vertices = np.repeat(np.arange(len(skin.weight_counts), dtype=np.int32), skin.weight_counts)
+    result = {}
+    for joint_index in range(int(skin.weight_joints.max()) + 1):
+        mask = skin.weight_joints == joint_index
+        joint_vertices = vertices[mask]
+        joint_weights = skin.weight_values[mask]
+        for weight in np.unique(joint_weights):
+            indices = joint_vertices[joint_weights == weight]
+            for vertex in indices[indices < vertex_count].tolist():
+                result[joint_index, vertex] = float(weight)
+    return result
+
+def skin(seed, vertices=300, joints=12):
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(0, 5, vertices).astype(np.int32)
+    total = int(counts.sum())
+    # 가중치 값이 겹치도록 몇 단계로만 만든다
+    return types.SimpleNamespace(
+        weight_counts=counts,
+        weight_joints=rng.integers(0, joints, total).astype(np.int32),
+        weight_values=(rng.integers(0, 8, total) / 8).astype(np.float32),
+    )
+
+def test_weight_runs_match_per_joint_adds():
+    for seed in range(5):
+        data = skin(seed)
+        runs = list(builder.weight_runs(data, 280))
+        result = {}
+        for joint, weight, indices in runs:
+            for vertex in indices:
+                result[joint, vertex] = weight
+        assert result == legacy_weights(data, 280)
+        # (joint, 가중치)마다 한 번만 add한다
+        assert len(runs) == len({(joint, weight) for joint, weight, _ in runs})
+
+def test_weight_runs_empty():
+    data = types.SimpleNamespace(
+        weight_counts=np.zeros(3, dtype=np.int32),
+        weight_joints=np.empty(0, dtype=np.int32),
+        weight_values=np.empty(0, dtype=np.float32),
+    )
+    assert list(builder.weight_runs(data, 3)) == []
@@ -0,0 +1,122 @@
+import os
+import numpy as np
+import pytest
+from conftest import addon_module
+
+reader = addon_module('importers.collada.reader')
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skinned_quad.dae')
+
+class Recorder:
+    """ColladaBuilder 대신 handler 호출을 모아 둔다"""
+
+    def __init__(self):
+        self.calls = {}
+
+    def __getattr__(self, name):
+        def record(*args):
+            self.calls.setdefault(name, []).append(args)
+        return record
+
+def read(path):
+    recorder = Recorder()
+    reader.ColladaReader(path).read(recorder)
+    return recorder.calls
+
+def write_variant(tmp_path, old, new):
+    with open(FIXTURE, encoding='utf-8') as f:
+        text = f.read()
+    assert old in text
+    path = tmp_path / 'variant.dae'
+    path.write_text(text.replace(old, new), encoding='utf-8')
+    return str(path)
+
+def test_reads_geometry():
+    calls = read(FIXTURE)
+    (geometry,), = calls['geometry']
+    np.testing.assert_array_equal(geometry.positions, [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]])
+
+    (primitive,) = geometry.primitives
+    assert primitive.material == 'Quad-material-symbol'
+    np.testing.assert_array_equal(primitive.loop_totals, [4])
+    np.testing.assert_array_equal(primitive.vertex_indices, [0, 1, 2, 3])
+    np.testing.assert_array_equal(primitive.normals, [[0, 0, 1]] * 4)
+    np.testing.assert_array_equal(primitive.uvs[0], [[0, 0], [1, 0], [1, 1], [0, 1]])
+    np.testing.assert_array_equal(primitive.uvs[1], [[0.5, 0.5], [1, 0.5], [1, 1], [0.5, 1]])
+
+def test_reads_skin_weights():
+    (skin,), = read(FIXTURE)['controller']
+    assert skin.source == 'Quad-mesh'
+    assert skin.joints == ['Root', 'Tip']
+    assert skin.inverse_bind_matrices.shape == (2, 4, 4)
+    assert skin.inverse_bind_matrices[1, 1, 3] == -1
+    np.testing.assert_array_equal(skin.weight_counts, [1, 1, 2, 2])
+    np.testing.assert_array_equal(skin.weight_joints, [0, 0, 0, 1, 0, 1])
+    np.testing.assert_allclose(skin.weight_values, [1, 1, 0.25, 0.75, 0.25, 0.75])
+
+def test_reads_materials_and_scene():
+    calls = read(FIXTURE)
+    assert calls['asset'] == [('Y_UP', 1.0)]
+    (image_id, image_path), = calls['image']
+    assert image_id == 'Quad_alb'
+    assert image_path == os.path.join(os.path.dirname(FIXTURE), 'Textures', 'Quad_alb.png')
+    assert calls['effect'] == [('Quad-effect', 'Quad_alb')]
+    assert calls['material'] == [('Quad-material', 'Quad', 'Quad-effect')]
+
+    (nodes,), = calls['visual_scene']
+    root, quad = nodes
+    assert root.type == 'JOINT' and root.children[0].name == 'Tip'
+    np.testing.assert_array_equal(root.children[0].matrix[:3, 3], [0, 1, 0])
+    assert quad.controller == 'Quad-skin'
+    assert quad.materials == {'Quad-material-symbol': 'Quad-material'}
+
+@pytest.mark.parametrize('old, new', [
+    # 빠진 source
+    ('source="#Quad-normals" offset="1"', 'source="#Missing" offset="1"'),
+    # 숫자가 아닌 토큰. 예전 NumPy의 fromstring은 여기서 멈추고 잘린 배열을 돌려준다
+    ('0 0 0 1 0 0 1 1 0 0 1 0</float_array>', '0 0 0 1 0 0 1 x 0 0 1 0</float_array>'),
+    # count 속성과 개수가 다른 float_array
+    ('count="3">1 0.25 0.75</float_array>', 'count="4">1 0.25 0.75</float_array>'),
+    # 정수 배열의 소수
+    ('<vcount>1 1 2 2</vcount>', '<vcount>1 1 2 2.5</vcount>'),
+    # accessor count보다 짧은 float_array
+    ('0 0 1 0 1 1 0 1</float_array>', '0 0 1 0 1 1</float_array>'),
+    # 범위를 벗어난 인덱스와 음수 인덱스
+    ('<p>0 0 0 1 0 1 2 0 2 3 0 3</p>', '<p>0 0 0 1 0 1 2 0 2 9 0 3</p>'),
+    ('<p>0 0 0 1 0 1 2 0 2 3 0 3</p>', '<p>0 0 0 1 0 1 2 0 2 -1 0 3</p>'),
+    # offset 개수와 맞지 않는 <p>
+    ('<p>0 0 0 1 0 1 2 0 2 3 0 3</p>', '<p>0 0 0 1 0 1 2 0 2 3 0</p>'),
+    # vcount와 맞지 않는 인덱스 수
+    ('<vcount>4</vcount>', '<vcount>3</vcount>'),
+    ('<v>0 0 0 0 0 1 1 2 0 1 1 2</v>', '<v>0 0 0 0 0 1 1 2 0 1 5 2</v>'),
+    ('<vcount>1 1 2 2</vcount>', '<vcount>1 1 2 3</vcount>'),
+])
+def test_malformed_files_raise_collada_error(tmp_path, old, new):
+    with pytest.raises(reader.ColladaError):
+        read(write_variant(tmp_path, old, new))
+
+def test_truncating_fromstring_is_an_error(monkeypatch):
+    # Blender에 들어 있는 NumPy 1.x는 잘못된 토큰에서 예외 대신 DeprecationWarning을 내고 잘린 배열을 돌려준다
+    import warnings
+    import numpy as np
+
+    def old_fromstring(text, dtype, sep):
+        warnings.warn('string or file could not be read to its end due to unmatched data', DeprecationWarning)
+        return np.zeros(1, dtype=dtype)
+    monkeypatch.setattr(reader.np, 'fromstring', old_fromstring)
+    with pytest.raises(ValueError):
+        reader._float_array('1 x')
+
+def test_handler_failures_raise_collada_error():
+    class Failing(Recorder):
+        def geometry(self, geometry):
+            raise KeyError('Quad-material-symbol')
+
+    with pytest.raises(reader.ColladaError, match='geometry'):
+        reader.ColladaReader(FIXTURE).read(Failing())
+
+def test_invalid_xml_raises_collada_error(tmp_path):
+    path = tmp_path / 'broken.dae'
+    path.write_text('<COLLADA><library_geometries>')
+    with pytest.raises(reader.ColladaError):
+        read(str(path))
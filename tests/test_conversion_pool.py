@@ -0,0 +1,77 @@
+import os
+import time
+import pytest
+from conftest import addon_module
+
+fbx = addon_module('utilities.DAE_OT_import_via_fbx')
+conversion_cache = addon_module('utilities.conversion_cache')
+conversion_pool = addon_module('utilities.conversion_pool')
+
+STAND_IN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stand_in_converter.py')
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    for name in (fbx.DAE_OT_import_via_fbx.CONVERTER_ENV, fbx.DAE_OT_import_via_fbx.BACKEND_ENV, fbx.DAE_OT_import_via_fbx.TIMEOUT_ENV):
+        monkeypatch.delenv(name, raising=False)
+    fbx.DAE_OT_import_via_fbx.configure(STAND_IN, fbx.CommandConverter.name, 30)
+    cache = conversion_cache.ConversionCache(str(tmp_path / 'cache'))
+    pool = conversion_pool.ConversionPool(cache, max_workers=4)
+    yield pool
+    pool.shutdown()
+    fbx.DAE_OT_import_via_fbx.configure()
+
+def write_dae(directory, name):
+    path = directory / name
+    path.write_text(f'<COLLADA>{name}</COLLADA>')
+    return str(path)
+
+def test_converts_in_parallel_and_keeps_failures_per_file(pool, tmp_path):
+    paths = [write_dae(tmp_path, f'part{index}.dae') for index in range(6)]
+    broken = write_dae(tmp_path, 'broken.dae')
+    for path in paths + [broken]:
+        pool.submit(path)
+
+    for path in paths:
+        with open(pool.result(path)) as f:
+            assert f.read() == f'<COLLADA>{os.path.basename(path)}</COLLADA>'
+    with pytest.raises(fbx.FailConvert, match='not a COLLADA file'):
+        pool.result(broken)
+
+    # 같은 내용은 캐시에서 바로 돌려준다
+    assert pool.result(paths[0]).endswith('.fbx')
+    assert pool.conversion_cache.hits == 1
+    assert not [name for name in os.listdir(pool.conversion_cache.directory) if name.endswith(conversion_cache.PARTIAL_SUFFIX)]
+
+def test_shutdown_terminates_running_converters(pool, tmp_path):
+    slow = write_dae(tmp_path, 'slow.dae')
+    future = pool.submit(slow)
+    processes = pool._processes
+
+    deadline = time.monotonic() + 10
+    while not processes.running() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert processes.running() == 1
+
+    started = time.monotonic()
+    pool.shutdown()
+    with pytest.raises(fbx.FailConvert):
+        future.result(timeout=10)
+    assert time.monotonic() - started < 10
+    assert processes.running() == 0
+
+def test_eviction_keeps_converted_files_until_released(pool, tmp_path):
+    # 용량을 넘어도 큐가 아직 임포트하지 않은 변환 결과는 남는다
+    cache = conversion_cache.ConversionCache(str(tmp_path / 'small'), max_bytes=1)
+    pool.conversion_cache = cache
+    paths = [write_dae(tmp_path, f'part{index}.dae') for index in range(4)]
+    for path in paths:
+        pool.submit(path)
+    converted = [pool.result(path) for path in paths]
+    assert all(os.path.exists(path) for path in converted)
+
+    for path in converted:
+        cache.release(path)
+    last = write_dae(tmp_path, 'last.dae')
+    pool.submit(last)
+    pool.result(last)
+    assert not any(os.path.exists(path) for path in converted)
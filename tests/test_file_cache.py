@@ -0,0 +1,89 @@
+import os
+import time
+import numpy as np
+from conftest import addon_module
+
+file_cache = addon_module('utilities.file_cache')
+texture_proxy = addon_module('importers.splatoon.texture_proxy')
+channel_pack = addon_module('importers.splatoon.channel_pack')
+
+def write(path, size, age):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'\0' * size)
+    when = time.time() - age
+    os.utime(path, (when, when))
+
+def test_evict_lru_removes_oldest_and_stale_partials(tmp_path):
+    root = str(tmp_path)
+    write(os.path.join(root, 'a', '1', 'old.png'), 100, 300)
+    write(os.path.join(root, 'b', 'new.png'), 100, 100)
+    write(os.path.join(root, 'kept.png'), 100, 400)
+    write(os.path.join(root, 'newest.png'), 100, 0)
+    write(os.path.join(root, 'tmp1.partial.png'), 100, file_cache.STALE_PARTIAL_SECONDS + 60)
+    write(os.path.join(root, 'tmp2.partial.png'), 100, 0)
+
+    total = file_cache.evict_lru(root, 250, ('.partial.png',), keep=(os.path.join(root, 'kept.png'),))
+
+    remaining = sorted(os.path.relpath(os.path.join(d, f), root) for d, _, files in os.walk(root) for f in files)
+    assert remaining == ['kept.png', 'newest.png', 'tmp2.partial.png']
+    assert total == 200
+
+def test_eviction_budget_runs_on_first_write_then_every_eighth(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(file_cache, 'evict_lru', lambda *args, **kwargs: calls.append(kwargs['keep']))
+    budget = file_cache.EvictionBudget(str(tmp_path), 800)
+    for index in range(5):
+        path = str(tmp_path / f'{index}.png')
+        write(path, 40, 0)
+        budget.wrote(path)
+    # 처음, 그리고 쓴 양이 100바이트(800 / 8)를 넘을 때
+    assert calls == [{str(tmp_path / '0.png')}, {str(tmp_path / '3.png')}]
+
+def texture(tmp_path, name, size):
+    from benchmarks.fixtures import write_png, COLOR_TYPE_RGBA
+
+    path = str(tmp_path / name)
+    write_png(path, np.random.default_rng(size).integers(0, 256, (size, size - 3, 4), dtype=np.uint8), COLOR_TYPE_RGBA)
+    return path
+
+def cached_files(directory):
+    return sorted(os.path.relpath(os.path.join(d, f), directory) for d, _, files in os.walk(directory) for f in files)
+
+def test_proxy_stores_only_target_level(tmp_path):
+    source = texture(tmp_path, 'Obj_alb.png', 64)
+    cache = str(tmp_path / 'proxies')
+
+    proxy = texture_proxy.TextureProxies(16, cache).proxy_path(source)
+
+    assert [path.split(os.sep)[1:] for path in cached_files(cache)] == [['16', 'Obj_alb.png']]
+    assert proxy == os.path.join(cache, cached_files(cache)[0])
+
+def test_smaller_proxy_from_cached_level_matches_original(tmp_path, monkeypatch):
+    source = texture(tmp_path, 'Obj_alb.png', 64)
+    decode = texture_proxy.decode_png_texels
+    direct = texture_proxy.TextureProxies(8, str(tmp_path / 'direct')).proxy_path(source)
+    cache = str(tmp_path / 'proxies')
+    texture_proxy.TextureProxies(32, cache).proxy_path(source)
+
+    decoded = []
+    monkeypatch.setattr(texture_proxy, 'decode_png_texels', lambda path: decoded.append(path) or decode(path))
+    result = texture_proxy.TextureProxies(8, cache).proxy_path(source)
+
+    # 원본 대신 캐시의 32 단계를 줄인다
+    assert len(decoded) == 1 and decoded[0].endswith(os.path.join('32', 'Obj_alb.png'))
+    np.testing.assert_array_equal(decode(result), decode(direct))
+
+def test_channel_pack_writes_sidecar_and_keeps_cap(tmp_path):
+    from benchmarks.fixtures import write_png, COLOR_TYPE_GRAY
+
+    sources = {}
+    for suffix in ('_mtl', '_rgh'):
+        sources[suffix] = str(tmp_path / f'Obj{suffix}.png')
+        write_png(sources[suffix], np.full((4, 4, 1), len(suffix), dtype=np.uint8), COLOR_TYPE_GRAY)
+    cache = str(tmp_path / 'packed')
+    packed = channel_pack.ChannelPacker(cache, max_bytes=1).pack(sources)
+
+    # 용량을 넘어도 방금 쓴 PNG와 .json은 남는다
+    assert sorted(os.listdir(cache)) == sorted([os.path.basename(packed.path), os.path.basename(packed.path)[:-4] + '.json'])
+    assert channel_pack.ChannelPacker(cache).pack(sources) == packed
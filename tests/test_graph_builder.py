@@ -0,0 +1,55 @@
+import os
+import pytest
+from benchmarks.fixtures import MapFixture, new_imported_material, BASE_SUFFIX
+from conftest import addon_module
+
+graph_builder = addon_module('importers.splatoon.graph_builder')
+
+def describe(material):
+    nodes = material.node_tree.nodes
+    return (
+        [(node.name, node.bl_idname, tuple(node.location), node.hide, node.label) for node in nodes],
+        sorted(
+            (link.from_node.name, link.from_socket.name, link.to_node.name, link.to_socket.name)
+            for link in material.node_tree.links
+        ),
+    )
+
+def build_all(addon, bpy, fixture, node_graph, **options):
+    bpy.reset()
+    addon.node_groups._session_groups.clear()
+    processor = type('MaterialProcessor', (addon.material_processor.MaterialProcessor,), {'node_graph': node_graph})
+    planner = addon.material_plan.MaterialPlanner(addon.texture_index.TextureIndex())
+    defaults = dict(apply_second_shader=True, shader_mix_style='COLOR', use_node_groups=False, pack_channels=False)
+    defaults.update(options)
+
+    graphs = {}
+    image_cache = addon.image_cache.ImageCache()
+    for base in sorted(fixture.texture_sets):
+        material = new_imported_material(bpy, base, os.path.join(fixture.directory, f'{base}{BASE_SUFFIX}.png'))
+        snapshot = processor.snapshot(material)
+        processor(material, image_cache).apply(
+            planner.plan(snapshot, fixture.directory, addon.material_plan.MaterialOptions(**defaults))
+        )
+        graphs[base] = describe(material)
+    return graphs
+
+@pytest.mark.parametrize('options', [{}, {'use_node_groups': True}, {'shader_mix_style': 'SHADE'}])
+def test_batched_graph_matches_per_node_writes(addon, bpy, tmp_path, options):
+    fixture = MapFixture(str(tmp_path), materials=64, files=2, texture_size=8, emission_size=8).build()
+
+    per_node = build_all(addon, bpy, fixture, graph_builder.NodeGraph, **options)
+    batched = build_all(addon, bpy, fixture, graph_builder.BatchedNodeGraph, **options)
+    assert batched == per_node
+
+def test_batched_graph_refuses_removal_before_finish(bpy):
+    material = bpy.data.materials.new('Material')
+    graph = graph_builder.BatchedNodeGraph(material.node_tree)
+    graph.new('first', 'ShaderNodeTexImage', (0.0, 0.0), False)
+    graph.new('second', 'ShaderNodeTexImage', (100.0, 0.0), True)
+    with pytest.raises(AssertionError):
+        graph.remove('first')
+
+    graph.finish()
+    graph.remove('first')
+    assert [(node.location[0], node.hide) for node in material.node_tree.nodes] == [(100.0, True)]
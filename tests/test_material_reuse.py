@@ -0,0 +1,58 @@
+import os
+import pytest
+from benchmarks.fixtures import MapFixture, new_imported_material, BASE_SUFFIX
+
+@pytest.fixture
+def fixture(tmp_path):
+    return MapFixture(str(tmp_path), materials=4, files=2, texture_size=8, emission_size=8).build()
+
+def imported(bpy, fixture, base, name=None, location=(10.0, 300.0)):
+    """같은 텍스처 세트를 다른 이름, 다른 위치로 임포트한 머티리얼"""
+    material = new_imported_material(bpy, name or base, os.path.join(fixture.directory, f'{base}{BASE_SUFFIX}.png'))
+    principled = material.node_tree.nodes[0]
+    principled.location = location
+    principled.name = f'{principled.name}.{len(bpy.data.materials):03d}'
+    return material
+
+def plan(addon, fixture, material, **options):
+    planner = addon.material_plan.MaterialPlanner(addon.texture_index.TextureIndex())
+    snapshot = addon.material_processor.MaterialProcessor.snapshot(material)
+    defaults = dict(apply_second_shader=True, shader_mix_style='COLOR', use_node_groups=False, pack_channels=False)
+    defaults.update(options)
+    return planner.plan(snapshot, fixture.directory, addon.material_plan.MaterialOptions(**defaults))
+
+def test_signature_ignores_node_names_and_locations(addon, bpy, fixture):
+    base = sorted(fixture.texture_sets)[-1]
+    first = plan(addon, fixture, imported(bpy, fixture, base))
+    second = plan(addon, fixture, imported(bpy, fixture, base, f'{base}.001', location=(-400.0, 20.0)))
+
+    assert first != second
+    assert first.signature == second.signature
+
+def test_signature_follows_textures_and_options(addon, bpy, fixture):
+    first, second = sorted(fixture.texture_sets)[-2:]
+    material = imported(bpy, fixture, first)
+
+    assert plan(addon, fixture, material).signature != plan(addon, fixture, imported(bpy, fixture, second)).signature
+    assert plan(addon, fixture, material).signature != plan(addon, fixture, material, shader_mix_style='SHADE').signature
+
+def test_queue_reuses_materials_imported_with_other_node_names(addon, bpy, fixture):
+    base = sorted(fixture.texture_sets)[-1]
+    files = sorted(fixture.files)
+    for index, file_path in enumerate(files):
+        def import_objects(index=index):
+            material = imported(bpy, fixture, base, f'{base}.{index:03d}', location=(index * 100.0, index * -50.0))
+            obj = bpy.data.objects.new(f'Part{index}', 'MESH', bpy.data.meshes.new(f'Part{index}'))
+            obj.material_slots.append(bpy.MaterialSlot(material))
+            return [obj]
+        bpy.ops.import_scene.handlers[os.path.abspath(file_path)] = import_objects
+
+    queue = addon.queueing.Queueing.from_paths(files)
+    try:
+        queue.run_to_completion(poll_interval=0)
+    finally:
+        queue.close()
+
+    assert queue.deduplicated_materials == 1
+    first, second = (bpy.data.objects[f'Part{index}'] for index in range(2))
+    assert first.material_slots[0].material is second.material_slots[0].material
@@ -0,0 +1,42 @@
+import numpy as np
+from types import SimpleNamespace
+from conftest import addon_module
+
+mesh_dedup = addon_module('importers.splatoon.mesh_dedup')
+
+class Elements(list):
+    """foreach_get만 되는 mesh 요소 컬렉션"""
+
+    def foreach_get(self, attribute, buffer):
+        buffer[:] = np.ravel([getattr(element, attribute) for element in self])
+
+class Mesh:
+    """Blender 4.0 mesh. corner_normals가 없고 calc_normals_split을 불러야 loop normal이 채워진다"""
+
+    def __init__(self, normals):
+        self.vertices = Elements(SimpleNamespace(co=co) for co in [(0, 0, 0), (1, 0, 0), (0, 1, 0)])
+        self.edges = Elements(SimpleNamespace(vertices=pair) for pair in [(0, 1), (1, 2), (2, 0)])
+        self.loops = Elements(SimpleNamespace(vertex_index=index, normal=(0, 0, 0)) for index in range(3))
+        self.polygons = Elements([SimpleNamespace(loop_total=3, material_index=0, use_smooth=True)])
+        self.uv_layers = []
+        self.color_attributes = []
+        self.materials = []
+        self.has_custom_normals = True
+        self._normals = normals
+
+    def calc_normals_split(self):
+        for loop, normal in zip(self.loops, self._normals):
+            loop.normal = normal
+
+class Mesh41(Mesh):
+    @property
+    def corner_normals(self):
+        return Elements(SimpleNamespace(vector=normal) for normal in self._normals)
+
+def test_key_reads_loop_normals_without_corner_normals():
+    normals = [(0, 0, 1), (0, 0.6, 0.8), (0, 0, 1)]
+    deduplicator = mesh_dedup.MeshDeduplicator()
+
+    key = deduplicator.key(Mesh(normals))
+    assert key == deduplicator.key(Mesh41(normals))
+    assert key != deduplicator.key(Mesh([(0, 0, 1)] * 3))
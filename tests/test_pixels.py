@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from benchmarks.run import legacy_is_grayscale
+
+def rgba(texels):
+    return np.asarray(texels, dtype=np.float32).reshape(-1, 4)
+
+def gray(size, seed=0):
+    values = np.random.default_rng(seed).random(size * size, dtype=np.float32)
+    alpha = np.random.default_rng(seed + 1).random(size * size, dtype=np.float32)
+    return rgba(np.stack([values, values, values, alpha], axis=1))
+
+def color(size, seed=0):
+    return rgba(np.random.default_rng(seed).random((size * size, 4), dtype=np.float32))
+
+def almost_gray(size, index, channel):
+    texels = gray(size)
+    texels[index, channel] += 1.0 / 255
+    return texels
+
+CASES = {
+    'gray': gray(64),
+    'color': color(64),
+    'empty': rgba([]),
+    'almost_gray_first': almost_gray(64, 0, 1),
+    'almost_gray_last': almost_gray(64, 64 * 64 - 1, 2),
+    # 첫 chunk를 넘어간 뒤에 한 texel만 다른 경우
+    'almost_gray_large': almost_gray(512, 300 * 512 + 7, 0),
+    'alpha_only_differs': rgba([[0.5, 0.5, 0.5, 0.0], [0.25, 0.25, 0.25, 1.0]]),
+}
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_array_matches_legacy_loop(addon, name):
+    texels = CASES[name]
+    assert addon.pixels.is_grayscale_array(texels) == legacy_is_grayscale(texels.ravel().tolist())
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_image_matches_legacy_loop(addon, bpy, name):
+    texels = CASES[name]
+    image = bpy.data.images.new(name, len(texels), 1)
+    image.pixels.foreach_set(texels.ravel())
+    assert addon.pixels.is_grayscale_pixels(image) == legacy_is_grayscale(texels.ravel().tolist())
+    addon.pixels.release_pixel_buffer()
+
+def test_rgb_and_single_channel(addon):
+    values = np.linspace(0, 1, 12, dtype=np.float32)
+    assert addon.pixels.is_grayscale_array(np.stack([values] * 3, axis=1))
+    assert not addon.pixels.is_grayscale_array(np.stack([values, values, values[::-1]], axis=1))
+    assert addon.pixels.is_grayscale_array(values.reshape(-1, 1))
+
+def test_png_header_fast_path(addon, tmp_path):
+    from benchmarks.fixtures import write_png
+
+    texels = (gray(8)[:, :1] * 255).astype(np.uint8).reshape(8, 8, 1)
+    path = str(tmp_path / 'gray.png')
+    write_png(path, texels, 0)
+    assert addon.png.is_grayscale_png(path)
+
+    path = str(tmp_path / 'rgb.png')
+    write_png(path, np.repeat(texels, 3, axis=2), 2)
+    assert not addon.png.is_grayscale_png(path)
@@ -0,0 +1,63 @@
+import tracemalloc
+import numpy as np
+import pytest
+from conftest import addon_module
+
+png = addon_module('utilities.png')
+
+def paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+def filter_rows(texels, filters):
+    """PNG 명세대로 행마다 filter를 적용한 IDAT 원본(압축 전) 바이트를 만든다"""
+    height, width, channels = texels.shape
+    pixels = texels.astype(np.int32)
+    raw = bytearray()
+    for y in range(height):
+        raw.append(filters[y])
+        for x in range(width):
+            for ch in range(channels):
+                a = int(pixels[y, x - 1, ch]) if x > 0 else 0
+                b = int(pixels[y - 1, x, ch]) if y > 0 else 0
+                c = int(pixels[y - 1, x - 1, ch]) if x > 0 and y > 0 else 0
+                predictor = (0, a, b, (a + b) >> 1, paeth(a, b, c))[filters[y]]
+                raw.append((int(pixels[y, x, ch]) - predictor) & 0xFF)
+    return bytes(raw)
+
+@pytest.mark.parametrize('block_values, block_rows', [(1 << 22, 17), (27, 1), (99, 3)])
+def test_unfilter_blocks_match_image(monkeypatch, block_values, block_rows):
+    # 블록이 작으면 경계마다 앞 블록의 마지막 행을 넘겨받는다. Sub/Up만 있는 블록과 Average/Paeth 블록이 섞인다
+    monkeypatch.setattr(png, 'UNFILTER_BLOCK_VALUES', block_values)
+    assert min(png._block_rows(8, 3), 17) == block_rows
+    rng = np.random.default_rng(0)
+    texels = rng.integers(0, 256, (17, 8, 3), dtype=np.uint8)
+    filters = [0, 1, 2, 2, 1, 3, 4, 4, 0, 2, 1, 1, 4, 3, 2, 0, 4]
+
+    out = png._unfilter(filter_rows(texels, filters), 17, 8, 3)
+    np.testing.assert_array_equal(out, texels)
+
+def test_unfilter_memory_is_bounded():
+    # 좁고 긴 이미지도 기울인 블록이 UNFILTER_BLOCK_VALUES 안에 머문다 (예전에는 64x8192에서 1GB 넘게 썼다)
+    width, height = 64, 8192
+    rng = np.random.default_rng(0)
+    rows = np.empty((height, width * 4 + 1), dtype=np.uint8)
+    rows[:, 0] = png.FILTER_PAETH
+    rows[:, 1:] = rng.integers(0, 256, (height, width * 4), dtype=np.uint8)
+    raw = rows.tobytes()
+
+    tracemalloc.start()
+    try:
+        png._unfilter(raw, height, width, 4)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # 출력 2MB + 기울인 int16 배열 두 개 (각 8MB) + 인덱스
+    assert peak < 32 << 20
+
+def test_unknown_filter_type():
+    with pytest.raises(ValueError):
+        png._unfilter(bytes([5, 0, 0, 0]), 1, 1, 3)
@@ -0,0 +1,43 @@
+import os
+import pytest
+from benchmarks.fixtures import MapFixture
+
+def _fail_first(bpy, fixture):
+    files = sorted(fixture.files)
+    for file_path in files:
+        bpy.ops.import_scene.handlers[os.path.abspath(file_path)] = (
+            lambda file_path=file_path: fixture.import_objects(bpy, file_path, fixture.files[file_path])
+        )
+
+    def broken():
+        raise RuntimeError('Error: FBX import failed')
+    bpy.ops.import_scene.handlers[os.path.abspath(files[0])] = broken
+    return files
+
+def test_keep_going_records_unexpected_errors(addon, bpy, tmp_path):
+    # 헤드리스 배치는 예상하지 못한 예외도 그 파일의 결과로 남기고 나머지를 임포트한다
+    fixture = MapFixture(str(tmp_path), materials=2, files=2, texture_size=8, emission_size=8).build()
+    files = _fail_first(bpy, fixture)
+
+    queue = addon.queueing.Queueing.from_paths(files, keep_going=True)
+    try:
+        queue.run_to_completion(poll_interval=0)
+    finally:
+        queue.close()
+
+    results = {result['file']: result for result in queue.file_results}
+    assert results[os.path.abspath(files[0])]['error'] == 'RuntimeError: Error: FBX import failed'
+    assert results[os.path.abspath(files[1])]['error'] is None
+    assert results[os.path.abspath(files[1])]['objects'] == len(fixture.files[files[1]])
+
+def test_unexpected_errors_stop_the_batch_by_default(addon, bpy, tmp_path):
+    fixture = MapFixture(str(tmp_path), materials=2, files=2, texture_size=8, emission_size=8).build()
+    files = _fail_first(bpy, fixture)
+
+    queue = addon.queueing.Queueing.from_paths(files)
+    try:
+        with pytest.raises(RuntimeError):
+            queue.run_to_completion(poll_interval=0)
+    finally:
+        queue.close()
+    assert queue.file_results == []
@@ -0,0 +1,30 @@
+import re
+import itertools
+import pytest
+from conftest import addon_module
+
+texture_roles = addon_module('importers.splatoon.texture_roles')
+
+def legacy_base_name(basename):
+    """SuffixClassifier 전 MaterialProcessor._find_base_texture의 검색"""
+    for suffix in ['_alb', '_emm', '_emi']:
+        match = re.compile(re.escape(suffix), re.IGNORECASE).search(basename)
+        if match:
+            return basename[:match.start()]
+    return None
+
+# 등록된 suffix를 두 개까지 이어 붙인 이름. base suffix가 여러 개 들어 있는 경우가 포함된다
+NAMES = [
+    f'Obj{first}{second}.png'
+    for first, second in itertools.product([''] + list(texture_roles.ROLES), repeat=2)
+] + ['Obj_ALB.png', 'Obj_Emm_Alb.png', 'Obj_albedo_emi.png', 'NoSuffix.png']
+
+@pytest.mark.parametrize('name', NAMES)
+def test_base_name_matches_legacy_search(name):
+    assert texture_roles.SuffixClassifier().base_name(name) == legacy_base_name(name)
+
+def test_base_name_tries_aliases_after_their_suffix():
+    classifier = texture_roles.SuffixClassifier(texture_roles.parse_aliases('_col=_alb;_glw=_emm'))
+    assert classifier.base_name('Obj_emm_col.png') == 'Obj_emm'
+    assert classifier.base_name('Obj_glw.png') == 'Obj'
+    assert classifier.base_name('Obj_alb_col.png') == 'Obj'